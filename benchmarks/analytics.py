@@ -0,0 +1,92 @@
+"""
+Analytics-Benchmark: NumPy-Aggregation gegen naive Python-Schleife
+
+Berechnet Verbrauch je Produkt und Netto-Fluss je Produkt und Tag über
+synthetische Bewegungen - einmal mit dict-Schleifen, einmal mit den
+vektorisierten Reports aus src.reports.
+
+Aufruf:
+    python benchmarks/analytics.py [anzahl_bewegungen]
+"""
+
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.adapters.columnar import ColumnarMovementStore  # noqa: E402
+from src.domain.warehouse import Movement  # noqa: E402
+from src.reports import MovementArrays, MovementReport  # noqa: E402
+
+
+def generate_movements(count: int, products: int = 10_000, days: int = 365):
+    """Zufällige, zeitlich sortierte Bewegungen erzeugen"""
+    rng = random.Random(42)
+    start = datetime(2025, 1, 1)
+    step = timedelta(days=days) / count
+    types = ("IN", "OUT", "OUT", "CORRECTION")
+    for i in range(count):
+        movement_type = rng.choice(types)
+        quantity = rng.randint(1, 50)
+        yield Movement(
+            id=f"mov_{i}",
+            product_id=f"P{rng.randrange(products):05d}",
+            product_name="Produkt",
+            quantity_change=-quantity if movement_type == "OUT" else quantity,
+            movement_type=movement_type,
+            timestamp=start + step * i,
+        )
+
+
+def naive(movements):
+    """Referenz: eine Python-Schleife über alle Bewegungsobjekte"""
+    outflow = defaultdict(int)
+    daily = defaultdict(int)
+    for movement in movements:
+        if movement.movement_type == "OUT":
+            outflow[movement.product_id] -= movement.quantity_change
+        daily[(movement.product_id, movement.timestamp.date())] += movement.quantity_change
+    return outflow, daily
+
+
+def vectorized(arrays):
+    report = MovementReport(arrays)
+    return report.outflow_per_product(), report.daily_net_flow()
+
+
+def timed(label: str, function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed * 1000:>10.1f} ms")
+    return result, elapsed
+
+
+def main(count: int = 1_000_000) -> None:
+    print(f"Bewegungen: {count}")
+    movements = list(generate_movements(count))
+    store = ColumnarMovementStore(movements)
+
+    (_, daily), naive_time = timed("Naive Schleife (Objekte)", naive, movements)
+    arrays, load_objects = timed(
+        "Laden: MovementArrays.from_movements", MovementArrays.from_movements, movements
+    )
+    _, load_store = timed("Laden: MovementArrays.from_store", MovementArrays.from_store, store)
+    (_, (_, _, net)), numpy_time = timed("NumPy-Aggregation", vectorized, arrays)
+
+    assert len(net) == len(daily)
+    factors = {
+        "Faktor nur Aggregation": naive_time / numpy_time,
+        "Faktor inkl. Laden aus Spaltenspeicher": naive_time / (numpy_time + load_store),
+        "Faktor inkl. Laden aus Objekten": naive_time / (numpy_time + load_objects),
+    }
+    for label, factor in factors.items():
+        print(f"{label:<40} {factor:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
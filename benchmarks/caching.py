@@ -0,0 +1,97 @@
+"""
+Cache-Benchmark: Latenz von Scans bei schiefer (Zipf-verteilter) Zugriffsverteilung
+
+Ein Scanner fragt Produkte per SKU ab (WarehouseService.find_by_sku) und
+bucht bei jedem zehnten Scan einen Zugang (Write-Through). Gemessen wird die
+Latenz der Scans. Die Produkte werden Zipf-verteilt
+gewählt: wenige Produkte machen den Großteil der Scans aus. Verglichen wird
+SQLite ohne Cache mit CachingRepository in verschiedenen Größen.
+
+Aufruf:
+    python benchmarks/caching.py [scans] [zipf_exponent]
+"""
+
+import itertools
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.adapters.caching import CachingRepository  # noqa: E402
+from src.adapters.repository import SqliteRepository  # noqa: E402
+from src.domain.product import Product  # noqa: E402
+from src.services import WarehouseService  # noqa: E402
+
+PRODUCTS = 10_000
+CACHE_SIZES = (None, 100, 1_000, 10_000)
+
+
+def zipf_skus(count: int, exponent: float, seed: int = 1) -> list:
+    """count SKUs, Rang k mit Wahrscheinlichkeit proportional zu 1 / k^exponent"""
+    weights = [1 / rank**exponent for rank in range(1, PRODUCTS + 1)]
+    cumulative = list(itertools.accumulate(weights))
+    ranks = random.Random(seed).choices(range(PRODUCTS), cum_weights=cumulative, k=count)
+    # Ränge auf zufällige Produkte verteilen, damit heiße Produkte nicht benachbart liegen
+    products = list(range(PRODUCTS))
+    random.Random(seed + 1).shuffle(products)
+    return [f"SKU{products[rank]:05d}" for rank in ranks]
+
+
+def run(db_path: str, cache_size, skus: list) -> dict:
+    repository = SqliteRepository(db_path)
+    if cache_size is not None:
+        repository = CachingRepository(repository, max_size=cache_size)
+    service = WarehouseService(repository)
+    latencies = []
+    for i, sku in enumerate(skus):
+        start = time.perf_counter()
+        product = service.find_by_sku(sku)
+        latencies.append(time.perf_counter() - start)
+        if i % 10 == 0:
+            service.add_to_stock(product.id, 1)
+    repository.close()
+    latencies.sort()
+    result = {
+        "mean": statistics.fmean(latencies),
+        "p50": latencies[len(latencies) // 2],
+        "p99": latencies[int(len(latencies) * 0.99)],
+        "hit_rate": None,
+    }
+    if cache_size is not None:
+        stats = repository.stats()
+        result["hit_rate"] = stats["hits"] / max(1, stats["hits"] + stats["misses"])
+    return result
+
+
+def main() -> None:
+    scans = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    exponent = float(sys.argv[2]) if len(sys.argv) > 2 else 1.1
+    skus = zipf_skus(scans, exponent)
+
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = str(Path(directory) / "lager.db")
+        repository = SqliteRepository(db_path)
+        repository.save_products(
+            Product(id=f"P{i:05d}", name="Produkt", description="", price=1.0, sku=f"SKU{i:05d}")
+            for i in range(PRODUCTS)
+        )
+        repository.close()
+
+        print(f"{scans} Scans über {PRODUCTS} Produkte, Zipf-Exponent {exponent}")
+        print(f"{'Cache':>8} {'Mittel':>10} {'p50':>10} {'p99':>10} {'Trefferquote':>13}")
+        for cache_size in CACHE_SIZES:
+            result = run(db_path, cache_size, skus)
+            hit_rate = "-" if result["hit_rate"] is None else f"{result['hit_rate']:.1%}"
+            print(
+                f"{cache_size or 'ohne':>8} "
+                f"{result['mean'] * 1e6:>8.1f}µs {result['p50'] * 1e6:>8.1f}µs "
+                f"{result['p99'] * 1e6:>8.1f}µs {hit_rate:>13}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Nebenläufigkeits-Benchmark: Buchungsdurchsatz je Thread-Anzahl
+
+Mehrere Threads buchen abwechselnd Zu- und Abgänge auf zufällige Produkte
+über einen gemeinsamen WarehouseService. Gemessen wird der Gesamtdurchsatz
+für 1, 2, 4 und 8 Threads - einmal mit gestreiften Sperren (Standard) und
+einmal mit nur einer Sperre (lock_stripes=1) als Vergleich.
+
+Hinweis: Beim In-Memory-Backend begrenzt das GIL den Gewinn durch mehr
+Threads; bei SQLite gibt die Datenbank das GIL während der Zugriffe frei.
+
+Aufruf:
+    python benchmarks/concurrency.py [buchungen_pro_thread]
+"""
+
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.adapters.repository import RepositoryFactory  # noqa: E402
+from src.services import WarehouseService  # noqa: E402
+
+PRODUCTS = 1000
+THREAD_COUNTS = (1, 2, 4, 8)
+
+
+def create_service(backend: str, directory: str, lock_stripes: int) -> WarehouseService:
+    options = {"db_path": str(Path(directory) / "lager.db")} if backend == "sqlite" else {}
+    service = WarehouseService(
+        RepositoryFactory.create_repository(backend, **options), lock_stripes=lock_stripes
+    )
+    for i in range(PRODUCTS):
+        service.create_product(f"P{i:05d}", "Produkt", "", 1.0, initial_quantity=1_000_000)
+    return service
+
+
+def run(service: WarehouseService, threads: int, operations: int) -> float:
+    """Buchungen pro Sekunde über alle Threads"""
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(seed: int) -> None:
+        rng = random.Random(seed)
+        barrier.wait()
+        for i in range(operations):
+            product_id = f"P{rng.randrange(PRODUCTS):05d}"
+            if i % 2:
+                service.remove_from_stock(product_id, 1)
+            else:
+                service.add_to_stock(product_id, 1)
+
+    workers = [threading.Thread(target=worker, args=(seed,)) for seed in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    return threads * operations / (time.perf_counter() - start)
+
+
+def main(operations: int = 2000) -> None:
+    print(f"Buchungen pro Thread: {operations}")
+    print(f"{'Backend':<10} {'Sperren':>8} " + " ".join(f"{n:>9} T" for n in THREAD_COUNTS))
+    for backend in ("memory", "sqlite"):
+        for stripes in (64, 1):
+            with tempfile.TemporaryDirectory() as directory:
+                service = create_service(backend, directory, stripes)
+                rates = [run(service, threads, operations) for threads in THREAD_COUNTS]
+                if hasattr(service.repository, "close"):
+                    service.repository.close()
+            print(f"{backend:<10} {stripes:>8} " + " ".join(f"{rate:>9.0f}/s" for rate in rates))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,90 @@
+"""
+Speicher-Benchmark: Bytes pro Lagerbewegung
+
+Vergleicht eine klassische @dataclass (mit __dict__), die aktuelle Movement-Klasse
+(frozen + slots) und den ColumnarMovementStore.
+
+Aufruf:
+    python benchmarks/movement_memory.py [anzahl]
+"""
+
+import gc
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.adapters.columnar import ColumnarMovementStore  # noqa: E402
+from src.domain.ids import SnowflakeIdGenerator  # noqa: E402
+from src.domain.warehouse import Movement  # noqa: E402
+
+
+@dataclass
+class DictMovement:
+    """Movement wie vor der Umstellung (mit __dict__ pro Instanz)"""
+
+    id: str
+    product_id: str
+    product_name: str
+    quantity_change: int
+    movement_type: str
+    reason: Optional[str] = None
+    timestamp: datetime = field(default_factory=datetime.now)
+    performed_by: str = "system"
+
+
+def _fields(count: int):
+    generator = SnowflakeIdGenerator(node_id=0)
+    start = datetime(2025, 1, 1)
+    products = [(f"P{i:05d}", f"Produkt {i}") for i in range(1000)]
+    types = ("IN", "OUT", "CORRECTION")
+    for i in range(count):
+        product_id, name = products[i % len(products)]
+        yield dict(
+            # f-String erzeugt pro Zeile neue Texte, wie beim Laden aus einer Datenquelle
+            id=generator.new_id(),
+            product_id=f"{product_id}",
+            product_name=f"{name}",
+            quantity_change=(i % 50) - 25 or 1,
+            movement_type=types[i % 3],
+            reason=f"Auftrag {i % 200}",
+            timestamp=start + timedelta(seconds=i),
+            performed_by=f"user{i % 10}",
+        )
+
+
+def measure(label: str, build, count: int) -> float:
+    """
+    Speicherzuwachs für count Bewegungen messen und Bytes pro Bewegung ausgeben
+
+    Die Felder werden erst während der Messung erzeugt; was ein Container von
+    ihnen (Texte, datetime-Objekte) am Leben hält, zählt also mit.
+    """
+    gc.collect()
+    tracemalloc.start()
+    container = build(_fields(count))
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    per_movement = current / count
+    print(f"{label:<28} {per_movement:>10.1f} Bytes/Bewegung")
+    del container
+    return per_movement
+
+
+def main(count: int = 200_000) -> None:
+    print(f"Bewegungen: {count}")
+    measure("@dataclass mit __dict__", lambda rows: [DictMovement(**r) for r in rows], count)
+    measure("Movement (frozen, slots)", lambda rows: [Movement(**r) for r in rows], count)
+    measure(
+        "ColumnarMovementStore",
+        lambda rows: ColumnarMovementStore(Movement(**r) for r in rows),
+        count,
+    )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
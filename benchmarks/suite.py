@@ -0,0 +1,337 @@
+"""
+Benchmark-Suite: Hotpaths von Service und Repositories über alle Backends und Größen
+
+Für jedes Backend aus RepositoryFactory.available_types() und jede Größe wird
+ein Bestand aus synthetischen, reproduzierbaren Daten (fester Seed) angelegt:
+so viele Produkte wie Bewegungen. Gemessen werden
+
+    create_product, add_to_stock, remove_from_stock   Latenz je Aufruf
+    get_total_inventory_value                         Latenz je Aufruf
+    service_startup                                   WarehouseService(...) über dem Bestand
+    load_all_products                                 ein Aufruf (bester von --repeat)
+    inventory_report, movement_report                 ConsoleReportAdapter in eine Null-Senke
+
+Einzelaufrufe werden an einer Stichprobe (--operations) gemessen, damit auch
+Bestände mit 1M Produkten in vertretbarer Zeit laufen. Die Ergebnisse werden
+als JSON gespeichert (Standard: benchmarks/results/<zeit>-<commit>.json). Mit
+--compare wird gegen einen früheren Lauf verglichen; Verschlechterungen über
+--threshold führen zu Exit-Code 1.
+
+Aufruf:
+    python benchmarks/suite.py
+    python benchmarks/suite.py --scales 10000 100000 1000000 --backends memory sqlite
+    python benchmarks/suite.py --compare benchmarks/results/basis.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.adapters.report import ConsoleReportAdapter  # noqa: E402
+from src.adapters.repository import RepositoryFactory  # noqa: E402
+from src.domain.product import Product  # noqa: E402
+from src.domain.warehouse import Movement  # noqa: E402
+from src.ports import RepositoryPort  # noqa: E402
+from src.services import WarehouseService  # noqa: E402
+
+SCALES = (10_000, 100_000, 1_000_000)
+SEED = 42
+CATEGORIES = ("Elektronik", "Zubehör", "Büro", "Werkzeug", "Lebensmittel", "")
+START = datetime(2025, 1, 1)
+SEED_BATCH = 10_000
+RESULTS = Path(__file__).parent / "results"
+
+
+def generate_products(count: int, seed: int = SEED) -> Iterator[Product]:
+    """count Produkte mit zufälligem Preis, Bestand und Kategorie"""
+    rng = random.Random(seed)
+    for i in range(count):
+        yield Product(
+            id=f"P{i:07d}",
+            name=f"Produkt {i}",
+            description="",
+            price=round(rng.uniform(0.5, 500.0), 2),
+            quantity=rng.randint(1_000, 10_000),
+            sku=f"SKU{i:07d}",
+            category=rng.choice(CATEGORIES),
+        )
+
+
+def generate_movements(count: int, products: int, seed: int = SEED + 1) -> Iterator[Movement]:
+    """count zeitlich sortierte Bewegungen über ein Jahr, gleichverteilt auf die Produkte"""
+    rng = random.Random(seed)
+    step = timedelta(days=365) / count
+    for i in range(count):
+        product = rng.randrange(products)
+        movement_type = rng.choice(("IN", "OUT", "OUT", "CORRECTION"))
+        quantity = rng.randint(1, 50)
+        yield Movement(
+            id=f"mov_{i:09d}",
+            product_id=f"P{product:07d}",
+            product_name=f"Produkt {product}",
+            quantity_change=-quantity if movement_type == "OUT" else quantity,
+            movement_type=movement_type,
+            timestamp=START + step * i,
+            performed_by="benchmark",
+        )
+
+
+def _batches(items: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def create_repository(backend: str, directory: Path, scale: int) -> RepositoryPort:
+    """
+    Backend mit Dateien in directory erzeugen
+
+    Das Journal schreibt Snapshots erst nach scale Datensätzen: mit dem Standard
+    (10_000) würde beim Anlegen jeder Block einen vollständigen Snapshot
+    auslösen und das Seeding großer Bestände quadratisch machen.
+    """
+    options: Dict[str, Dict] = {
+        "sqlite": {"db_path": str(directory / "lager.db")},
+        "journal": {
+            "directory": str(directory / "journal"),
+            "snapshot_every": max(10_000, scale),
+        },
+        "tinydb": {"directory": str(directory / "tinydb")},
+    }
+    return RepositoryFactory.create_repository(backend, **options.get(backend, {}))
+
+
+def seed(repository: RepositoryPort, scale: int) -> None:
+    """Bestand blockweise über die Sammel-Methoden anlegen"""
+    for batch in _batches(generate_products(scale), SEED_BATCH):
+        repository.save_products(batch)
+    for batch in _batches(generate_movements(scale, scale), SEED_BATCH):
+        repository.save_movements(batch)
+
+
+class NullSink:
+    """Textsenke, die nur die Zeichen zählt (Berichte ohne Ausgabe messen)"""
+
+    def __init__(self):
+        self.characters = 0
+
+    def write(self, text: str) -> None:
+        self.characters += len(text)
+
+    def writelines(self, lines: Iterable[str]) -> None:
+        for line in lines:
+            self.characters += len(line)
+
+
+def per_call(name: str, function: Callable, arguments: List[tuple]) -> dict:
+    """function einmal je Argumenttupel aufrufen; Latenzen einzeln messen"""
+    latencies = []
+    for args in arguments:
+        start = time.perf_counter()
+        function(*args)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    total = sum(latencies)
+    return {
+        "scenario": name,
+        "ops": len(latencies),
+        "seconds": total,
+        "ops_per_sec": len(latencies) / total if total else None,
+        "p50_us": latencies[len(latencies) // 2] * 1e6,
+        "p99_us": latencies[int(len(latencies) * 0.99)] * 1e6,
+    }
+
+
+def best_of(name: str, function: Callable, repeat: int) -> dict:
+    """Einen vollständigen Durchlauf repeat-mal messen, den besten behalten"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return {"scenario": name, "ops": 1, "seconds": min(timings)}
+
+
+def run_backend(backend: str, scale: int, operations: int, repeat: int) -> List[dict]:
+    """Alle Szenarien für ein Backend und eine Größe"""
+    rng = random.Random(SEED + 2)
+    product_ids = [f"P{rng.randrange(scale):07d}" for _ in range(operations)]
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        repository = create_repository(backend, Path(directory), scale)
+        try:
+            results.append(best_of("seed", lambda: seed(repository, scale), 1))
+            services = []
+            results.append(
+                best_of("service_startup", lambda: services.append(WarehouseService(repository)), 1)
+            )
+            service = services[0]
+            results.append(
+                per_call(
+                    "create_product",
+                    service.create_product,
+                    [(f"N{i:07d}", "Neu", "", 9.99, "Büro", 10) for i in range(operations)],
+                )
+            )
+            results.append(
+                per_call("add_to_stock", service.add_to_stock, [(pid, 5) for pid in product_ids])
+            )
+            results.append(
+                per_call(
+                    "remove_from_stock",
+                    service.remove_from_stock,
+                    [(pid, 1) for pid in product_ids],
+                )
+            )
+            results.append(
+                per_call(
+                    "get_total_inventory_value",
+                    service.get_total_inventory_value,
+                    [()] * operations,
+                )
+            )
+            results.append(best_of("load_all_products", service.get_all_products, repeat))
+            results.append(
+                best_of(
+                    "inventory_report",
+                    lambda: ConsoleReportAdapter(service.iter_products()).write_inventory_report(
+                        NullSink()
+                    ),
+                    repeat,
+                )
+            )
+            results.append(
+                best_of(
+                    "movement_report",
+                    lambda: ConsoleReportAdapter(
+                        movements=service.iter_movements()
+                    ).write_movement_report(NullSink()),
+                    repeat,
+                )
+            )
+        finally:
+            repository.close()
+    for result in results:
+        result.update(backend=backend, scale=scale)
+    return results
+
+
+def revision() -> Optional[str]:
+    """Aktueller Git-Commit (kurz) oder None außerhalb eines Repositories"""
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip()
+
+
+def _key(result: dict) -> tuple:
+    return result["backend"], result["scale"], result["scenario"]
+
+
+def _per_op(result: dict) -> float:
+    """Median bei Einzelaufrufen (robuster gegen Ausreißer), sonst Gesamtdauer"""
+    if "p50_us" in result:
+        return result["p50_us"] / 1e6
+    return result["seconds"] / result["ops"]
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> int:
+    """
+    Zeit pro Aufruf (Median) bzw. Dauer gegen einen früheren Lauf vergleichen
+
+    Returns:
+        Anzahl der Szenarien, die um mehr als threshold langsamer sind
+    """
+    before = {_key(result): result for result in baseline["results"]}
+    print(f"\nVergleich mit {baseline.get('revision') or '?'} ({baseline.get('created')}):")
+    regressions = 0
+    for result in current["results"]:
+        old = before.get(_key(result))
+        if old is None:
+            continue
+        ratio = _per_op(result) / _per_op(old) if _per_op(old) else 1.0
+        marker = ""
+        if ratio > 1 + threshold:
+            marker = "  LANGSAMER"
+            regressions += 1
+        backend, scale, scenario = _key(result)
+        print(f"{backend:>8} {scale:>9} {scenario:<27} {ratio:>7.2f}x{marker}")
+    return regressions
+
+
+def _print_result(result: dict) -> None:
+    if result["ops"] > 1:
+        detail = (
+            f"{result['ops_per_sec']:>12.0f}/s  p50 {result['p50_us']:>9.1f}µs  "
+            f"p99 {result['p99_us']:>9.1f}µs"
+        )
+    else:
+        detail = f"{result['seconds'] * 1000:>12.1f} ms"
+    print(f"{result['backend']:>8} {result['scale']:>9} {result['scenario']:<27} {detail}")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scales", type=int, nargs="+", default=[SCALES[0]])
+    parser.add_argument("--backends", nargs="+", default=list(RepositoryFactory.available_types()))
+    parser.add_argument("--operations", type=int, default=2000, help="Stichprobe je Szenario")
+    parser.add_argument("--repeat", type=int, default=3, help="Wiederholungen ganzer Durchläufe")
+    parser.add_argument("--output", help="JSON-Datei (Standard: benchmarks/results/...)")
+    parser.add_argument("--compare", help="früheres Ergebnis zum Vergleich")
+    parser.add_argument("--threshold", type=float, default=0.2, help="tolerierte Verschlechterung")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    run = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "revision": revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": SEED,
+        "operations": args.operations,
+        "repeat": args.repeat,
+        "results": [],
+    }
+    for scale in args.scales:
+        for backend in args.backends:
+            for result in run_backend(backend, scale, args.operations, args.repeat):
+                _print_result(result)
+                run["results"].append(result)
+
+    output = (
+        Path(args.output)
+        if args.output
+        else RESULTS / (f"{datetime.now():%Y%m%d-%H%M%S}-{run['revision'] or 'unbekannt'}.json")
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(run, indent=2), encoding="utf-8")
+    print(f"\nErgebnisse: {output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        return 1 if compare(run, baseline, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""
+TinyDB-Benchmark: Bestand mit 50k Produkten und 500k Bewegungen
+
+Legt den Bestand blockweise an, öffnet ihn neu (Laden aller Dokumente in die
+Indizes) und misst danach Einzelbuchungen über den WarehouseService, inklusive
+der verzögerten Flushes, sowie Abfragen. Zum Vergleich: ohne direkten Zugriff
+auf den Middleware-Cache kostet jedes Table.insert() einen Umbau der ganzen
+Tabelle, das Anlegen von 500k Bewegungen wäre quadratisch.
+
+Aufruf:
+    python benchmarks/tinydb_scale.py [produkte] [bewegungen] [flush_every]
+"""
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.suite import (  # noqa: E402
+    SEED_BATCH,
+    _batches,
+    generate_movements,
+    generate_products,
+)
+from src.adapters.repository import RepositoryFactory  # noqa: E402
+from src.services import WarehouseService  # noqa: E402
+
+OPERATIONS = 5_000
+
+
+def timed(label: str, function):
+    start = time.perf_counter()
+    result = function()
+    print(f"{label:<34} {time.perf_counter() - start:>9.2f} s")
+    return result
+
+
+def latencies(label: str, function, arguments: list) -> None:
+    measured = []
+    for args in arguments:
+        start = time.perf_counter()
+        function(*args)
+        measured.append(time.perf_counter() - start)
+    measured.sort()
+    print(
+        f"{label:<34} p50 {measured[len(measured) // 2] * 1e6:>8.1f}µs  "
+        f"p99 {measured[int(len(measured) * 0.99)] * 1e6:>8.1f}µs  "
+        f"Mittel {sum(measured) / len(measured) * 1e6:>8.1f}µs"
+    )
+
+
+def main() -> None:
+    products = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    movements = int(sys.argv[2]) if len(sys.argv) > 2 else 500_000
+    flush_every = int(sys.argv[3]) if len(sys.argv) > 3 else 1000
+    print(f"{products} Produkte, {movements} Bewegungen, flush_every={flush_every}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        options = {"directory": directory, "flush_every": flush_every}
+        repository = RepositoryFactory.create_repository("tinydb", **options)
+
+        def seed():
+            for batch in _batches(generate_products(products), SEED_BATCH):
+                repository.save_products(batch)
+            for batch in _batches(generate_movements(movements, products), SEED_BATCH):
+                repository.save_movements(batch)
+
+        timed("Anlegen (Blöcke zu 10k)", seed)
+        timed("Schließen (letzter Flush)", repository.close)
+        size = sum(path.stat().st_size for path in Path(directory).glob("*.json"))
+        print(f"{'Dateien':<34} {size / 1e6:>9.1f} MB")
+
+        repository = timed(
+            "Neu öffnen (Indizes aufbauen)",
+            lambda: RepositoryFactory.create_repository("tinydb", **options),
+        )
+        service = WarehouseService(repository)
+        rng = random.Random(7)
+        ids = [f"P{rng.randrange(products):07d}" for _ in range(OPERATIONS)]
+        latencies("add_to_stock (inkl. Flushes)", service.add_to_stock, [(i, 5) for i in ids])
+        latencies("remove_from_stock", service.remove_from_stock, [(i, 1) for i in ids])
+        latencies("get_product", service.get_product, [(i,) for i in ids])
+        latencies("get_product_history", service.get_product_history, [(i,) for i in ids[:500]])
+        timed("get_total_inventory_value", service.get_total_inventory_value)
+        timed("Schließen", repository.close)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,33 @@
-"""Adapters - Konkrete Implementierungen der Ports"""
+"""
+Adapters - Konkrete Implementierungen der Ports
 
-from .repository import InMemoryRepository, RepositoryFactory
-from .report import ConsoleReportAdapter
+Die Adapter werden erst beim ersten Zugriff importiert (PEP 562): wer nur
+SQLite braucht, lädt weder asyncio noch TinyDB.
+"""
 
-__all__ = ["InMemoryRepository", "RepositoryFactory", "ConsoleReportAdapter"]
+_LAZY = {
+    "InMemoryRepository": "repository",
+    "SqliteRepository": "repository",
+    "RepositoryFactory": "repository",
+    "ConsoleReportAdapter": "report",
+    "ColumnarMovementStore": "columnar",
+    "AsyncInMemoryRepository": "async_repository",
+    "AsyncSqliteRepository": "async_repository",
+    "CachingRepository": "caching",
+    "JournalRepository": "journal",
+    "TinyDBRepository": "tinydb_repository",
+    "InMemoryTransferLog": "transfer_log",
+    "JournalTransferLog": "transfer_log",
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name: str):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+
+    value = getattr(import_module(f".{_LAZY[name]}", __name__), name)
+    globals()[name] = value
+    return value
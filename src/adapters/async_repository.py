@@ -0,0 +1,246 @@
+"""
+Async Repository Adapter - asynchrone Implementierungen des AsyncRepositoryPort
+
+Das In-Memory-Repository arbeitet direkt in der Ereignisschleife. Das
+SQLite-Repository besitzt einen eigenen Thread mit der Datenbankverbindung:
+Anfragen werden in eine Warteschlange gestellt, der Thread nimmt jeweils alle
+wartenden Anfragen und führt sie in einer Transaktion aus (ein Commit für
+viele gleichzeitige Anfragen). Ergebnisse gehen per call_soon_threadsafe an
+die aufrufende Ereignisschleife zurück.
+"""
+
+import asyncio
+import queue
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar, Union
+
+from ..domain.product import Product
+from ..domain.warehouse import Movement
+from ..ports import AsyncRepositoryPort, Page
+from .repository import InMemoryRepository, SqliteRepository
+
+T = TypeVar("T")
+# (Future, Ereignisschleife, Ergebnis, None) bzw. (Future, Ereignisschleife, None, Fehler)
+_Outcome = Union[
+    Tuple["asyncio.Future[Any]", asyncio.AbstractEventLoop, Any, None],
+    Tuple["asyncio.Future[Any]", asyncio.AbstractEventLoop, None, Exception],
+]
+
+
+class AsyncInMemoryRepository(AsyncRepositoryPort):
+    """
+    Asynchrones In-Memory Repository über einem InMemoryRepository
+
+    Jeder Aufruf läuft ohne await vollständig durch und ist damit innerhalb
+    der Ereignisschleife atomar. Indizes, Kopien und Versionen kommen vom
+    zugrunde liegenden InMemoryRepository.
+    """
+
+    def __init__(self, repository: Optional[InMemoryRepository] = None):
+        """
+        Args:
+            repository: zugrunde liegender Speicher (Standard: neues InMemoryRepository)
+        """
+        self.repository = repository if repository is not None else InMemoryRepository()
+
+    async def load_product(self, product_id: str) -> Optional[Product]:
+        return self.repository.load_product(product_id)
+
+    async def load_products(self, product_ids: Iterable[str]) -> Dict[str, Product]:
+        return self.repository.load_products(product_ids)
+
+    async def find_by_sku(self, sku: str) -> Optional[Product]:
+        return self.repository.find_by_sku(sku)
+
+    async def save_changes(
+        self,
+        products: Iterable[Product],
+        movements: Iterable[Movement] = (),
+        expected_versions: Optional[Dict[str, int]] = None,
+    ) -> None:
+        # save_products() prüft alle Versionen vorab; bei Konflikt wird nichts gespeichert
+        self.repository.save_products(products, expected_versions)
+        self.repository.save_movements(movements)
+
+    async def delete_product(self, product_id: str) -> None:
+        self.repository.delete_product(product_id)
+
+    async def list_products_page(
+        self, after: Optional[tuple] = None, limit: int = 500, order_by: str = "id"
+    ) -> Page[Product]:
+        return self.repository.list_products_page(after=after, limit=limit, order_by=order_by)
+
+    async def list_movements_page(
+        self, after: Optional[tuple] = None, limit: int = 500, order_by: str = "timestamp"
+    ) -> Page[Movement]:
+        return self.repository.list_movements_page(after=after, limit=limit, order_by=order_by)
+
+    async def movements_between(
+        self, since: Optional[datetime] = None, until: Optional[datetime] = None
+    ) -> List[Movement]:
+        return self.repository.movements_between(since, until)
+
+    async def movements_for_product(
+        self,
+        product_id: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> List[Movement]:
+        return self.repository.movements_for_product(product_id, since, until)
+
+
+def _deliver(outcomes: List[tuple]) -> None:
+    """Ergebnisse eines Batches in der Ereignisschleife an die Futures übergeben"""
+    for future, result, error in outcomes:
+        if future.cancelled():
+            continue
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+
+class AsyncSqliteRepository(AsyncRepositoryPort):
+    """
+    Asynchrones SQLite Repository mit eigenem Datenbank-Thread
+
+    Alle Zugriffe (auch Lesezugriffe, damit sie eigene Schreibzugriffe
+    sehen) laufen nacheinander im Datenbank-Thread. Wartende Anfragen werden
+    gebündelt in einer Transaktion ausgeführt (SqliteRepository.batch());
+    jede Anfrage läuft darin als Savepoint, sodass ein Versionskonflikt nur
+    die eigene Anfrage zurückrollt.
+    """
+
+    def __init__(self, db_path: str = "lager.db", max_batch: int = 256, **options):
+        """
+        Args:
+            db_path: Pfad zur Datenbankdatei
+            max_batch: maximale Anzahl Anfragen pro Transaktion
+            **options: weitere Optionen für SqliteRepository (z.B. batch_size)
+
+        Raises:
+            ValueError: wenn max_batch < 1
+        """
+        if max_batch < 1:
+            raise ValueError(f"max_batch muss positiv sein: {max_batch}")
+        self.max_batch = max_batch
+        # Anzahl ausgeführter Transaktionen (zum Beobachten der Bündelung)
+        self.commits = 0
+        self._repository = SqliteRepository(db_path, **options)
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="sqlite-async", daemon=True)
+        self._thread.start()
+
+    def _call(self, fn: Optional[Callable[..., T]], *args) -> "asyncio.Future[T]":
+        """fn(*args) im Datenbank-Thread ausführen lassen"""
+        if self._closed:
+            raise RuntimeError("Repository ist geschlossen")
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.put((fn, args, future, loop))
+        return future
+
+    def _run(self) -> None:
+        """Schleife des Datenbank-Threads"""
+        running = True
+        while running:
+            requests = [self._queue.get()]
+            while len(requests) < self.max_batch:
+                try:
+                    requests.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            outcomes: List[_Outcome] = []
+            try:
+                with self._repository.batch():
+                    for fn, args, future, loop in requests:
+                        if fn is None:
+                            running = False
+                            continue
+                        try:
+                            outcomes.append((future, loop, fn(*args), None))
+                        except Exception as error:
+                            outcomes.append((future, loop, None, error))
+            except Exception as error:
+                # Commit gescheitert: keine Anfrage des Batches wurde gespeichert
+                outcomes = [(future, loop, None, error) for future, loop, _, _ in outcomes]
+            self.commits += 1
+            if not running:
+                self._repository.close()
+                outcomes += [(f, loop, None, None) for fn, _, f, loop in requests if fn is None]
+            self._send(outcomes)
+
+    @staticmethod
+    def _send(outcomes: List[_Outcome]) -> None:
+        """Ergebnisse je Ereignisschleife mit einem Aufruf zustellen"""
+        by_loop: Dict[asyncio.AbstractEventLoop, List[tuple]] = {}
+        for future, loop, result, error in outcomes:
+            by_loop.setdefault(loop, []).append((future, result, error))
+        for loop, items in by_loop.items():
+            try:
+                loop.call_soon_threadsafe(_deliver, items)
+            except RuntimeError:
+                pass  # Ereignisschleife bereits geschlossen, niemand wartet mehr
+
+    def _save_changes(
+        self,
+        products: List[Product],
+        movements: List[Movement],
+        expected_versions: Optional[Dict[str, int]],
+    ) -> None:
+        with self._repository.batch():
+            self._repository.save_products(products, expected_versions)
+            self._repository.save_movements(movements)
+
+    async def load_product(self, product_id: str) -> Optional[Product]:
+        return await self._call(self._repository.load_product, product_id)
+
+    async def load_products(self, product_ids: Iterable[str]) -> Dict[str, Product]:
+        return await self._call(self._repository.load_products, list(product_ids))
+
+    async def find_by_sku(self, sku: str) -> Optional[Product]:
+        return await self._call(self._repository.find_by_sku, sku)
+
+    async def save_changes(
+        self,
+        products: Iterable[Product],
+        movements: Iterable[Movement] = (),
+        expected_versions: Optional[Dict[str, int]] = None,
+    ) -> None:
+        await self._call(self._save_changes, list(products), list(movements), expected_versions)
+
+    async def delete_product(self, product_id: str) -> None:
+        await self._call(self._repository.delete_product, product_id)
+
+    async def list_products_page(
+        self, after: Optional[tuple] = None, limit: int = 500, order_by: str = "id"
+    ) -> Page[Product]:
+        return await self._call(self._repository.list_products_page, after, limit, order_by)
+
+    async def list_movements_page(
+        self, after: Optional[tuple] = None, limit: int = 500, order_by: str = "timestamp"
+    ) -> Page[Movement]:
+        return await self._call(self._repository.list_movements_page, after, limit, order_by)
+
+    async def movements_between(
+        self, since: Optional[datetime] = None, until: Optional[datetime] = None
+    ) -> List[Movement]:
+        return await self._call(self._repository.movements_between, since, until)
+
+    async def movements_for_product(
+        self,
+        product_id: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> List[Movement]:
+        return await self._call(self._repository.movements_for_product, product_id, since, until)
+
+    async def close(self) -> None:
+        """Ausstehende Anfragen abarbeiten, dann Thread beenden und Verbindung schließen"""
+        if self._closed:
+            return
+        future: "asyncio.Future[None]" = self._call(None)
+        self._closed = True
+        await future
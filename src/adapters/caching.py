@@ -0,0 +1,287 @@
+"""
+Caching Repository - Read-Through-Cache für Produkte vor einem beliebigen RepositoryPort
+
+Häufig gescannte Produkte werden nicht bei jedem Zugriff erneut aus der
+Datenbank gelesen und deserialisiert. Der Cache ist in der Größe begrenzt
+(LRU) und optional zeitlich (TTL); Schreibzugriffe gehen sofort an das
+Repository und aktualisieren den Cache (Write-Through).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..domain.product import Product
+from ..domain.warehouse import Movement
+from ..ports import Page, RepositoryPort
+
+
+class CachingRepository(RepositoryPort):
+    """
+    Repository-Dekorator mit LRU/TTL-Cache für Produkte
+
+    Für den WarehouseService transparent: alle Port-Methoden verhalten sich
+    wie beim umhüllten Repository. Gecacht werden Produkte (load_product,
+    load_products, find_by_sku); Listen, Seiten und Bewegungen werden direkt
+    durchgereicht. Der Cache hält Kopien, ausgegeben werden ebenfalls Kopien.
+
+    Ändert ein anderer Prozess die Daten, kann ein Eintrag bis zum Ablauf der
+    TTL veraltet sein. Schreibzugriffe per Compare-and-Swap scheitern dann am
+    Versionsvergleich des Repositories; der Eintrag wird dabei verworfen, die
+    Wiederholung liest frische Daten.
+    """
+
+    def __init__(
+        self,
+        repository: RepositoryPort,
+        max_size: int = 10_000,
+        ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            repository: umhülltes Repository
+            max_size: maximale Anzahl gecachter Produkte
+            ttl: Lebensdauer eines Eintrags in Sekunden (None = unbegrenzt)
+            clock: Zeitquelle (für Tests austauschbar)
+
+        Raises:
+            ValueError: wenn max_size < 1 oder ttl <= 0
+        """
+        if max_size < 1:
+            raise ValueError(f"max_size muss positiv sein: {max_size}")
+        if ttl is not None and ttl <= 0:
+            raise ValueError(f"ttl muss positiv sein: {ttl}")
+        self.repository = repository
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        # Produkt-ID -> (Kopie, Ablaufzeitpunkt); Reihenfolge = zuletzt benutzt am Ende
+        self._entries: "OrderedDict[str, Tuple[Product, float]]" = OrderedDict()
+        self._sku_ids: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        # Zählt Schreibzugriffe; ein Lesezugriff, der währenddessen das Repository
+        # gefragt hat, legt sein (evtl. veraltetes) Ergebnis nicht im Cache ab
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __getattr__(self, name: str):
+        # Adapter-spezifisches (batch(), db_path ...) an das Repository weiterreichen
+        if name == "repository":
+            raise AttributeError(name)
+        return getattr(self.repository, name)
+
+    def stats(self) -> Dict[str, int]:
+        """Zähler des Caches (Treffer, Fehlzugriffe, Verdrängungen, Abläufe, Größe)"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": len(self._entries),
+            }
+
+    def clear(self) -> None:
+        """Cache leeren (Zähler bleiben erhalten)"""
+        with self._lock:
+            self._entries.clear()
+            self._sku_ids.clear()
+            self._writes += 1
+
+    # Cache-Verwaltung; Aufrufer hält self._lock
+
+    def _get(self, product_id: str) -> Optional[Product]:
+        entry = self._entries.get(product_id)
+        if entry is None:
+            self.misses += 1
+            return None
+        product, expires_at = entry
+        if expires_at < self._clock():
+            self._drop(product_id)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(product_id)
+        self.hits += 1
+        return product.copy()
+
+    def _put(self, product: Product) -> None:
+        if product.id in self._entries:
+            self._drop(product.id)
+        expires_at = self._clock() + self.ttl if self.ttl is not None else float("inf")
+        self._entries[product.id] = (product.copy(), expires_at)
+        if product.sku:
+            self._sku_ids[product.sku] = product.id
+        while len(self._entries) > self.max_size:
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _drop(self, product_id: str) -> None:
+        entry = self._entries.pop(product_id, None)
+        if entry is not None and entry[0].sku and self._sku_ids.get(entry[0].sku) == product_id:
+            del self._sku_ids[entry[0].sku]
+
+    def _fill(self, products: Iterable[Product], writes: int) -> None:
+        """Gelesene Produkte ablegen, sofern seit dem Lesen nicht geschrieben wurde"""
+        with self._lock:
+            if writes == self._writes:
+                for product in products:
+                    self._put(product)
+
+    def _written(self, products: Iterable[Product]) -> None:
+        with self._lock:
+            self._writes += 1
+            for product in products:
+                self._put(product)
+
+    def _invalidate(self, product_ids: Iterable[str]) -> None:
+        with self._lock:
+            self._writes += 1
+            for product_id in product_ids:
+                self._drop(product_id)
+
+    # Produkte (gecacht)
+
+    def load_product(self, product_id: str) -> Optional[Product]:
+        """Produkt aus dem Cache oder (bei Fehlzugriff) aus dem Repository laden"""
+        with self._lock:
+            product = self._get(product_id)
+            writes = self._writes
+        if product is not None:
+            return product
+        product = self.repository.load_product(product_id)
+        if product is not None:
+            self._fill([product], writes)
+        return product
+
+    def load_products(self, product_ids: Iterable[str]) -> Dict[str, Product]:
+        """Treffer aus dem Cache, die übrigen Produkte mit einem Sammelzugriff laden"""
+        products: Dict[str, Product] = {}
+        missing: List[str] = []
+        with self._lock:
+            for product_id in dict.fromkeys(product_ids):
+                product = self._get(product_id)
+                if product is not None:
+                    products[product_id] = product
+                else:
+                    missing.append(product_id)
+            writes = self._writes
+        if missing:
+            loaded = self.repository.load_products(missing)
+            self._fill(loaded.values(), writes)
+            products.update(loaded)
+        return products
+
+    def find_by_sku(self, sku: str) -> Optional[Product]:
+        """Produkt über die SKU, bei bekannter SKU ohne Zugriff auf das Repository"""
+        with self._lock:
+            product_id = self._sku_ids.get(sku) if sku else None
+            if product_id is not None:
+                product = self._get(product_id)
+            else:
+                product = None
+                self.misses += 1
+            writes = self._writes
+        if product is not None:
+            return product
+        product = self.repository.find_by_sku(sku)
+        if product is None:
+            return None
+        # Das Repository darf sein gespeichertes Objekt liefern; Aufrufer bekommen eine Kopie
+        self._fill([product], writes)
+        return product.copy()
+
+    def save_product(self, product: Product, expected_version: Optional[int] = None) -> None:
+        """Produkt speichern und den Cache aktualisieren (Write-Through)"""
+        try:
+            self.repository.save_product(product, expected_version)
+        except Exception:
+            # Konflikt oder Fehler: der Stand im Repository ist unbekannt
+            self._invalidate([product.id])
+            raise
+        self._written([product])
+
+    def save_products(
+        self, products: Iterable[Product], expected_versions: Optional[Dict[str, int]] = None
+    ) -> None:
+        """Mehrere Produkte speichern und den Cache aktualisieren"""
+        products = list(products)
+        try:
+            self.repository.save_products(products, expected_versions)
+        except Exception:
+            self._invalidate(product.id for product in products)
+            raise
+        self._written(products)
+
+    def delete_product(self, product_id: str) -> None:
+        """Produkt löschen und aus dem Cache entfernen"""
+        self._invalidate([product_id])
+        self.repository.delete_product(product_id)
+        self._invalidate([product_id])
+
+    # Durchgereicht (nicht gecacht)
+
+    def load_all_products(self) -> Dict[str, Product]:
+        return self.repository.load_all_products()
+
+    def iter_products(self) -> Iterator[Product]:
+        return self.repository.iter_products()
+
+    def count_products(self) -> int:
+        return self.repository.count_products()
+
+    def inventory_value_by_category(self) -> Dict[str, float]:
+        return self.repository.inventory_value_by_category()
+
+    def rebuild_inventory_value(self) -> None:
+        self.repository.rebuild_inventory_value()
+
+    def list_by_category(self, category: str) -> List[Product]:
+        return self.repository.list_by_category(category)
+
+    def list_below_threshold(self, threshold: int) -> List[Product]:
+        return self.repository.list_below_threshold(threshold)
+
+    def list_products_page(
+        self, after: Optional[tuple] = None, limit: int = 500, order_by: str = "id"
+    ) -> Page[Product]:
+        return self.repository.list_products_page(after=after, limit=limit, order_by=order_by)
+
+    def save_movement(self, movement: Movement) -> None:
+        self.repository.save_movement(movement)
+
+    def save_movements(self, movements: Iterable[Movement]) -> None:
+        self.repository.save_movements(movements)
+
+    def load_movements(self) -> List[Movement]:
+        return self.repository.load_movements()
+
+    def count_movements(self) -> int:
+        return self.repository.count_movements()
+
+    def list_movements_page(
+        self, after: Optional[tuple] = None, limit: int = 500, order_by: str = "timestamp"
+    ) -> Page[Movement]:
+        return self.repository.list_movements_page(after=after, limit=limit, order_by=order_by)
+
+    def movements_between(
+        self, since: Optional[datetime] = None, until: Optional[datetime] = None
+    ) -> List[Movement]:
+        return self.repository.movements_between(since, until)
+
+    def movements_for_product(
+        self,
+        product_id: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> List[Movement]:
+        return self.repository.movements_for_product(product_id, since, until)
+
+    def close(self) -> None:
+        self.repository.close()
@@ -0,0 +1,243 @@
+"""Columnar Movement Store - spaltenorientierter Bewegungsspeicher auf array.array-Basis"""
+
+import bisect
+from array import array
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+from ..domain.ids import SnowflakeIdGenerator
+from ..domain.warehouse import Movement
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_ID_FORMAT = SnowflakeIdGenerator(node_id=0)
+
+
+def _to_micros(moment: datetime) -> int:
+    """Naiven Zeitstempel exakt (ohne Zeitzonenumrechnung) in Mikrosekunden wandeln"""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone().replace(tzinfo=None)
+    return (moment - _EPOCH) // _MICROSECOND
+
+
+class MovementView:
+    """
+    Leichtgewichtige Sicht auf eine Zeile im ColumnarMovementStore
+
+    Bietet dieselben Attribute wie Movement, hält aber nur Store und Zeilennummer.
+    """
+
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store: "ColumnarMovementStore", row: int):
+        self._store = store
+        self._row = row
+
+    @property
+    def id(self) -> str:
+        return self._store._decode_id(self._store._ids[self._row])
+
+    @property
+    def product_id(self) -> str:
+        return self._store._text(self._store._products[self._row])
+
+    @property
+    def product_name(self) -> str:
+        return self._store._text(self._store._names[self._row])
+
+    @property
+    def quantity_change(self) -> int:
+        return self._store._deltas[self._row]
+
+    @property
+    def movement_type(self) -> str:
+        return self._store._text(self._store._types[self._row])
+
+    @property
+    def reason(self) -> Optional[str]:
+        return self._store._strings[self._store._reasons[self._row]]
+
+    @property
+    def timestamp(self) -> datetime:
+        return _EPOCH + timedelta(microseconds=self._store._timestamps[self._row])
+
+    @property
+    def performed_by(self) -> str:
+        return self._store._text(self._store._users[self._row])
+
+    def to_movement(self) -> Movement:
+        """Vollwertiges Movement-Objekt erzeugen"""
+        return Movement(
+            id=self.id,
+            product_id=self.product_id,
+            product_name=self.product_name,
+            quantity_change=self.quantity_change,
+            movement_type=self.movement_type,
+            reason=self.reason,
+            timestamp=self.timestamp,
+            performed_by=self.performed_by,
+        )
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (MovementView, Movement)):
+            return self.to_movement() == (
+                other.to_movement() if isinstance(other, MovementView) else other
+            )
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"MovementView({self.to_movement()!r})"
+
+
+class ProductMovements:
+    """
+    Sequenz der Bewegungen eines Produkts im ColumnarMovementStore
+
+    Hält nur die Zeilennummern; Elemente werden als MovementView geliefert.
+    """
+
+    __slots__ = ("_store", "_rows")
+
+    def __init__(self, store: "ColumnarMovementStore", rows: array):
+        self._store = store
+        self._rows = rows
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [MovementView(self._store, row) for row in self._rows[index]]
+        return MovementView(self._store, self._rows[index])
+
+
+class ColumnarMovementStore:
+    """
+    Spaltenorientierter Speicher für Lagerbewegungen
+
+    Statt eines Objekts pro Bewegung werden die Felder in typisierten Arrays
+    abgelegt: 64-Bit-IDs (Snowflake), 64-Bit-Zeitstempel in Mikrosekunden,
+    32-Bit-Mengen und Verweise in eine Tabelle internierter Texte (Produkt-ID,
+    Name, Typ, Grund, Benutzer). Zeilen werden als MovementView zurückgegeben.
+
+    Unterstützt die Sequenz-Operationen, die InMemoryRepository benötigt
+    (len, Index/Slice, append, insert, for_product), und kann dort als
+    movement_store eingesetzt werden. Je Produkt werden die Zeilennummern
+    mitgeführt (4 Byte pro Bewegung), für zeitlich sortierte Produkthistorien.
+    """
+
+    def __init__(self, movements: Iterable[Movement] = ()):
+        self._ids = array("q")
+        self._timestamps = array("q")
+        self._deltas = array("i")
+        self._products = array("I")
+        self._names = array("I")
+        self._types = array("I")
+        self._reasons = array("I")
+        self._users = array("I")
+        # Index 0 ist für None reserviert (z.B. fehlender Grund)
+        self._strings: List[Optional[str]] = [None]
+        self._string_codes: Dict[Optional[str], int] = {None: 0}
+        # Zeilennummern je Produkt (Code der Produkt-ID), aufsteigend = zeitlich sortiert
+        self._product_rows: Dict[int, array] = {}
+        for movement in movements:
+            self.append(movement)
+
+    def _intern(self, value: Optional[str]) -> int:
+        code = self._string_codes.get(value)
+        if code is None:
+            code = self._string_codes[value] = len(self._strings)
+            self._strings.append(value)
+        return code
+
+    def _text(self, code: int) -> str:
+        """Internierten Text lesen; nur Code 0 (kein Grund) steht für None"""
+        text = self._strings[code]
+        assert text is not None, "Code 0 ist nur für den Grund zulässig"
+        return text
+
+    def _encode_id(self, movement_id: str) -> int:
+        try:
+            value = _ID_FORMAT.parse(movement_id)
+            if _ID_FORMAT.format(value) == movement_id:
+                return value
+        except ValueError:
+            pass
+        # Fremde ID-Formate werden interniert und negativ kodiert
+        return -self._intern(movement_id)
+
+    def _decode_id(self, value: int) -> str:
+        return _ID_FORMAT.format(value) if value >= 0 else self._text(-value)
+
+    def _columns(self, movement: Movement) -> tuple:
+        return (
+            self._encode_id(movement.id),
+            _to_micros(movement.timestamp),
+            movement.quantity_change,
+            self._intern(movement.product_id),
+            self._intern(movement.product_name),
+            self._intern(movement.movement_type),
+            self._intern(movement.reason),
+            self._intern(movement.performed_by),
+        )
+
+    def _arrays(self) -> tuple:
+        return (
+            self._ids,
+            self._timestamps,
+            self._deltas,
+            self._products,
+            self._names,
+            self._types,
+            self._reasons,
+            self._users,
+        )
+
+    def append(self, movement: Movement) -> None:
+        """Bewegung anhängen"""
+        values = self._columns(movement)
+        for column, value in zip(self._arrays(), values):
+            column.append(value)
+        self._product_rows.setdefault(values[3], array("I")).append(len(self) - 1)
+
+    def extend(self, movements: Iterable[Movement]) -> None:
+        """Mehrere Bewegungen anhängen"""
+        for movement in movements:
+            self.append(movement)
+
+    def insert(self, row: int, movement: Movement) -> None:
+        """Bewegung an Position row einfügen (O(n), nur für verspätete Bewegungen)"""
+        row = max(0, min(row if row >= 0 else row + len(self), len(self)))
+        values = self._columns(movement)
+        for column, value in zip(self._arrays(), values):
+            column.insert(row, value)
+        for rows in self._product_rows.values():
+            for position in range(bisect.bisect_left(rows, row), len(rows)):
+                rows[position] += 1
+        bisect.insort(self._product_rows.setdefault(values[3], array("I")), row)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [MovementView(self, row) for row in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Index außerhalb des Bewegungsspeichers")
+        return MovementView(self, index)
+
+    def __iter__(self) -> Iterator[MovementView]:
+        return (MovementView(self, row) for row in range(len(self)))
+
+    def for_product(self, product_id: str) -> "ProductMovements":
+        """Zeitlich sortierte Sicht auf die Bewegungen eines Produkts"""
+        # Unbekannte Produkte erhalten Code 0, unter dem nie Zeilen stehen
+        code = self._string_codes.get(product_id, 0)
+        return ProductMovements(self, self._product_rows.get(code, array("I")))
+
+    def nbytes(self) -> int:
+        """Belegter Speicher der Arrays (ohne internierte Texte) in Bytes"""
+        columns = (*self._arrays(), *self._product_rows.values())
+        return sum(column.itemsize * len(column) for column in columns)
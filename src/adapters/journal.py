@@ -0,0 +1,419 @@
+"""
+Journal Repository - Event-Sourcing mit Append-only-Journal und Snapshots
+
+Jede Änderung wird zuerst als Datensatz an ein binäres Journal angehängt
+(Write-Ahead) und danach im Speicher angewendet. Datensätze sind
+längenpräfigiert und mit CRC32 geschützt:
+
+    [4 Byte Länge][4 Byte CRC32][JSON-Nutzdaten]
+
+fsync erfolgt gruppiert (Group Commit): nach group_size Datensätzen bzw.
+spätestens nach group_interval Sekunden. In regelmäßigen Abständen wird der
+Produktzustand als Snapshot samt Journal-Offset geschrieben; beim Start wird
+der letzte Snapshot geladen und nur der Journal-Rest danach abgespielt.
+"""
+
+import json
+import os
+import struct
+import threading
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Type, TypeVar
+
+from ..domain.product import Product
+from ..domain.warehouse import Movement
+from ..ports import next_version
+from .repository import InMemoryRepository, _movement_key
+
+_HEADER = struct.Struct(">II")
+
+_PRODUCT_FIELDS = (
+    "id",
+    "name",
+    "description",
+    "price",
+    "quantity",
+    "sku",
+    "category",
+    "created_at",
+    "updated_at",
+    "notes",
+    "reorder_point",
+    "target_quantity",
+    "version",
+)
+_MOVEMENT_FIELDS = (
+    "id",
+    "product_id",
+    "product_name",
+    "quantity_change",
+    "movement_type",
+    "reason",
+    "timestamp",
+    "performed_by",
+)
+_DATETIME_FIELDS = ("created_at", "updated_at", "timestamp")
+
+T = TypeVar("T")
+
+
+def _to_record(obj, fields: tuple) -> dict:
+    record = {name: getattr(obj, name) for name in fields}
+    for name in _DATETIME_FIELDS:
+        if name in record:
+            record[name] = record[name].isoformat()
+    return record
+
+
+def _from_record(record: dict, cls: Type[T]) -> T:
+    values = dict(record)
+    for name in _DATETIME_FIELDS:
+        if name in values:
+            values[name] = datetime.fromisoformat(values[name])
+    return cls(**values)
+
+
+def product_to_record(product: Product) -> dict:
+    """Produkt als JSON-fähiges Dictionary"""
+    return _to_record(product, _PRODUCT_FIELDS)
+
+
+def product_from_record(record: dict) -> Product:
+    """Produkt aus einem JSON-Dictionary"""
+    return _from_record(record, Product)
+
+
+def movement_to_record(movement: Movement) -> dict:
+    """Bewegung als JSON-fähiges Dictionary"""
+    return _to_record(movement, _MOVEMENT_FIELDS)
+
+
+def movement_from_record(record: dict) -> Movement:
+    """Bewegung aus einem JSON-Dictionary"""
+    return _from_record(record, Movement)
+
+
+class MovementJournal:
+    """Append-only-Journal mit längenpräfigierten Datensätzen und Group Commit"""
+
+    def __init__(self, path: str, group_size: int = 64, group_interval: float = 0.05):
+        """
+        Args:
+            path: Journal-Datei
+            group_size: fsync spätestens nach so vielen Datensätzen
+            group_interval: fsync spätestens nach so vielen Sekunden
+                (0 = kein Hintergrund-Sync)
+        """
+        self.path = path
+        self.group_size = group_size
+        self.group_interval = group_interval
+        self._lock = threading.Lock()
+        self._file = open(path, "ab")
+        self._pending = 0
+        self._closed = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if group_interval > 0:
+            self._flusher = threading.Thread(
+                target=self._flush_periodically, name="journal-group-commit", daemon=True
+            )
+            self._flusher.start()
+
+    @property
+    def size(self) -> int:
+        """Aktuelle Länge des Journals in Bytes (= Offset des nächsten Datensatzes)"""
+        with self._lock:
+            return self._file.tell()
+
+    def append(self, record: dict) -> int:
+        """
+        Datensatz anhängen
+
+        Returns:
+            Offset hinter dem Datensatz
+        """
+        return self.append_many([record])
+
+    def append_many(self, records: Iterable[dict]) -> int:
+        """Mehrere Datensätze anhängen; höchstens ein fsync für den ganzen Block"""
+        with self._lock:
+            for record in records:
+                payload = json.dumps(record, separators=(",", ":")).encode("utf-8")
+                self._file.write(_HEADER.pack(len(payload), zlib.crc32(payload)))
+                self._file.write(payload)
+                self._pending += 1
+            if self._pending >= self.group_size:
+                self._sync_locked()
+            return self._file.tell()
+
+    def sync(self) -> None:
+        """Alle ausstehenden Datensätze per fsync dauerhaft machen"""
+        with self._lock:
+            self._sync_locked()
+
+    def _sync_locked(self) -> None:
+        if self._pending:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._pending = 0
+
+    def _flush_periodically(self) -> None:
+        while not self._closed.wait(self.group_interval):
+            self.sync()
+
+    def close(self) -> None:
+        """Ausstehende Datensätze sichern und Datei schließen"""
+        self._closed.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        with self._lock:
+            if not self._file.closed:
+                self._sync_locked()
+                self._file.close()
+
+    def read(self, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, dict]]:
+        """
+        Datensätze ab Offset start lesen
+
+        Liest bis end bzw. bis zum ersten unvollständigen oder beschädigten
+        Datensatz (abgebrochener Schreibvorgang) und liefert (Offset danach, Datensatz).
+        """
+        with self._lock:
+            self._file.flush()
+        with open(self.path, "rb") as source:
+            source.seek(start)
+            offset = start
+            while end is None or offset < end:
+                header = source.read(_HEADER.size)
+                if len(header) < _HEADER.size:
+                    return
+                length, checksum = _HEADER.unpack(header)
+                payload = source.read(length)
+                if len(payload) < length or zlib.crc32(payload) != checksum:
+                    return
+                offset += _HEADER.size + length
+                yield offset, json.loads(payload)
+
+    def truncate(self, offset: int) -> None:
+        """Journal auf offset kürzen (entfernt einen beschädigten Rest)"""
+        with self._lock:
+            self._file.flush()
+            self._file.truncate(offset)
+            self._file.seek(offset)
+
+
+class SnapshotStore:
+    """Schreibt Produkt-Snapshots atomar (temporäre Datei + os.replace)"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def write(self, products: Iterable[Product], journal_offset: int) -> None:
+        """Snapshot des Produktzustands bis journal_offset schreiben"""
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as target:
+            target.write(json.dumps({"journal_offset": journal_offset}) + "\n")
+            for product in products:
+                target.write(json.dumps(product_to_record(product), separators=(",", ":")))
+                target.write("\n")
+            target.flush()
+            os.fsync(target.fileno())
+        os.replace(temporary, self.path)
+
+    def load(self) -> Tuple[List[Product], int]:
+        """
+        Letzten Snapshot laden
+
+        Returns:
+            (Produkte, Journal-Offset); ohne Snapshot ([], 0)
+        """
+        if not os.path.exists(self.path):
+            return [], 0
+        with open(self.path, encoding="utf-8") as source:
+            journal_offset = json.loads(source.readline())["journal_offset"]
+            products = [product_from_record(json.loads(line)) for line in source]
+        return products, journal_offset
+
+
+class JournalRepository(InMemoryRepository):
+    """
+    Event-Sourcing-Repository: Journal als Wahrheit, Zustand im Speicher
+
+    Die Startzeit hängt nur von der Snapshot-Größe und dem Journal-Rest seit dem
+    Snapshot ab. Ältere Bewegungen werden erst bei der ersten Bewegungsabfrage
+    aus dem Journal nachgeladen.
+
+    Schreiben ins Journal und Anwenden im Speicher geschehen unter derselben
+    Sperre, damit die Journal-Reihenfolge der Anwendungsreihenfolge entspricht.
+    """
+
+    def __init__(
+        self,
+        directory: str = "data",
+        snapshot_every: int = 10_000,
+        group_size: int = 64,
+        group_interval: float = 0.05,
+    ):
+        """
+        Args:
+            directory: Verzeichnis für journal.bin und snapshot.jsonl
+            snapshot_every: Snapshot nach so vielen Journal-Datensätzen
+            group_size: siehe MovementJournal
+            group_interval: siehe MovementJournal
+        """
+        super().__init__()
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self.journal = MovementJournal(
+            os.path.join(directory, "journal.bin"), group_size, group_interval
+        )
+        self.snapshots = SnapshotStore(os.path.join(directory, "snapshot.jsonl"))
+        self._records_since_snapshot = 0
+        self._recover()
+
+    def _recover(self) -> None:
+        products, self._snapshot_offset = self.snapshots.load()
+        for product in products:
+            self._store(product, product.version or 1)
+        self._history_loaded = self._snapshot_offset == 0
+
+        offset = self._snapshot_offset
+        for offset, record in self.journal.read(self._snapshot_offset):
+            self._apply(record)
+            self._records_since_snapshot += 1
+        if offset < self.journal.size:
+            self.journal.truncate(offset)
+
+    def _apply(self, record: dict) -> None:
+        kind = record["type"]
+        if kind == "product":
+            # Versionen stehen fertig im Journal und werden unverändert übernommen;
+            # Datensätze älterer Versionen ohne Versionsfeld zählen als Version 1
+            product = product_from_record(record["data"])
+            self._store(product, product.version or 1)
+        elif kind == "delete":
+            super().delete_product(record["id"])
+        elif kind == "movement":
+            super().save_movement(movement_from_record(record["data"]))
+
+    def _log(self, records: List[dict]) -> None:
+        """Datensätze vor der Anwendung im Speicher ins Journal schreiben (Write-Ahead)"""
+        if records:
+            self.journal.append_many(records)
+            self._records_since_snapshot += len(records)
+
+    def _maybe_snapshot(self) -> None:
+        """Snapshot erst nach der Anwendung im Speicher, damit er den Offset abdeckt"""
+        if self._records_since_snapshot >= self.snapshot_every:
+            self.snapshot()
+
+    def snapshot(self) -> None:
+        """Produktzustand jetzt als Snapshot sichern"""
+        with self._lock:
+            self.journal.sync()
+            self.snapshots.write(self.products.values(), self.journal.size)
+            self._records_since_snapshot = 0
+
+    def _ensure_history(self) -> None:
+        """Bewegungen vor dem Snapshot bei Bedarf aus dem Journal nachladen"""
+        if self._history_loaded:
+            return
+        with self._movement_lock:
+            if self._history_loaded:
+                return
+            older = [
+                movement_from_record(record["data"])
+                for _, record in self.journal.read(0, self._snapshot_offset)
+                if record["type"] == "movement"
+            ]
+            self.movements[:0] = older
+            self.movements.sort(key=_movement_key)
+            self._reindex_movements()
+            self._history_loaded = True
+
+    def save_product(self, product: Product, expected_version: Optional[int] = None) -> None:
+        """Produkt mit neuer Version ins Journal schreiben und im Speicher übernehmen"""
+        expected = None if expected_version is None else {product.id: expected_version}
+        self.save_products([product], expected)
+
+    def save_products(
+        self, products: Iterable[Product], expected_versions: Optional[Dict[str, int]] = None
+    ) -> None:
+        """
+        Mehrere Produkte mit einem Journal-Block schreiben
+
+        Alle Versionen werden vor dem Schreiben geprüft; bei einem Konflikt
+        landet nichts im Journal.
+        """
+        expected_versions = expected_versions or {}
+        products = list(products)
+        with self._lock:
+            versions = [
+                next_version(
+                    self._stored_version(product.id), product, expected_versions.get(product.id)
+                )
+                for product in products
+            ]
+            records = []
+            for product, version in zip(products, versions):
+                record = product_to_record(product)
+                record["version"] = version
+                records.append({"type": "product", "data": record})
+            self._log(records)
+            for product, version in zip(products, versions):
+                self._store(product, version)
+            self._maybe_snapshot()
+
+    def delete_product(self, product_id: str) -> None:
+        """Löschung ins Journal schreiben und im Speicher übernehmen"""
+        with self._lock:
+            if product_id in self.products:
+                self._log([{"type": "delete", "id": product_id}])
+                super().delete_product(product_id)
+                self._maybe_snapshot()
+
+    def save_movement(self, movement: Movement) -> None:
+        """Bewegung ins Journal schreiben und im Speicher übernehmen"""
+        with self._lock:
+            self._log([{"type": "movement", "data": movement_to_record(movement)}])
+            super().save_movement(movement)
+            self._maybe_snapshot()
+
+    def save_movements(self, movements: Iterable[Movement]) -> None:
+        """Mehrere Bewegungen mit einem Journal-Block schreiben"""
+        movements = list(movements)
+        with self._lock:
+            self._log([{"type": "movement", "data": movement_to_record(m)} for m in movements])
+            super().save_movements(movements)
+            self._maybe_snapshot()
+
+    def load_movements(self) -> List[Movement]:
+        """Alle Bewegungen (inkl. nachgeladener Historie)"""
+        self._ensure_history()
+        return super().load_movements()
+
+    def list_movements_page(self, after=None, limit: int = 500, order_by: str = "timestamp"):
+        """Bewegungen seitenweise (inkl. nachgeladener Historie)"""
+        self._ensure_history()
+        return super().list_movements_page(after=after, limit=limit, order_by=order_by)
+
+    def count_movements(self) -> int:
+        """Anzahl Bewegungen (inkl. nachgeladener Historie)"""
+        self._ensure_history()
+        return super().count_movements()
+
+    def movements_between(self, since=None, until=None) -> List[Movement]:
+        """Bewegungen eines Zeitraums (inkl. nachgeladener Historie)"""
+        self._ensure_history()
+        return super().movements_between(since, until)
+
+    def movements_for_product(self, product_id: str, since=None, until=None) -> List[Movement]:
+        """Produkthistorie (inkl. nachgeladener Historie)"""
+        self._ensure_history()
+        return super().movements_for_product(product_id, since, until)
+
+    def close(self) -> None:
+        """Journal sichern und schließen"""
+        self.journal.close()
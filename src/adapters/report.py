@@ -1,73 +1,133 @@
 """Report Adapter - Report-Generierung"""
 
-from typing import Dict
+import heapq
+from itertools import pairwise
+from typing import Iterable, Iterator, Mapping, Optional, Union
 
+from ..domain.product import Product
+from ..domain.warehouse import Movement
 from ..ports import ReportPort
 
 
-class ConsoleReportAdapter(ReportPort):
-    """Report-Adapter für Konsolenausgabe"""
+def _timestamp(movement: Movement):
+    return movement.timestamp
+
+
+def _time_ordered(source: Iterable[Movement]) -> Iterable[Movement]:
+    """
+    Quelle zeitlich geordnet liefern
+
+    Iteratoren werden als bereits sortiert angenommen (z.B. seitenweise aus dem
+    Repository); nur bei Listen wird die Reihenfolge geprüft und notfalls sortiert.
+    """
+    if isinstance(source, list) and any(a.timestamp > b.timestamp for a, b in pairwise(source)):
+        return sorted(source, key=_timestamp)
+    return source
 
-    def __init__(self, products: Dict = None, movements: list = None):
+
+class ConsoleReportAdapter(ReportPort):
+    """
+    Report-Adapter für Konsolenausgabe
+
+    Die Berichte werden als Generator erzeugt und können mit write_*() direkt in
+    eine Datei gestreamt werden. Mehrere zeitlich sortierte Bewegungsquellen
+    werden per heapq.merge() zusammengeführt statt komplett sortiert.
+    """
+
+    def __init__(
+        self,
+        products: Union[Mapping[str, Product], Iterable[Product], None] = None,
+        movements: Optional[Iterable[Movement]] = None,
+        movement_sources: Optional[Iterable[Iterable[Movement]]] = None,
+    ):
+        """
+        Args:
+            products: Produkte als Dictionary (ID -> Produkt) oder beliebiges Iterable
+            movements: Bewegungen (zeitlich sortiert oder als Liste)
+            movement_sources: mehrere zeitlich sortierte Bewegungsquellen
+        """
         self.products = products or {}
         self.movements = movements or []
+        self.movement_sources = movement_sources
 
-    def generate_inventory_report(self) -> str:
+    def _iter_products(self) -> Iterator[Product]:
+        if isinstance(self.products, Mapping):
+            return iter(self.products.values())
+        return iter(self.products)
+
+    def _iter_movements(self) -> Iterator[Movement]:
+        sources = self.movement_sources if self.movement_sources is not None else [self.movements]
+        ordered = [_time_ordered(source) for source in sources]
+        if len(ordered) == 1:
+            return iter(ordered[0])
+        return heapq.merge(*ordered, key=_timestamp)
+
+    def iter_inventory_report(self) -> Iterator[str]:
         """
-        Lagerbestandsbericht als Text generieren
+        Lagerbestandsbericht zeilenweise generieren
 
         Returns:
-            Formatierter Bericht
+            Generator über die Berichtszeilen
         """
-        if not self.products:
-            return "Lager ist leer.\n"
-
-        report = "=" * 60 + "\n"
-        report += "LAGERBESTANDSBERICHT\n"
-        report += "=" * 60 + "\n\n"
-
-        total_value = 0
-        for product_id, product in self.products.items():
+        products = self._iter_products()
+        product = next(products, None)
+        if product is None:
+            yield "Lager ist leer.\n"
+            return
+
+        yield "=" * 60 + "\n"
+        yield "LAGERBESTANDSBERICHT\n"
+        yield "=" * 60 + "\n\n"
+
+        total_value = 0.0
+        while product is not None:
             value = product.get_total_value()
             total_value += value
-            report += f"ID: {product_id}\n"
-            report += f"  Name: {product.name}\n"
-            report += f"  Kategorie: {product.category}\n"
-            report += f"  Bestand: {product.quantity}\n"
-            report += f"  Preis: {product.price:.2f} €\n"
-            report += f"  Gesamtwert: {value:.2f} €\n\n"
-
-        report += "-" * 60 + "\n"
-        report += f"Gesamtwert Lager: {total_value:.2f} €\n"
-        report += "=" * 60 + "\n"
-
-        return report
-
-    def generate_movement_report(self) -> str:
+            yield (
+                f"ID: {product.id}\n"
+                f"  Name: {product.name}\n"
+                f"  Kategorie: {product.category}\n"
+                f"  Bestand: {product.quantity}\n"
+                f"  Preis: {product.price:.2f} €\n"
+                f"  Gesamtwert: {value:.2f} €\n\n"
+            )
+            product = next(products, None)
+
+        yield "-" * 60 + "\n"
+        yield f"Gesamtwert Lager: {total_value:.2f} €\n"
+        yield "=" * 60 + "\n"
+
+    def iter_movement_report(self) -> Iterator[str]:
         """
-        Bewegungsprotokoll als Text generieren
+        Bewegungsprotokoll zeilenweise generieren
 
         Returns:
-            Formatierter Bericht
+            Generator über die Berichtszeilen
         """
-        if not self.movements:
-            return "Keine Lagerbewegungen vorhanden.\n"
-
-        report = "=" * 80 + "\n"
-        report += "BEWEGUNGSPROTOKOLL\n"
-        report += "=" * 80 + "\n\n"
-
-        for movement in sorted(self.movements, key=lambda m: m.timestamp):
-            report += f"[{movement.timestamp.strftime('%Y-%m-%d %H:%M:%S')}]\n"
-            report += f"  Produkt: {movement.product_name} (ID: {movement.product_id})\n"
-            report += f"  Typ: {movement.movement_type}\n"
-            report += f"  Menge: {movement.quantity_change:+d}\n"
+        movements = self._iter_movements()
+        movement = next(movements, None)
+        if movement is None:
+            yield "Keine Lagerbewegungen vorhanden.\n"
+            return
+
+        yield "=" * 80 + "\n"
+        yield "BEWEGUNGSPROTOKOLL\n"
+        yield "=" * 80 + "\n\n"
+
+        count = 0
+        while movement is not None:
+            count += 1
+            lines = (
+                f"[{movement.timestamp.strftime('%Y-%m-%d %H:%M:%S')}]\n"
+                f"  Produkt: {movement.product_name} (ID: {movement.product_id})\n"
+                f"  Typ: {movement.movement_type}\n"
+                f"  Menge: {movement.quantity_change:+d}\n"
+            )
             if movement.reason:
-                report += f"  Grund: {movement.reason}\n"
-            report += f"  Durchgeführt von: {movement.performed_by}\n\n"
-
-        report += "=" * 80 + "\n"
-        report += f"Gesamtbewegungen: {len(self.movements)}\n"
-        report += "=" * 80 + "\n"
+                lines += f"  Grund: {movement.reason}\n"
+            yield lines + f"  Durchgeführt von: {movement.performed_by}\n\n"
+            movement = next(movements, None)
 
-        return report
+        yield "=" * 80 + "\n"
+        yield f"Gesamtbewegungen: {count}\n"
+        yield "=" * 80 + "\n"
@@ -1,60 +1,952 @@
 """Repository Adapter - In-Memory und persistente Implementierungen"""
 
-from typing import Dict, List, Optional
+import bisect
+import importlib.util
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, ContextManager, Dict, Iterable, Iterator, List, Optional, Tuple
 
+from ..domain.inventory import InventoryValue
 from ..domain.product import Product
 from ..domain.warehouse import Movement
-from ..ports import RepositoryPort
+from ..ports import (
+    MOVEMENT_ORDERINGS,
+    PRODUCT_ORDERINGS,
+    Page,
+    RepositoryPort,
+    VersionConflictError,
+    check_page_request,
+    make_page,
+    next_version,
+)
+
+_movement_key = MOVEMENT_ORDERINGS["timestamp"]
+
+
+def _movement_time(movement: Movement) -> datetime:
+    return movement.timestamp
+
+
+def _insort(movements, movement: Movement) -> None:
+    """Nach (timestamp, id) einsortieren; im Normalfall ein append()"""
+    if not movements or _movement_key(movements[-1]) <= _movement_key(movement):
+        movements.append(movement)
+    else:
+        bisect.insort_right(movements, movement, key=_movement_key)
+
+
+def _time_range(movements, since: Optional[datetime], until: Optional[datetime]) -> list:
+    """Ausschnitt [since, until) einer nach Zeit sortierten Sequenz per bisect"""
+    start = 0 if since is None else bisect.bisect_left(movements, since, key=_movement_time)
+    end = (
+        len(movements)
+        if until is None
+        else bisect.bisect_left(movements, until, lo=start, key=_movement_time)
+    )
+    selected: list = movements[start:end]
+    return selected
 
 
 class InMemoryRepository(RepositoryPort):
-    """In-Memory Repository - schnell für Tests und schnelle Prototypen"""
+    """
+    In-Memory Repository - schnell für Tests und schnelle Prototypen
+
+    Sekundärindizes (SKU, Kategorie, Bestand) und der Lagerwert je Kategorie
+    werden bei jedem save_product() nachgeführt. Gespeichert wird eine Kopie
+    des Produkts; alle Lesezugriffe (Einzel-, Listen- und Seitenabfragen,
+    iter_products) liefern ebenfalls Kopien, Änderungen des Aufrufers erreichen
+    den gespeicherten Stand also nur über save_product() (Read-Modify-Write mit
+    Versionen). Bewegungen werden nach (timestamp, id) sortiert gehalten; im
+    Normalfall ist das ein append(). Zusätzlich gibt es je Produkt eine
+    zeitlich sortierte Liste, Zeitraumabfragen laufen per bisect.
 
-    def __init__(self):
+    Threadsicher: Indizes und Bewegungsprotokoll haben getrennte Sperren, damit
+    Bewegungen nicht auf Produktänderungen warten. Einzelabfragen über die
+    Dictionaries (load_product, find_by_sku) laufen ohne Sperre.
+    """
+
+    def __init__(self, movement_store=None):
+        """
+        Args:
+            movement_store: optionaler Bewegungsspeicher statt einer Liste,
+                z.B. ColumnarMovementStore für sehr viele Bewegungen
+        """
         self.products: Dict[str, Product] = {}
-        self.movements: List[Movement] = []
+        self.movements: List[Movement] = movement_store if movement_store is not None else []
+        self._id_index: List[str] = []
+        # Indexschlüssel (sku, category, quantity) je Produkt zum Zeitpunkt des Speicherns
+        self._indexed: Dict[str, Tuple[str, str, int]] = {}
+        self._sku_index: Dict[str, str] = {}
+        self._category_index: Dict[str, List[str]] = {}
+        self._quantity_index: List[Tuple[int, str]] = []
+        self._values = InventoryValue()
+        self._lock = threading.RLock()
+        # Bewegungen je Produkt, ebenfalls nach (timestamp, id) sortiert; ein
+        # Bewegungsspeicher mit eigenem Produktindex (for_product) ersetzt sie
+        self._product_movements: Optional[Dict[str, List[Movement]]] = (
+            None if hasattr(self.movements, "for_product") else {}
+        )
+        self._movement_lock = threading.RLock()
+
+    def _index(self, product: Product) -> None:
+        """Indizes nachführen; nur geänderte Schlüssel werden umgehängt"""
+        product_id = product.id
+        keys = (product.sku, product.category, product.quantity)
+        old_sku, old_category, old_quantity = self._indexed.get(product_id, (None, None, None))
+        if keys == (old_sku, old_category, old_quantity):
+            return
+        self._indexed[product_id] = keys
+        if product.sku != old_sku:
+            if old_sku and self._sku_index.get(old_sku) == product_id:
+                del self._sku_index[old_sku]
+            if product.sku:
+                self._sku_index[product.sku] = product_id
+        if old_category is None:
+            bisect.insort(self._id_index, product_id)
+        if product.category != old_category:
+            if old_category is not None:
+                self._remove_from_category(old_category, product_id)
+            bisect.insort(self._category_index.setdefault(product.category, []), product_id)
+        if product.quantity != old_quantity:
+            if old_quantity is not None:
+                entry = (old_quantity, product_id)
+                del self._quantity_index[bisect.bisect_left(self._quantity_index, entry)]
+            bisect.insort(self._quantity_index, (product.quantity, product_id))
+
+    def _unindex(self, product_id: str) -> None:
+        sku, category, quantity = self._indexed.pop(product_id)
+        del self._id_index[bisect.bisect_left(self._id_index, product_id)]
+        if sku and self._sku_index.get(sku) == product_id:
+            del self._sku_index[sku]
+        self._remove_from_category(category, product_id)
+        del self._quantity_index[bisect.bisect_left(self._quantity_index, (quantity, product_id))]
+
+    def _remove_from_category(self, category: str, product_id: str) -> None:
+        ids = self._category_index[category]
+        del ids[bisect.bisect_left(ids, product_id)]
+        if not ids:
+            del self._category_index[category]
 
-    def save_product(self, product: Product) -> None:
-        """Produkt im Memory speichern"""
-        self.products[product.id] = product
+    def _stored_version(self, product_id: str) -> int:
+        stored = self.products.get(product_id)
+        return stored.version if stored is not None else 0
+
+    def _store(self, product: Product, version: int) -> None:
+        product.version = version
+        stored = product.copy()
+        old = self.products.get(product.id)
+        self.products[product.id] = stored
+        self._index(stored)
+        if old is None:
+            self._values.add(stored)
+        else:
+            self._values.update(stored, old.get_total_value(), old.category)
+
+    def save_product(self, product: Product, expected_version: Optional[int] = None) -> None:
+        """Kopie des Produkts im Memory speichern (Compare-and-Swap mit expected_version)"""
+        with self._lock:
+            version = next_version(self._stored_version(product.id), product, expected_version)
+            self._store(product, version)
+
+    def save_products(
+        self, products: Iterable[Product], expected_versions: Optional[Dict[str, int]] = None
+    ) -> None:
+        """Mehrere Produkte speichern; bei einem Versionskonflikt wird keines gespeichert"""
+        expected_versions = expected_versions or {}
+        with self._lock:
+            products = list(products)
+            versions = [
+                next_version(
+                    self._stored_version(product.id), product, expected_versions.get(product.id)
+                )
+                for product in products
+            ]
+            for product, version in zip(products, versions):
+                self._store(product, version)
 
     def load_product(self, product_id: str) -> Optional[Product]:
-        """Produkt aus Memory laden"""
-        return self.products.get(product_id)
+        """Kopie des Produkts aus Memory laden"""
+        product = self.products.get(product_id)
+        return product.copy() if product is not None else None
+
+    def load_products(self, product_ids: Iterable[str]) -> Dict[str, Product]:
+        """Kopien mehrerer Produkte aus Memory laden"""
+        products = self.products
+        return {pid: products[pid].copy() for pid in product_ids if pid in products}
 
     def load_all_products(self) -> Dict[str, Product]:
-        """Alle Produkte aus Memory laden"""
-        return self.products.copy()
+        """Kopien aller Produkte aus Memory laden"""
+        return {pid: product.copy() for pid, product in self.products.items()}
+
+    def iter_products(self) -> Iterator[Product]:
+        """Kopien der Produkte nacheinander erzeugen, ohne Kopie des Dictionaries"""
+        return (product.copy() for product in self.products.values())
+
+    def count_products(self) -> int:
+        """Anzahl gespeicherter Produkte"""
+        return len(self.products)
+
+    def inventory_value_by_category(self) -> Dict[str, float]:
+        """Nachgeführten Lagerwert je Kategorie liefern (O(Kategorien))"""
+        with self._lock:
+            return dict(self._values.by_category)
+
+    def rebuild_inventory_value(self) -> None:
+        """Lagerwert aus den gespeicherten Produkten neu berechnen"""
+        with self._lock:
+            self._values.rebuild(self.products.values())
+
+    def find_by_sku(self, sku: str) -> Optional[Product]:
+        """Kopie des Produkts über den SKU-Hashindex finden (O(1))"""
+        product_id = self._sku_index.get(sku)
+        return self.load_product(product_id) if product_id is not None else None
+
+    def list_by_category(self, category: str) -> List[Product]:
+        """Kopien der Produkte einer Kategorie über den Kategorieindex, sortiert nach ID"""
+        with self._lock:
+            return [self.products[pid].copy() for pid in self._category_index.get(category, ())]
+
+    def list_below_threshold(self, threshold: int) -> List[Product]:
+        """Kopien der Produkte unter threshold über den Bestandsindex (O(log n + k))"""
+        with self._lock:
+            end = bisect.bisect_left(self._quantity_index, (threshold, ""))
+            return [self.products[pid].copy() for _, pid in self._quantity_index[:end]]
+
+    def list_products_page(
+        self, after: Optional[tuple] = None, limit: int = 500, order_by: str = "id"
+    ) -> Page[Product]:
+        """Produkte seitenweise über die sortierten ID-/Kategorieindizes laden"""
+        check_page_request(PRODUCT_ORDERINGS, order_by, limit)
+        with self._lock:
+            if order_by == "id":
+                start = bisect.bisect_right(self._id_index, after[0]) if after else 0
+                ids = self._id_index[start : start + limit + 1]
+            else:
+                ids = self._category_page_ids(after, limit + 1)
+            items = [self.products[pid].copy() for pid in ids]
+        return make_page(items, limit, PRODUCT_ORDERINGS[order_by])
+
+    def _category_page_ids(self, after: Optional[tuple], count: int) -> List[str]:
+        categories = sorted(self._category_index)
+        ids: List[str] = []
+        position = bisect.bisect_left(categories, after[0]) if after else 0
+        for category in categories[position:]:
+            category_ids = self._category_index[category]
+            start = 0
+            if after and category == after[0]:
+                start = bisect.bisect_right(category_ids, after[1])
+            ids.extend(category_ids[start : start + count - len(ids)])
+            if len(ids) >= count:
+                break
+        return ids
 
     def delete_product(self, product_id: str) -> None:
         """Produkt aus Memory löschen"""
-        if product_id in self.products:
-            del self.products[product_id]
+        with self._lock:
+            if product_id in self.products:
+                self._values.remove(self.products.pop(product_id))
+                self._unindex(product_id)
+
+    def _insert_movement(self, movement: Movement) -> None:
+        """Bewegung einsortieren; Aufrufer hält _movement_lock"""
+        _insort(self.movements, movement)
+        if self._product_movements is not None:
+            _insort(self._product_movements.setdefault(movement.product_id, []), movement)
+
+    def _reindex_movements(self) -> None:
+        """Produktlisten nach direkter Änderung von self.movements neu aufbauen"""
+        if self._product_movements is None:
+            return
+        with self._movement_lock:
+            self._product_movements.clear()
+            for movement in self.movements:
+                self._product_movements.setdefault(movement.product_id, []).append(movement)
+
+    def _movements_of(self, product_id: str):
+        """Zeitlich sortierte Bewegungen eines Produkts; Aufrufer hält _movement_lock"""
+        if self._product_movements is None:
+            # movement_store mit eigener Produktsicht (z.B. ColumnarMovementStore)
+            store: Any = self.movements
+            return store.for_product(product_id)
+        return self._product_movements.get(product_id, [])
 
     def save_movement(self, movement: Movement) -> None:
-        """Bewegung im Memory speichern"""
-        self.movements.append(movement)
+        """Bewegung im Memory speichern (zeitlich einsortiert)"""
+        with self._movement_lock:
+            self._insert_movement(movement)
+
+    def save_movements(self, movements: Iterable[Movement]) -> None:
+        """Mehrere Bewegungen im Memory speichern"""
+        with self._movement_lock:
+            for movement in movements:
+                self._insert_movement(movement)
 
     def load_movements(self) -> List[Movement]:
         """Alle Bewegungen aus Memory laden"""
-        return self.movements.copy()
+        with self._movement_lock:
+            return list(self.movements)
+
+    def count_movements(self) -> int:
+        """Anzahl gespeicherter Bewegungen"""
+        return len(self.movements)
+
+    def list_movements_page(
+        self, after: Optional[tuple] = None, limit: int = 500, order_by: str = "timestamp"
+    ) -> Page[Movement]:
+        """Bewegungen seitenweise per bisect auf der sortierten Liste laden"""
+        check_page_request(MOVEMENT_ORDERINGS, order_by, limit)
+        movements = self.movements
+        with self._movement_lock:
+            start = bisect.bisect_right(movements, after, key=_movement_key) if after else 0
+            items = movements[start : start + limit + 1]
+        return make_page(items, limit, _movement_key)
+
+    def movements_between(
+        self, since: Optional[datetime] = None, until: Optional[datetime] = None
+    ) -> List[Movement]:
+        """Bewegungen eines Zeitraums per bisect auf der sortierten Liste laden"""
+        with self._movement_lock:
+            return _time_range(self.movements, since, until)
+
+    def movements_for_product(
+        self,
+        product_id: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> List[Movement]:
+        """Produkthistorie per bisect auf der Bewegungsliste des Produkts laden"""
+        with self._movement_lock:
+            return _time_range(self._movements_of(product_id), since, until)
+
+    def check_invariants(self) -> List[str]:
+        """
+        Indizes und Bewegungslisten gegen eine Neuberechnung prüfen (für Tests)
+
+        Returns:
+            Beschreibung jeder Abweichung (leer = konsistent)
+        """
+        problems = []
+        with self._lock:
+            products = list(self.products.values())
+            expected_keys = {p.id: (p.sku, p.category, p.quantity) for p in products}
+            categories: Dict[str, List[str]] = {}
+            for product in products:
+                categories.setdefault(product.category, []).append(product.id)
+            expected = {
+                "Indexschlüssel": (self._indexed, expected_keys),
+                "ID-Index": (self._id_index, sorted(self.products)),
+                "SKU-Index": (self._sku_index, {p.sku: p.id for p in products if p.sku}),
+                "Kategorie-Index": (
+                    self._category_index,
+                    {category: sorted(ids) for category, ids in categories.items()},
+                ),
+                "Bestandsindex": (
+                    self._quantity_index,
+                    sorted((p.quantity, p.id) for p in products),
+                ),
+            }
+            problems += [
+                f"{name} weicht von den Produkten ab"
+                for name, (actual, wanted) in expected.items()
+                if actual != wanted
+            ]
+            if not self._values.is_consistent(products):
+                problems.append("Lagerwert weicht von den Produkten ab")
+        with self._movement_lock:
+            keys = [_movement_key(movement) for movement in self.movements]
+            if any(a > b for a, b in zip(keys, keys[1:])):
+                problems.append("Bewegungen sind nicht nach (timestamp, id) sortiert")
+            if self._product_movements is not None:
+                by_product: Dict[str, List[Movement]] = {}
+                for movement in self.movements:
+                    by_product.setdefault(movement.product_id, []).append(movement)
+                if self._product_movements != by_product:
+                    problems.append("Bewegungslisten je Produkt weichen vom Protokoll ab")
+        return problems
+
+
+# SQL-Texte als Modulkonstanten: sqlite3 cached kompilierte Statements pro
+# SQL-String (cached_statements), gleiche Texte werden also nur einmal vorbereitet.
+_PRODUCT_COLUMNS = (
+    "id, name, description, price, quantity, sku, category, created_at, updated_at, notes, "
+    "reorder_point, target_quantity, version"
+)
+_PRODUCT_VALUES = "(" + ", ".join("?" for _ in _PRODUCT_COLUMNS.split(",")) + ")"
+
+# Eindeutig, damit auch Prozesse mit gemeinsamer Datenbank keine SKU doppelt vergeben
+_CREATE_SKU_INDEX = (
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_products_sku ON products (sku) WHERE sku != ''"
+)
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS products (
+        id TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        description TEXT NOT NULL,
+        price REAL NOT NULL,
+        quantity INTEGER NOT NULL,
+        sku TEXT NOT NULL DEFAULT '',
+        category TEXT NOT NULL DEFAULT '',
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL,
+        notes TEXT,
+        reorder_point INTEGER NOT NULL DEFAULT 0,
+        target_quantity INTEGER NOT NULL DEFAULT 0,
+        version INTEGER NOT NULL DEFAULT 0
+    ) WITHOUT ROWID
+    """,
+    _CREATE_SKU_INDEX,
+    "CREATE INDEX IF NOT EXISTS idx_products_category ON products (category, id)",
+    "CREATE INDEX IF NOT EXISTS idx_products_quantity ON products (quantity, id)",
+    """
+    CREATE TABLE IF NOT EXISTS movements (
+        id TEXT PRIMARY KEY,
+        product_id TEXT NOT NULL,
+        product_name TEXT NOT NULL,
+        quantity_change INTEGER NOT NULL,
+        movement_type TEXT NOT NULL,
+        reason TEXT,
+        timestamp TEXT NOT NULL,
+        performed_by TEXT NOT NULL
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_movements_product ON movements (product_id, timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_movements_timestamp ON movements (timestamp)",
+)
+
+_UPSERT_PRODUCT = f"""
+    INSERT INTO products ({_PRODUCT_COLUMNS}) VALUES {_PRODUCT_VALUES}
+    ON CONFLICT (id) DO UPDATE SET
+        name = excluded.name,
+        description = excluded.description,
+        price = excluded.price,
+        quantity = excluded.quantity,
+        sku = excluded.sku,
+        category = excluded.category,
+        created_at = excluded.created_at,
+        updated_at = excluded.updated_at,
+        notes = excluded.notes,
+        reorder_point = excluded.reorder_point,
+        target_quantity = excluded.target_quantity,
+        version = MAX(products.version + 1, excluded.version)
+"""
+_UPSERT_PRODUCT_RETURNING = _UPSERT_PRODUCT + " RETURNING version"
+# Compare-and-Swap: nur wenn die gespeicherte Version noch der erwarteten entspricht
+_UPDATE_PRODUCT_IF_VERSION = """
+    UPDATE products SET
+        name = ?, description = ?, price = ?, quantity = ?, sku = ?, category = ?,
+        created_at = ?, updated_at = ?, notes = ?, reorder_point = ?, target_quantity = ?,
+        version = ?
+    WHERE id = ? AND version = ?
+"""
+_INSERT_PRODUCT = f"INSERT INTO products ({_PRODUCT_COLUMNS}) VALUES {_PRODUCT_VALUES}"
+_INSERT_PRODUCT_IF_ABSENT = (
+    f"INSERT INTO products ({_PRODUCT_COLUMNS}) VALUES {_PRODUCT_VALUES} "
+    "ON CONFLICT (id) DO NOTHING"
+)
+_SELECT_PRODUCT_VERSION = "SELECT version FROM products WHERE id = ?"
+_SELECT_PRODUCT = f"SELECT {_PRODUCT_COLUMNS} FROM products WHERE id = ?"
+# Feste Blockgröße für IN (...)-Abfragen, damit nur ein Statement-Text im Cache landet
+_IN_CHUNK = 500
+_SELECT_PRODUCTS_CHUNK = (
+    f"SELECT {_PRODUCT_COLUMNS} FROM products WHERE id IN ({', '.join('?' * _IN_CHUNK)})"
+)
+_SELECT_VERSIONS_CHUNK = (
+    f"SELECT id, version FROM products WHERE id IN ({', '.join('?' * _IN_CHUNK)})"
+)
+_SELECT_ALL_PRODUCTS = f"SELECT {_PRODUCT_COLUMNS} FROM products ORDER BY id"
+_SELECT_PRODUCT_BY_SKU = (
+    f"SELECT {_PRODUCT_COLUMNS} FROM products WHERE sku = ? AND sku != '' LIMIT 1"
+)
+_SELECT_PRODUCTS_BY_CATEGORY = (
+    f"SELECT {_PRODUCT_COLUMNS} FROM products WHERE category = ? ORDER BY id"
+)
+_SELECT_PRODUCTS_BELOW = (
+    f"SELECT {_PRODUCT_COLUMNS} FROM products WHERE quantity < ? ORDER BY quantity, id"
+)
+_SELECT_PRODUCTS_PAGE = {
+    ("id", False): f"SELECT {_PRODUCT_COLUMNS} FROM products ORDER BY id LIMIT ?",
+    ("id", True): f"SELECT {_PRODUCT_COLUMNS} FROM products WHERE id > ? ORDER BY id LIMIT ?",
+    ("category", False): f"SELECT {_PRODUCT_COLUMNS} FROM products ORDER BY category, id LIMIT ?",
+    ("category", True): (
+        f"SELECT {_PRODUCT_COLUMNS} FROM products WHERE (category, id) > (?, ?) "
+        "ORDER BY category, id LIMIT ?"
+    ),
+}
+_COUNT_PRODUCTS = "SELECT COUNT(*) FROM products"
+_CATEGORY_VALUES = "SELECT category, TOTAL(price * quantity) FROM products GROUP BY category"
+_COUNT_MOVEMENTS = "SELECT COUNT(*) FROM movements"
+_DELETE_PRODUCT = "DELETE FROM products WHERE id = ?"
+
+_MOVEMENT_COLUMNS = (
+    "id, product_id, product_name, quantity_change, movement_type, reason, timestamp, performed_by"
+)
+_INSERT_MOVEMENT = f"INSERT INTO movements ({_MOVEMENT_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+# Bewegungen sind nach ihrer (zeitlich sortierbaren) ID geclustert
+_SELECT_MOVEMENTS = f"SELECT {_MOVEMENT_COLUMNS} FROM movements ORDER BY id"
+# idx_movements_timestamp enthält bei WITHOUT ROWID den Primärschlüssel, also (timestamp, id)
+_SELECT_MOVEMENTS_PAGE = {
+    ("timestamp", False): (
+        f"SELECT {_MOVEMENT_COLUMNS} FROM movements ORDER BY timestamp, id LIMIT ?"
+    ),
+    ("timestamp", True): (
+        f"SELECT {_MOVEMENT_COLUMNS} FROM movements WHERE (timestamp, id) > (?, ?) "
+        "ORDER BY timestamp, id LIMIT ?"
+    ),
+}
+
+# Zeiträume über idx_movements_timestamp bzw. idx_movements_product (product_id,
+# timestamp); beide Indizes liefern die Zeilen bereits in (timestamp, id)-Reihenfolge
+_SELECT_MOVEMENTS_BETWEEN = (
+    f"SELECT {_MOVEMENT_COLUMNS} FROM movements WHERE timestamp >= ? AND timestamp < ? "
+    "ORDER BY timestamp, id"
+)
+_SELECT_PRODUCT_MOVEMENTS = (
+    f"SELECT {_MOVEMENT_COLUMNS} FROM movements "
+    "WHERE product_id = ? AND timestamp >= ? AND timestamp < ? ORDER BY timestamp, id"
+)
+# Grenzen für offene Zeiträume: kleiner bzw. größer als jeder ISO-Zeitstempel
+_NO_SINCE = ""
+_NO_UNTIL = "\uffff"
+
+
+def _format_datetime(value: datetime) -> str:
+    """Zeitstempel mit fester Breite speichern, damit Textvergleich = Zeitvergleich"""
+    return value.isoformat(timespec="microseconds")
+
+
+def _product_to_row(product: Product) -> tuple:
+    return (
+        product.id,
+        product.name,
+        product.description,
+        product.price,
+        product.quantity,
+        product.sku,
+        product.category,
+        _format_datetime(product.created_at),
+        _format_datetime(product.updated_at),
+        product.notes,
+        product.reorder_point,
+        product.target_quantity,
+        product.version,
+    )
+
+
+def _row_to_product(row: tuple) -> Product:
+    return Product(
+        id=row[0],
+        name=row[1],
+        description=row[2],
+        price=row[3],
+        quantity=row[4],
+        sku=row[5],
+        category=row[6],
+        created_at=datetime.fromisoformat(row[7]),
+        updated_at=datetime.fromisoformat(row[8]),
+        notes=row[9],
+        reorder_point=row[10],
+        target_quantity=row[11],
+        version=row[12],
+    )
+
+
+def _movement_to_row(movement: Movement) -> tuple:
+    return (
+        movement.id,
+        movement.product_id,
+        movement.product_name,
+        movement.quantity_change,
+        movement.movement_type,
+        movement.reason,
+        _format_datetime(movement.timestamp),
+        movement.performed_by,
+    )
+
+
+def _row_to_movement(row: tuple) -> Movement:
+    return Movement(
+        id=row[0],
+        product_id=row[1],
+        product_name=row[2],
+        quantity_change=row[3],
+        movement_type=row[4],
+        reason=row[5],
+        timestamp=datetime.fromisoformat(row[6]),
+        performed_by=row[7],
+    )
+
+
+class SqliteRepository(RepositoryPort):
+    """
+    SQLite Repository - persistent, WAL-Modus, indizierte Tabellen
+
+    Produkt-Lookups laufen über den Primärschlüssel (WITHOUT ROWID, ein B-Baum-Zugriff),
+    Sammel-Schreibzugriffe über executemany() in einer Transaktion.
+    """
+
+    def __init__(self, db_path: str = "lager.db", batch_size: int = 1000):
+        """
+        Args:
+            db_path: Pfad zur Datenbankdatei (":memory:" für flüchtige Datenbank)
+            batch_size: Zeilen pro fetchmany() beim Streamen
+        """
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            db_path,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=256,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        with self._transaction() as cursor:
+            for statement in _SCHEMA:
+                cursor.execute(statement)
+            self._migrate(cursor)
+
+    @staticmethod
+    def _migrate(cursor: sqlite3.Cursor) -> None:
+        """Datenbanken älterer Versionen nachrüsten"""
+        columns = {row[1] for row in cursor.execute("PRAGMA table_info(products)")}
+        if "version" not in columns:
+            cursor.execute("ALTER TABLE products ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+            # Version 0 bedeutet "nicht vorhanden"; vorhandene Zeilen starten bei 1
+            cursor.execute("UPDATE products SET version = 1")
+        for column in ("reorder_point", "target_quantity"):
+            if column not in columns:
+                cursor.execute(
+                    f"ALTER TABLE products ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0"
+                )
+        unique = {row[1]: row[2] for row in cursor.execute("PRAGMA index_list(products)")}
+        if not unique["idx_products_sku"]:
+            cursor.execute("DROP INDEX idx_products_sku")
+            try:
+                cursor.execute(_CREATE_SKU_INDEX)
+            except sqlite3.IntegrityError as error:
+                raise ValueError("Datenbank enthält doppelt vergebene SKUs") from error
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Cursor]:
+        """
+        Explizite Transaktion; Rollback bei Fehlern
+
+        Innerhalb einer laufenden Transaktion (batch()) wird ein Savepoint
+        gesetzt, sodass ein Fehler nur diesen Teil zurückrollt.
+        """
+        with self._lock:
+            cursor = self._conn.cursor()
+            if self._conn.in_transaction:
+                cursor.execute("SAVEPOINT nested")
+                try:
+                    yield cursor
+                except BaseException:
+                    cursor.execute("ROLLBACK TO nested")
+                    cursor.execute("RELEASE nested")
+                    raise
+                cursor.execute("RELEASE nested")
+                return
+            # IMMEDIATE: Schreibsperre sofort, damit Prüfen und Schreiben auch
+            # gegenüber anderen Prozessen atomar sind
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                yield cursor
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+            cursor.execute("COMMIT")
+
+    def batch(self) -> ContextManager[sqlite3.Cursor]:
+        """
+        Mehrere Aufrufe in einer Transaktion bündeln (ein Commit statt vieler)
+
+        Die Methoden des Repositories setzen darin nur Savepoints; scheitert
+        einer, bleiben die übrigen Änderungen erhalten. Ein Fehler, der aus
+        dem with-Block herausläuft, rollt den ganzen Batch zurück.
+        """
+        return self._transaction()
+
+    def close(self) -> None:
+        """Datenbankverbindung schließen"""
+        with self._lock:
+            self._conn.close()
+
+    def save_product(self, product: Product, expected_version: Optional[int] = None) -> None:
+        """Produkt einfügen oder aktualisieren (Compare-and-Swap mit expected_version)"""
+        if expected_version is None:
+            row = _product_to_row(product)[:-1] + (product.version + 1,)
+            with self._lock:
+                (product.version,) = self._conn.execute(_UPSERT_PRODUCT_RETURNING, row).fetchone()
+            return
+        with self._transaction() as cursor:
+            self._compare_and_swap(cursor, product, expected_version)
+
+    def _compare_and_swap(
+        self, cursor: sqlite3.Cursor, product: Product, expected_version: int
+    ) -> None:
+        """Bedingtes UPDATE (bzw. INSERT für Version 0); Aufrufer hält die Transaktion"""
+        version = expected_version + 1
+        row = _product_to_row(product)
+        cursor.execute(
+            _UPDATE_PRODUCT_IF_VERSION, row[1:-1] + (version, product.id, expected_version)
+        )
+        if cursor.rowcount == 0 and expected_version == 0:
+            cursor.execute(_INSERT_PRODUCT_IF_ABSENT, row[:-1] + (version,))
+        if cursor.rowcount == 0:
+            stored = cursor.execute(_SELECT_PRODUCT_VERSION, (product.id,)).fetchone()
+            raise VersionConflictError(product.id, expected_version, stored[0] if stored else 0)
+        product.version = version
+
+    def save_products(
+        self, products: Iterable[Product], expected_versions: Optional[Dict[str, int]] = None
+    ) -> None:
+        """
+        Mehrere Produkte in einer Transaktion speichern
+
+        Die erwarteten Versionen werden blockweise per IN (...) geprüft, danach
+        wird per executemany() geschrieben (neue Produkte per INSERT, geprüfte
+        per UPDATE). Ungeprüfte Produkte gehen per Upsert in die Datenbank;
+        ihre lokale Version wird dabei nur hochgezählt (ein späterer
+        Compare-and-Swap mit veralteter Version schlägt fehl statt zu
+        überschreiben). Bei einem Versionskonflikt wird die ganze Transaktion
+        zurückgerollt.
+        """
+        expected_versions = expected_versions or {}
+        products = list(products)
+        checked = [p for p in products if p.id in expected_versions]
+        unchecked = [p for p in products if p.id not in expected_versions]
+        previous = [product.version for product in checked]
+        try:
+            with self._transaction() as cursor:
+                self._check_versions(cursor, {p.id: expected_versions[p.id] for p in checked})
+                for product in checked:
+                    product.version = expected_versions[product.id] + 1
+                created = [p for p in checked if p.version == 1]
+                updated = [p for p in checked if p.version > 1]
+                cursor.executemany(_INSERT_PRODUCT, (_product_to_row(p) for p in created))
+                cursor.executemany(
+                    _UPDATE_PRODUCT_IF_VERSION,
+                    (_product_to_row(p)[1:] + (p.id, p.version - 1) for p in updated),
+                )
+                if updated and cursor.rowcount != len(updated):
+                    # Nur bei doppelten IDs im Batch möglich, die Sperre schließt andere aus
+                    raise VersionConflictError(updated[-1].id, updated[-1].version - 1, -1)
+                cursor.executemany(
+                    _UPSERT_PRODUCT,
+                    (_product_to_row(p)[:-1] + (p.version + 1,) for p in unchecked),
+                )
+        except BaseException:
+            for product, version in zip(checked, previous):
+                product.version = version
+            raise
+        for product in unchecked:
+            product.version += 1
+
+    def _check_versions(self, cursor: sqlite3.Cursor, expected_versions: Dict[str, int]) -> None:
+        """
+        Gespeicherte Versionen blockweise lesen und vergleichen
+
+        Raises:
+            VersionConflictError: beim ersten abweichenden Produkt
+        """
+        ids = list(expected_versions)
+        for start in range(0, len(ids), _IN_CHUNK):
+            chunk = ids[start : start + _IN_CHUNK]
+            padded = chunk + [chunk[0]] * (_IN_CHUNK - len(chunk))
+            stored = dict(cursor.execute(_SELECT_VERSIONS_CHUNK, padded).fetchall())
+            for product_id in chunk:
+                if stored.get(product_id, 0) != expected_versions[product_id]:
+                    raise VersionConflictError(
+                        product_id, expected_versions[product_id], stored.get(product_id, 0)
+                    )
+
+    def load_product(self, product_id: str) -> Optional[Product]:
+        """Produkt über den Primärschlüssel laden"""
+        with self._lock:
+            row = self._conn.execute(_SELECT_PRODUCT, (product_id,)).fetchone()
+        return _row_to_product(row) if row else None
+
+    def load_products(self, product_ids: Iterable[str]) -> Dict[str, Product]:
+        """Mehrere Produkte blockweise per IN (...) laden"""
+        ids = list(dict.fromkeys(product_ids))
+        products = {}
+        with self._lock:
+            for start in range(0, len(ids), _IN_CHUNK):
+                chunk = ids[start : start + _IN_CHUNK]
+                # Auffüllen mit der ersten ID hält den SQL-Text konstant
+                chunk += [chunk[0]] * (_IN_CHUNK - len(chunk))
+                for row in self._conn.execute(_SELECT_PRODUCTS_CHUNK, chunk):
+                    products[row[0]] = _row_to_product(row)
+        return products
+
+    def load_all_products(self) -> Dict[str, Product]:
+        """Alle Produkte laden (für große Bestände iter_products() bevorzugen)"""
+        return {product.id: product for product in self.iter_products()}
+
+    def iter_products(self) -> Iterator[Product]:
+        """Produkte blockweise per fetchmany() streamen"""
+        with self._lock:
+            cursor = self._conn.execute(_SELECT_ALL_PRODUCTS)
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(self.batch_size)
+            if not rows:
+                break
+            for row in rows:
+                yield _row_to_product(row)
+
+    def find_by_sku(self, sku: str) -> Optional[Product]:
+        """Produkt über den SKU-Index finden"""
+        with self._lock:
+            row = self._conn.execute(_SELECT_PRODUCT_BY_SKU, (sku,)).fetchone()
+        return _row_to_product(row) if row else None
+
+    def list_by_category(self, category: str) -> List[Product]:
+        """Produkte einer Kategorie über den Index (category, id)"""
+        return self._select_products(_SELECT_PRODUCTS_BY_CATEGORY, (category,))
+
+    def list_below_threshold(self, threshold: int) -> List[Product]:
+        """Produkte unter threshold über den Index (quantity, id)"""
+        return self._select_products(_SELECT_PRODUCTS_BELOW, (threshold,))
+
+    def _select_products(self, sql: str, parameters: tuple) -> List[Product]:
+        with self._lock:
+            rows = self._conn.execute(sql, parameters).fetchall()
+        return [_row_to_product(row) for row in rows]
+
+    def list_products_page(
+        self, after: Optional[tuple] = None, limit: int = 500, order_by: str = "id"
+    ) -> Page[Product]:
+        """Produkte seitenweise per WHERE (schlüssel) > cursor über den Index laden"""
+        check_page_request(PRODUCT_ORDERINGS, order_by, limit)
+        sql = _SELECT_PRODUCTS_PAGE[(order_by, after is not None)]
+        products = self._select_products(sql, (*(after or ()), limit + 1))
+        return make_page(products, limit, PRODUCT_ORDERINGS[order_by])
+
+    def count_products(self) -> int:
+        """Anzahl Produkte direkt per SQL zählen"""
+        with self._lock:
+            (count,) = self._conn.execute(_COUNT_PRODUCTS).fetchone()
+        return int(count)
+
+    def inventory_value_by_category(self) -> Dict[str, float]:
+        """Lagerwert je Kategorie per SQL summieren (immer aktuell, auch über Prozesse)"""
+        with self._lock:
+            return dict(self._conn.execute(_CATEGORY_VALUES).fetchall())
+
+    def delete_product(self, product_id: str) -> None:
+        """Produkt löschen (unbekannte IDs werden ignoriert)"""
+        with self._lock:
+            self._conn.execute(_DELETE_PRODUCT, (product_id,))
+
+    def save_movement(self, movement: Movement) -> None:
+        """Bewegung anhängen"""
+        with self._lock:
+            self._conn.execute(_INSERT_MOVEMENT, _movement_to_row(movement))
+
+    def save_movements(self, movements: Iterable[Movement]) -> None:
+        """Mehrere Bewegungen in einer Transaktion per executemany() anhängen"""
+        with self._transaction() as cursor:
+            cursor.executemany(_INSERT_MOVEMENT, (_movement_to_row(m) for m in movements))
+
+    def load_movements(self) -> List[Movement]:
+        """Alle Bewegungen in ID-Reihenfolge (= zeitlicher Reihenfolge) laden"""
+        with self._lock:
+            rows = self._conn.execute(_SELECT_MOVEMENTS).fetchall()
+        return [_row_to_movement(row) for row in rows]
+
+    def count_movements(self) -> int:
+        """Anzahl Bewegungen direkt per SQL zählen"""
+        with self._lock:
+            (count,) = self._conn.execute(_COUNT_MOVEMENTS).fetchone()
+        return int(count)
+
+    def list_movements_page(
+        self, after: Optional[tuple] = None, limit: int = 500, order_by: str = "timestamp"
+    ) -> Page[Movement]:
+        """Bewegungen seitenweise über den Index (timestamp, id) laden"""
+        check_page_request(MOVEMENT_ORDERINGS, order_by, limit)
+        sql = _SELECT_MOVEMENTS_PAGE[(order_by, after is not None)]
+        parameters: tuple = (limit + 1,)
+        if after is not None:
+            timestamp, movement_id = after
+            parameters = (_format_datetime(timestamp), movement_id, limit + 1)
+        with self._lock:
+            rows = self._conn.execute(sql, parameters).fetchall()
+        return make_page([_row_to_movement(row) for row in rows], limit, _movement_key)
+
+    def movements_between(
+        self, since: Optional[datetime] = None, until: Optional[datetime] = None
+    ) -> List[Movement]:
+        """Bewegungen eines Zeitraums über den Index (timestamp, id) laden"""
+        return self._select_movements(_SELECT_MOVEMENTS_BETWEEN, (), since, until)
+
+    def movements_for_product(
+        self,
+        product_id: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> List[Movement]:
+        """Produkthistorie über den Index (product_id, timestamp) laden"""
+        return self._select_movements(_SELECT_PRODUCT_MOVEMENTS, (product_id,), since, until)
+
+    def _select_movements(
+        self,
+        sql: str,
+        parameters: tuple,
+        since: Optional[datetime],
+        until: Optional[datetime],
+    ) -> List[Movement]:
+        parameters += (
+            _NO_SINCE if since is None else _format_datetime(since),
+            _NO_UNTIL if until is None else _format_datetime(until),
+        )
+        with self._lock:
+            rows = self._conn.execute(sql, parameters).fetchall()
+        return [_row_to_movement(row) for row in rows]
 
 
 class RepositoryFactory:
     """Factory für Repository-Instanzen"""
 
+    TYPES = ("memory", "sqlite", "journal", "tinydb")
+
     @staticmethod
-    def create_repository(repository_type: str = "memory") -> RepositoryPort:
+    def available_types() -> Tuple[str, ...]:
+        """Alle Typen, die create_repository() in dieser Umgebung erzeugen kann"""
+        if importlib.util.find_spec("tinydb") is None:
+            return tuple(name for name in RepositoryFactory.TYPES if name != "tinydb")
+        return RepositoryFactory.TYPES
+
+    @staticmethod
+    def create_repository(repository_type: str = "memory", **options) -> RepositoryPort:
         """
         Repository basierend auf Typ erstellen
 
         Args:
-            repository_type: "memory" oder andere (z.B. "sqlite", "json")
+            repository_type: "memory", "sqlite", "journal" oder "tinydb"
+            **options: Adapter-spezifische Optionen (z.B. db_path für "sqlite",
+                directory für "journal" und "tinydb", movement_store für "memory")
 
         Returns:
             RepositoryPort Instanz
         """
         if repository_type == "memory":
-            return InMemoryRepository()
+            return InMemoryRepository(**options)
+        elif repository_type == "sqlite":
+            return SqliteRepository(**options)
+        elif repository_type == "journal":
+            from .journal import JournalRepository
+
+            return JournalRepository(**options)
+        elif repository_type == "tinydb":
+            from .tinydb_repository import TinyDBRepository
+
+            return TinyDBRepository(**options)
         else:
             raise ValueError(f"Unbekannter Repository-Typ: {repository_type}")
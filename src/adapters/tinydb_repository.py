@@ -0,0 +1,215 @@
+"""
+TinyDB Repository - JSON-Dokumente mit verzögertem Schreiben und Index im Speicher
+
+Produkte und Bewegungen liegen in getrennten TinyDB-Dateien:
+
+    products.json               Tabelle "products", ein Dokument je Produkt
+    movements-0001.json, ...    Tabelle "movements", Segmente zu je segment_size Bewegungen
+
+Jede Datei wird über TinyDBs CachingMiddleware geöffnet: Änderungen landen im
+Cache und werden erst nach flush_every Schreibzugriffen (bzw. bei flush() und
+close()) als ganze Datei geschrieben. Da JSONStorage bei jedem Flush die
+komplette Datei neu schreibt, werden Bewegungen auf Segmente verteilt; nur das
+jüngste Segment wird noch geschrieben, ältere bleiben unverändert.
+
+Gelesen wird ausschließlich aus den Indizes von InMemoryRepository, die beim
+Start aus den Dateien aufgebaut werden. Produkt-ID -> Dokument-ID steht in
+einem eigenen Index. Geschrieben wird direkt in die Dokumente im Cache der
+Middleware: Table.insert()/update() bauen bei jedem Aufruf die ganze Tabelle
+neu auf und wären bei 500k Bewegungen quadratisch. Die Dateien bleiben
+gewöhnliche TinyDB-Datenbanken.
+
+Dauerhaftigkeit: nach einem Absturz fehlen bis zu flush_every Schreibzugriffe
+je Datei, und Produkte und Bewegungen können voneinander abweichen. Für
+Buchungen mit Dauerhaftigkeitsanforderung sind "sqlite" oder "journal" gedacht.
+"""
+
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from tinydb import TinyDB
+from tinydb.middlewares import CachingMiddleware
+from tinydb.storages import JSONStorage
+
+from ..domain.product import Product
+from ..domain.warehouse import Movement
+from .journal import (
+    movement_from_record,
+    movement_to_record,
+    product_from_record,
+    product_to_record,
+)
+from .repository import InMemoryRepository
+
+PRODUCTS_TABLE = "products"
+MOVEMENTS_TABLE = "movements"
+
+
+class _TinyDBFile:
+    """TinyDB-Datei mit einer Tabelle; Dokumente werden direkt im Middleware-Cache geändert"""
+
+    def __init__(self, path: str, table: str, flush_every: int):
+        middleware = CachingMiddleware(JSONStorage)
+        self.db = TinyDB(path, storage=middleware)
+        middleware.WRITE_CACHE_SIZE = flush_every
+        self.storage = middleware
+        self._tables = middleware.read() or {}
+        # Dokument-ID (Text, wie im JSON) -> Dokument; dasselbe Objekt wie im Cache
+        self.documents: Dict[str, dict] = self._tables.setdefault(table, {})
+
+    def commit(self) -> None:
+        """Einen Schreibzugriff melden; die Middleware schreibt nach flush_every Zugriffen"""
+        self.storage.write(self._tables)
+
+    def flush(self) -> None:
+        self.storage.flush()
+
+    def close(self) -> None:
+        self.db.close()
+
+
+class TinyDBRepository(InMemoryRepository):
+    """
+    Repository auf TinyDB-Dateien mit verzögertem Schreiben
+
+    Lesezugriffe und Abfragen entsprechen InMemoryRepository; jeder
+    Schreibzugriff (auch Sammel-Methoden) zählt für die Middleware als einer.
+    """
+
+    def __init__(
+        self,
+        directory: str = "data",
+        flush_every: int = 1000,
+        segment_size: int = 50_000,
+        movement_store=None,
+    ):
+        """
+        Args:
+            directory: Verzeichnis für products.json und die Bewegungssegmente
+            flush_every: Dateien nach so vielen Schreibzugriffen schreiben
+            segment_size: Bewegungen je Segmentdatei
+            movement_store: siehe InMemoryRepository
+
+        Raises:
+            ValueError: wenn flush_every oder segment_size nicht positiv ist
+        """
+        if flush_every < 1 or segment_size < 1:
+            raise ValueError("flush_every und segment_size müssen positiv sein")
+        super().__init__(movement_store)
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        self.directory = directory
+        self.flush_every = flush_every
+        self.segment_size = segment_size
+        self._products = _TinyDBFile(
+            os.path.join(directory, "products.json"), PRODUCTS_TABLE, flush_every
+        )
+        # Produkt-ID -> Dokument-ID in products.json
+        self._doc_ids: Dict[str, str] = {}
+        self._next_product_doc = 1
+        self._segment: Optional[_TinyDBFile] = None
+        self._segment_number = 0
+        self._next_movement_doc = 1
+        self._load()
+
+    def _segment_path(self, number: int) -> str:
+        return os.path.join(self.directory, f"movements-{number:04d}.json")
+
+    def _load(self) -> None:
+        for doc_id, record in self._products.documents.items():
+            product = product_from_record(record)
+            self._store(product, product.version or 1)
+            self._doc_ids[product.id] = doc_id
+        self._next_product_doc = max(map(int, self._products.documents), default=0) + 1
+
+        while os.path.exists(self._segment_path(self._segment_number + 1)):
+            if self._segment is not None:
+                self._segment.close()
+            self._segment_number += 1
+            self._segment = _TinyDBFile(
+                self._segment_path(self._segment_number), MOVEMENTS_TABLE, self.flush_every
+            )
+            documents = self._segment.documents
+            super().save_movements(movement_from_record(record) for record in documents.values())
+            self._next_movement_doc = max(map(int, documents), default=0) + 1
+
+    def _current_segment(self) -> _TinyDBFile:
+        """Segment für die nächste Bewegung; volle Segmente werden geschrieben und geschlossen"""
+        if self._segment is None or len(self._segment.documents) >= self.segment_size:
+            if self._segment is not None:
+                self._segment.close()
+            self._segment_number += 1
+            self._segment = _TinyDBFile(
+                self._segment_path(self._segment_number), MOVEMENTS_TABLE, self.flush_every
+            )
+        return self._segment
+
+    def _write_product(self, product: Product) -> None:
+        doc_id = self._doc_ids.get(product.id)
+        if doc_id is None:
+            doc_id = self._doc_ids[product.id] = str(self._next_product_doc)
+            self._next_product_doc += 1
+        self._products.documents[doc_id] = product_to_record(product)
+
+    def save_product(self, product: Product, expected_version: Optional[int] = None) -> None:
+        """Produkt mit neuer Version speichern (Compare-and-Swap mit expected_version)"""
+        expected = None if expected_version is None else {product.id: expected_version}
+        self.save_products([product], expected)
+
+    def save_products(
+        self, products: Iterable[Product], expected_versions: Optional[Dict[str, int]] = None
+    ) -> None:
+        """Mehrere Produkte mit einem Schreibzugriff; bei einem Versionskonflikt keines"""
+        products = list(products)
+        with self._lock:
+            super().save_products(products, expected_versions)
+            for product in products:
+                self._write_product(self.products[product.id])
+            self._products.commit()
+
+    def delete_product(self, product_id: str) -> None:
+        """Produkt und sein Dokument löschen"""
+        with self._lock:
+            if product_id in self.products:
+                super().delete_product(product_id)
+                del self._products.documents[self._doc_ids.pop(product_id)]
+                self._products.commit()
+
+    def save_movement(self, movement: Movement) -> None:
+        """Bewegung speichern (zeitlich einsortiert) und ans jüngste Segment anhängen"""
+        self.save_movements([movement])
+
+    def save_movements(self, movements: Iterable[Movement]) -> None:
+        """Mehrere Bewegungen speichern; ein Schreibzugriff je berührtem Segment"""
+        movements = list(movements)
+        with self._movement_lock:
+            super().save_movements(movements)
+            start = 0
+            while start < len(movements):
+                segment = self._current_segment()
+                stop = start + self.segment_size - len(segment.documents)
+                for movement in movements[start:stop]:
+                    segment.documents[str(self._next_movement_doc)] = movement_to_record(movement)
+                    self._next_movement_doc += 1
+                segment.commit()
+                start = stop
+
+    def flush(self) -> None:
+        """Alle zwischengespeicherten Änderungen jetzt in die Dateien schreiben"""
+        with self._lock:
+            self._products.flush()
+        with self._movement_lock:
+            if self._segment is not None:
+                self._segment.flush()
+
+    def close(self) -> None:
+        """Ausstehende Änderungen schreiben und Dateien schließen"""
+        with self._lock:
+            self._products.close()
+        with self._movement_lock:
+            if self._segment is not None:
+                self._segment.close()
+
+    def segment_files(self) -> List[str]:
+        """Pfade aller Bewegungssegmente in Schreibreihenfolge"""
+        return [self._segment_path(number) for number in range(1, self._segment_number + 1)]
@@ -0,0 +1,101 @@
+"""Transfer Log Adapter - Protokoll offener Umlagerungen im Speicher oder als Journal"""
+
+import threading
+from datetime import datetime
+from typing import Dict, List
+
+from ..domain.warehouse import Transfer
+from ..ports import TransferLogPort
+from .journal import MovementJournal
+
+
+def transfer_to_record(transfer: Transfer) -> dict:
+    return {
+        "id": transfer.id,
+        "product_id": transfer.product_id,
+        "quantity": transfer.quantity,
+        "source": transfer.source,
+        "target": transfer.target,
+        "note": transfer.note,
+        "user": transfer.user,
+        "created_at": transfer.created_at.isoformat(),
+    }
+
+
+def transfer_from_record(record: dict) -> Transfer:
+    return Transfer(
+        id=record["id"],
+        product_id=record["product_id"],
+        quantity=record["quantity"],
+        source=record["source"],
+        target=record["target"],
+        note=record["note"],
+        user=record["user"],
+        created_at=datetime.fromisoformat(record["created_at"]),
+    )
+
+
+class InMemoryTransferLog(TransferLogPort):
+    """Offene Umlagerungen nur im Speicher - übersteht Fehler, aber keinen Neustart"""
+
+    def __init__(self):
+        self._pending: Dict[str, Transfer] = {}
+        self._lock = threading.Lock()
+
+    def begin(self, transfer: Transfer) -> None:
+        with self._lock:
+            self._pending[transfer.id] = transfer
+
+    def finish(self, transfer_id: str) -> None:
+        with self._lock:
+            self._pending.pop(transfer_id, None)
+
+    def pending(self) -> List[Transfer]:
+        with self._lock:
+            return list(self._pending.values())
+
+
+class JournalTransferLog(InMemoryTransferLog):
+    """
+    Offene Umlagerungen in einem Append-only-Journal (Format wie MovementJournal)
+
+    Jeder Datensatz wird sofort per fsync gesichert, ein begonnener Auftrag
+    übersteht also auch einen Absturz zwischen den Buchungen. Beim Öffnen
+    werden die offenen Aufträge aus dem Journal gelesen; ein unvollständiger
+    Rest wird abgeschnitten, ohne offene Aufträge das ganze Journal.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Journal-Datei (wird bei Bedarf angelegt)
+        """
+        super().__init__()
+        self.journal = MovementJournal(path, group_size=1, group_interval=0)
+        offset = 0
+        for offset, record in self.journal.read():
+            if record["type"] == "begin":
+                transfer = transfer_from_record(record["data"])
+                self._pending[transfer.id] = transfer
+            else:
+                self._pending.pop(record["id"], None)
+        if not self._pending:
+            offset = 0
+        if offset < self.journal.size:
+            self.journal.truncate(offset)
+
+    def begin(self, transfer: Transfer) -> None:
+        """Auftrag ins Journal schreiben (mit fsync), dann vormerken"""
+        with self._lock:
+            self.journal.append({"type": "begin", "data": transfer_to_record(transfer)})
+            self._pending[transfer.id] = transfer
+
+    def finish(self, transfer_id: str) -> None:
+        """Abschluss ins Journal schreiben (mit fsync)"""
+        with self._lock:
+            if self._pending.pop(transfer_id, None) is not None:
+                self.journal.append({"type": "finish", "id": transfer_id})
+
+    def close(self) -> None:
+        """Journal schließen"""
+        self.journal.close()
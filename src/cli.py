@@ -0,0 +1,197 @@
+"""
+Kommandozeile - Lagerverwaltung ohne GUI
+
+Beispiele:
+    lagerverwaltung --db lager.db import katalog.csv --processes 4
+    lagerverwaltung --db lager.db export bestand.jsonl
+    lagerverwaltung in P001 20 --reason Lieferung
+    lagerverwaltung out P001 5
+    lagerverwaltung report inventory --output bestand.txt
+    lagerverwaltung --backend journal --db daten/ report movements
+    lagerverwaltung gui
+
+Statt lagerverwaltung geht auch python -m src.cli. Geladen werden nur die
+Services und das gewählte Backend; PyQt6 erst mit dem Befehl gui.
+"""
+
+import argparse
+import sys
+from contextlib import nullcontext
+from typing import Callable, List, Optional
+
+from .services import WarehouseService
+from .services.bulk import export_file, import_file
+
+BACKENDS = ("sqlite", "journal", "tinydb")
+REPORTS = ("inventory", "movements", "reorder")
+
+
+def _create_service(args: argparse.Namespace, **options) -> WarehouseService:
+    from .adapters.repository import RepositoryFactory
+
+    if args.backend == "sqlite":
+        repository = RepositoryFactory.create_repository("sqlite", db_path=args.db or "lager.db")
+    else:
+        repository = RepositoryFactory.create_repository(args.backend, directory=args.db or "data")
+    return WarehouseService(repository, **options)
+
+
+def _import(args: argparse.Namespace) -> int:
+    service = _create_service(args)
+    try:
+        result = import_file(
+            service,
+            args.file,
+            args.format,
+            chunk_size=args.chunk_size,
+            processes=args.processes,
+        )
+    finally:
+        service.repository.close()
+    print(f"{result.imported} Produkte importiert, {result.rejected} Zeilen abgelehnt")
+    for error in result.errors[: args.show_errors]:
+        print(f"  Zeile {error.line}: {error.message}", file=sys.stderr)
+    if result.rejected > args.show_errors:
+        print(f"  ... {result.rejected - args.show_errors} weitere", file=sys.stderr)
+    return 1 if result.rejected else 0
+
+
+def _export(args: argparse.Namespace) -> int:
+    service = _create_service(args)
+    try:
+        count = export_file(service, args.file, args.format)
+    finally:
+        service.repository.close()
+    print(f"{count} Produkte exportiert")
+    return 0
+
+
+def _positive(text: str) -> int:
+    value = int(text)
+    if value <= 0:
+        raise argparse.ArgumentTypeError(f"Menge muss positiv sein: {value}")
+    return value
+
+
+def _book(args: argparse.Namespace) -> int:
+    service = _create_service(args)
+    try:
+        if args.command == "in":
+            movement = service.add_to_stock(args.product_id, args.quantity, args.reason, args.user)
+        else:
+            movement = service.remove_from_stock(
+                args.product_id, args.quantity, args.reason, args.user
+            )
+        product = service.get_product(movement.product_id)
+    finally:
+        service.repository.close()
+    booked = f"{args.command.upper()} {args.quantity} x {movement.product_id} gebucht"
+    if product is None:
+        print(f"{booked}, Produkt inzwischen gelöscht")
+    else:
+        print(f"{booked}, Bestand jetzt {product.quantity}")
+    return 0
+
+
+def _write_reorder_report(service: WarehouseService, sink, limit: int) -> None:
+    for suggestion in service.get_reorder_suggestions(limit):
+        sink.write(
+            f"{suggestion.product_id:<12} {suggestion.name:<30} "
+            f"Bestand {suggestion.quantity:>6}  "
+            f"Reichweite {suggestion.days_of_cover:>6.1f} Tage  "
+            f"bestellen {suggestion.order_quantity}\n"
+        )
+
+
+def _report(args: argparse.Namespace) -> int:
+    from .adapters.report import ConsoleReportAdapter
+
+    options = {}
+    if args.kind == "reorder":
+        from .domain.reorder import ReorderEngine
+
+        options["reorder"] = ReorderEngine()
+    service = _create_service(args, **options)
+    try:
+        sink = open(args.output, "w", encoding="utf-8") if args.output else nullcontext(sys.stdout)
+        with sink as target:
+            if args.kind == "inventory":
+                ConsoleReportAdapter(service.iter_products()).write_inventory_report(target)
+            elif args.kind == "movements":
+                report = ConsoleReportAdapter(movements=service.iter_movements())
+                report.write_movement_report(target)
+            else:
+                _write_reorder_report(service, target, args.limit)
+    finally:
+        service.repository.close()
+    return 0
+
+
+def _gui(args: argparse.Namespace) -> int:
+    try:
+        from .ui import main as start_gui
+    except ImportError as error:
+        print(f"Fehler: {error}", file=sys.stderr)
+        return 2
+    start_gui()
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="lagerverwaltung", description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--backend", choices=BACKENDS, default="sqlite", help="Speicher (Standard: sqlite)"
+    )
+    parser.add_argument(
+        "--db",
+        help="SQLite-Datenbank bzw. Verzeichnis für journal/tinydb (Standard: lager.db bzw. data)",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    importer = commands.add_parser("import", help="Produktkatalog (CSV/JSONL) importieren")
+    importer.add_argument("file", help="Importdatei (.csv, .jsonl)")
+    importer.add_argument("--format", choices=("csv", "jsonl"), help="Format statt Dateiendung")
+    importer.add_argument("--chunk-size", type=int, default=5000, help="Zeilen pro Block")
+    importer.add_argument("--processes", type=int, default=0, help="Prozesse zum Parsen")
+    importer.add_argument(
+        "--show-errors", type=int, default=20, help="Anzahl angezeigter Zeilenfehler"
+    )
+    importer.set_defaults(handler=_import)
+
+    exporter = commands.add_parser("export", help="Produkte als CSV/JSONL exportieren")
+    exporter.add_argument("file", help="Exportdatei (.csv, .jsonl)")
+    exporter.add_argument("--format", choices=("csv", "jsonl"), help="Format statt Dateiendung")
+    exporter.set_defaults(handler=_export)
+
+    for command, text in (("in", "Zugang buchen"), ("out", "Abgang buchen")):
+        booking = commands.add_parser(command, help=text)
+        booking.add_argument("product_id", help="Produkt-ID")
+        booking.add_argument("quantity", type=_positive, help="Menge (positiv)")
+        booking.add_argument("--reason", default="", help="Grund")
+        booking.add_argument("--user", default="cli", help="Benutzer")
+        booking.set_defaults(handler=_book)
+
+    report = commands.add_parser("report", help="Bericht ausgeben")
+    report.add_argument("kind", choices=REPORTS, help="Bestand, Bewegungen oder Nachbestellungen")
+    report.add_argument("--output", help="Datei statt Standardausgabe")
+    report.add_argument("--limit", type=int, default=20, help="Anzahl Nachbestellvorschläge")
+    report.set_defaults(handler=_report)
+
+    gui = commands.add_parser("gui", help="Grafische Oberfläche starten (benötigt PyQt6)")
+    gui.set_defaults(handler=_gui)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Einstiegspunkt; liefert den Exit-Code"""
+    args = build_parser().parse_args(argv)
+    handler: Callable[[argparse.Namespace], int] = args.handler
+    try:
+        return handler(args)
+    except (OSError, ValueError) as error:
+        print(f"Fehler: {error}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
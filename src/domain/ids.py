@@ -0,0 +1,210 @@
+"""Movement-IDs - monotone, kollisionsfreie 64-Bit-IDs nach dem Snowflake-Schema"""
+
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Callable, List, Optional
+
+# Aufbau einer ID (64 Bit, höchstes Bit immer 0):
+#   41 Bit Millisekunden seit EPOCH_MS | 5 Bit Knoten | 5 Bit Thread | 12 Bit Sequenz
+EPOCH_MS = 1704067200000  # 2024-01-01T00:00:00Z
+NODE_BITS = 5
+THREAD_BITS = 5
+SEQUENCE_BITS = 12
+
+_WORKER_SHIFT = SEQUENCE_BITS
+_TIMESTAMP_SHIFT = SEQUENCE_BITS + NODE_BITS + THREAD_BITS
+_MAX_NODE = (1 << NODE_BITS) - 1
+_MAX_THREAD = (1 << THREAD_BITS) - 1
+_MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+
+
+class IdGenerator(ABC):
+    """Schnittstelle für austauschbare ID-Generatoren"""
+
+    @abstractmethod
+    def new_id(self) -> str:
+        """Neue, eindeutige ID erzeugen"""
+        pass
+
+
+class _ThreadSlot:
+    """Worker-Slot eines Threads; geht mit dem Ende des Threads an den Generator zurück"""
+
+    __slots__ = ("state", "_release")
+
+    def __init__(self, state: List[int], release: Callable[[List[int]], None]):
+        self.state = state
+        self._release = release
+
+    def __del__(self) -> None:
+        self._release(self.state)
+
+
+class SnowflakeIdGenerator(IdGenerator):
+    """
+    Erzeugt zeitlich sortierbare 64-Bit-IDs ohne Sperren
+
+    Jeder Thread erhält beim ersten Aufruf einen freien Worker-Slot und führt
+    Zeitstempel und Sequenz in threading.local(), deshalb ist danach kein Lock
+    nötig. Endet der Thread, wird sein Slot mitsamt Stand wieder frei; ein
+    späterer Thread zählt dort monoton weiter. Sind alle 31 privaten Slots
+    belegt, teilen sich die übrigen Threads den letzten Slot unter einem Lock,
+    bis wieder ein privater Slot frei wird.
+
+    Innerhalb eines Threads sind die IDs streng monoton, auch wenn die Uhr
+    zurückspringt oder mehr als 4096 IDs pro Millisekunde angefordert werden
+    (dann wird auf die nächste Millisekunde vorgegriffen). Über Threads und
+    Prozesse hinweg sind sie nach Millisekunden sortiert.
+
+    Eindeutig über Prozesse hinweg sind die IDs nur mit verschiedenen
+    Knotennummern. Ohne node_id arbeitet der Generator deshalb nur im
+    Hauptprozess (Knoten 0); in Kindprozessen (multiprocessing, fork) muss die
+    Knotennummer ausdrücklich vergeben werden (node_id bzw. set_node_id()).
+
+    Als Text werden die IDs mit fester Breite (16 Hex-Stellen) ausgegeben,
+    damit der Textvergleich der Zeitordnung entspricht.
+    """
+
+    def __init__(self, node_id: Optional[int] = None, prefix: str = "mov_"):
+        """
+        Args:
+            node_id: Knotennummer 0-31, eindeutig je Prozess, der in denselben
+                Speicher schreibt (Standard: 0, nur im Hauptprozess zulässig)
+            prefix: Präfix der Text-IDs
+
+        Raises:
+            ValueError: wenn node_id außerhalb 0-31 liegt
+        """
+        self.prefix = prefix
+        self._explicit_node = node_id is not None
+        self._forked = False
+        self._configure(0 if node_id is None else node_id)
+        if hasattr(os, "register_at_fork"):
+            # Kindprozesse erben sonst Knoten und Sequenzstand des Elternprozesses
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def set_node_id(self, node_id: int) -> None:
+        """
+        Knotennummer für diesen Prozess vergeben, z.B. in einem Kindprozess
+
+        Nur aufrufen, bevor in diesem Prozess IDs erzeugt werden.
+
+        Raises:
+            ValueError: wenn node_id außerhalb 0-31 liegt
+        """
+        self._explicit_node = True
+        self._forked = False
+        self._configure(node_id)
+
+    def _configure(self, node_id: int) -> None:
+        if not 0 <= node_id <= _MAX_NODE:
+            raise ValueError(f"node_id muss zwischen 0 und {_MAX_NODE} liegen")
+        self.node_id = node_id
+        self._slots_lock = threading.Lock()
+        # Freie Slots als [Worker, letzte Millisekunde, Sequenz]; der höchste
+        # Slot bleibt als gemeinsamer Slot für überzählige Threads reserviert
+        self._free_slots: List[List[int]] = [
+            [(node_id << THREAD_BITS) | slot, -1, 0] for slot in range(_MAX_THREAD - 1, -1, -1)
+        ]
+        self._shared_lock = threading.Lock()
+        self._shared_state = [(node_id << THREAD_BITS) | _MAX_THREAD, -1, 0]
+        self._local = threading.local()
+
+    def _after_fork(self) -> None:
+        self._forked = True
+        self._configure(self.node_id)
+
+    def _check_node(self) -> None:
+        """Ohne eigene Knotennummer nur im Hauptprozess IDs erzeugen"""
+        if self._forked:
+            raise RuntimeError(
+                "SnowflakeIdGenerator wurde per fork geerbt; set_node_id() mit einer "
+                "eigenen Knotennummer aufrufen"
+            )
+        if not self._explicit_node:
+            import multiprocessing
+
+            if multiprocessing.parent_process() is not None:
+                raise RuntimeError(
+                    "SnowflakeIdGenerator braucht in Kindprozessen eine eindeutige "
+                    "node_id (set_node_id())"
+                )
+
+    def _thread_state(self) -> Optional[List[int]]:
+        """Privaten Slot des Threads liefern, None wenn gerade keiner frei ist"""
+        state: Optional[List[int]] = getattr(self._local, "state", None)
+        if state is None:
+            self._check_node()
+            with self._slots_lock:
+                if not self._free_slots:
+                    return None
+                state = self._free_slots.pop()
+            # Freigabe in die Liste, aus der der Slot stammt (nach fork ist sie verwaist)
+            self._local.slot = _ThreadSlot(state, self._free_slots.append)
+            self._local.state = state
+        return state
+
+    def next_int(self) -> int:
+        """Neue ID als Ganzzahl erzeugen"""
+        state = self._thread_state()
+        if state is None:
+            with self._shared_lock:
+                return self._advance(self._shared_state)
+        return self._advance(state)
+
+    @staticmethod
+    def _advance(state: List[int]) -> int:
+        """Zeitstempel und Sequenz eines Slots weiterzählen und die ID bilden"""
+        worker, last_ms, sequence = state
+        now_ms = time.time_ns() // 1_000_000 - EPOCH_MS
+        if now_ms > last_ms:
+            last_ms, sequence = now_ms, 0
+        else:
+            sequence += 1
+            if sequence > _MAX_SEQUENCE:
+                last_ms, sequence = last_ms + 1, 0
+        state[1], state[2] = last_ms, sequence
+        return (last_ms << _TIMESTAMP_SHIFT) | (worker << _WORKER_SHIFT) | sequence
+
+    def new_id(self) -> str:
+        """Neue ID als sortierbaren Text erzeugen"""
+        return self.format(self.next_int())
+
+    def format(self, value: int) -> str:
+        """Ganzzahl-ID als Text mit fester Breite darstellen"""
+        return f"{self.prefix}{value:016x}"
+
+    def parse(self, movement_id: str) -> int:
+        """
+        Text-ID zurück in die Ganzzahl wandeln
+
+        Raises:
+            ValueError: wenn die ID nicht von diesem Generator stammt
+        """
+        if not movement_id.startswith(self.prefix):
+            raise ValueError(f"Keine Snowflake-ID: {movement_id}")
+        return int(movement_id[len(self.prefix) :], 16)
+
+    def lower_bound(self, moment: datetime) -> str:
+        """
+        Kleinste mögliche ID für einen Zeitpunkt
+
+        Damit lassen sich Zeitbereiche als ID-Bereiche abfragen
+        (lower_bound(von) <= id < lower_bound(bis)).
+        """
+        epoch_ms = int(moment.timestamp() * 1000)
+        return self.format(max(epoch_ms - EPOCH_MS, 0) << _TIMESTAMP_SHIFT)
+
+    def timestamp_of(self, movement_id: str) -> datetime:
+        """Erzeugungszeitpunkt (lokale Zeit, millisekundengenau) aus einer ID lesen"""
+        epoch_ms = (self.parse(movement_id) >> _TIMESTAMP_SHIFT) + EPOCH_MS
+        return datetime.fromtimestamp(epoch_ms / 1000)
+
+
+# Prozessweiter Standardgenerator: mehrere Services teilen sich die Thread-Slots,
+# damit zwei Services im selben Thread keine gleichen IDs erzeugen. Kindprozesse
+# vergeben ihre Knotennummer mit default_id_generator.set_node_id().
+default_id_generator = SnowflakeIdGenerator()
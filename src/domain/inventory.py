@@ -0,0 +1,100 @@
+"""Inventory Value - laufend gepflegter Lagerwert (gesamt und je Kategorie)"""
+
+import math
+from typing import Dict, Iterable, Optional
+
+from .product import Product
+
+
+class InventoryValue:
+    """
+    Inkrementell gepflegte Summe der Lagerwerte
+
+    Jede Änderung (Anlegen, Löschen, Bestands- oder Preisänderung) wird in O(1)
+    nachgeführt. Wer die Produkte verändert, muss den alten Wert vor der Änderung
+    merken und danach update() aufrufen. Über is_consistent() lässt sich die
+    Summe jederzeit gegen eine Neuberechnung prüfen.
+    """
+
+    def __init__(self, products: Iterable[Product] = ()):
+        self.total = 0.0
+        self.by_category: Dict[str, float] = {}
+        self._counts: Dict[str, int] = {}
+        self.rebuild(products)
+
+    def add(self, product: Product) -> None:
+        """Neues Produkt einrechnen"""
+        self._counts[product.category] = self._counts.get(product.category, 0) + 1
+        self._adjust(product.category, product.get_total_value())
+
+    def remove(self, product: Product) -> None:
+        """Gelöschtes Produkt herausrechnen"""
+        self._drop(product.category, product.get_total_value())
+
+    def update(
+        self, product: Product, old_value: float, old_category: Optional[str] = None
+    ) -> None:
+        """
+        Geändertes Produkt nachführen
+
+        Args:
+            product: Produkt im neuen Zustand
+            old_value: get_total_value() vor der Änderung
+            old_category: Kategorie vor der Änderung (Standard: unverändert)
+        """
+        if old_category is None or old_category == product.category:
+            self._adjust(product.category, product.get_total_value() - old_value)
+            return
+        self._drop(old_category, old_value)
+        self.add(product)
+
+    def _drop(self, category: str, value: float) -> None:
+        self._adjust(category, -value)
+        remaining = self._counts[category] - 1
+        if remaining:
+            self._counts[category] = remaining
+        else:
+            # Leere Kategorien entfernen, statt Rundungsreste stehen zu lassen
+            del self._counts[category]
+            del self.by_category[category]
+
+    def _adjust(self, category: str, delta: float) -> None:
+        self.total += delta
+        self.by_category[category] = self.by_category.get(category, 0.0) + delta
+
+    def rebuild(self, products: Iterable[Product]) -> None:
+        """Summen vollständig neu berechnen"""
+        values: Dict[str, list] = {}
+        for product in products:
+            values.setdefault(product.category, []).append(product.get_total_value())
+        self.by_category = {category: math.fsum(items) for category, items in values.items()}
+        self._counts = {category: len(items) for category, items in values.items()}
+        self.total = math.fsum(self.by_category.values())
+
+    def is_consistent(self, products: Iterable[Product], rel_tol: float = 1e-9) -> bool:
+        """
+        Laufende Summen gegen eine Neuberechnung aus products prüfen
+
+        Returns:
+            True, wenn Gesamtwert und alle Kategorien (bis auf Rundung) übereinstimmen
+        """
+        fresh = InventoryValue(products)
+        if fresh._counts != self._counts:
+            return False
+        if not math.isclose(fresh.total, self.total, rel_tol=rel_tol, abs_tol=1e-6):
+            return False
+        return fresh.matches(self.by_category, rel_tol)
+
+    def matches(self, by_category: Dict[str, float], rel_tol: float = 1e-9) -> bool:
+        """
+        Summen je Kategorie mit anderswo ermittelten Werten vergleichen
+
+        Returns:
+            True, wenn dieselben Kategorien mit (bis auf Rundung) gleichen Werten vorkommen
+        """
+        if by_category.keys() != self.by_category.keys():
+            return False
+        return all(
+            math.isclose(value, by_category[category], rel_tol=rel_tol, abs_tol=1e-6)
+            for category, value in self.by_category.items()
+        )
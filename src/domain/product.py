@@ -5,11 +5,26 @@ from datetime import datetime
 from typing import Optional
 
 
-@dataclass
+def _check_reorder_levels(reorder_point: int, target_quantity: int) -> None:
+    if reorder_point < 0 or target_quantity < 0:
+        raise ValueError("Melde- und Zielbestand können nicht negativ sein")
+    if target_quantity and target_quantity < reorder_point:
+        raise ValueError("Zielbestand kann nicht unter dem Meldebestand liegen")
+
+
+@dataclass(slots=True)
 class Product:
     """
     Basis-Produktklasse für die Lagerverwaltung.
     Siehe docs/DATACLASS_ERKLAERT.md für Erklärung der @dataclass.
+
+    slots=True: Attribute liegen in festen Slots statt in einem __dict__ pro Instanz.
+
+    version zählt die gespeicherten Stände; das Repository erhöht sie bei jedem
+    Speichern und prüft sie beim Compare-and-Swap (save_product mit expected_version).
+
+    reorder_point ist der Meldebestand (bei Bestand <= reorder_point nachbestellen),
+    target_quantity der Zielbestand nach einer Nachbestellung; 0 = nicht geplant.
     """
 
     id: str
@@ -22,6 +37,9 @@ class Product:
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
     notes: Optional[str] = None
+    reorder_point: int = 0
+    target_quantity: int = 0
+    version: int = 0
 
     def __post_init__(self):
         """Validierung nach Initialisierung. Siehe docs/DATACLASS_ERKLAERT.md."""
@@ -31,6 +49,7 @@ class Product:
             raise ValueError("Preis kann nicht negativ sein")
         if self.quantity < 0:
             raise ValueError("Bestand kann nicht negativ sein")
+        _check_reorder_levels(self.reorder_point, self.target_quantity)
 
     def update_quantity(self, amount: int) -> None:
         """
@@ -48,6 +67,42 @@ class Product:
         self.quantity = new_quantity
         self.updated_at = datetime.now()
 
+    def set_price(self, price: float) -> None:
+        """
+        Preis ändern
+
+        Raises:
+            ValueError: wenn der Preis negativ ist
+        """
+        if price < 0:
+            raise ValueError("Preis kann nicht negativ sein")
+        self.price = price
+        self.updated_at = datetime.now()
+
+    def set_reorder_levels(self, reorder_point: int, target_quantity: int) -> None:
+        """
+        Melde- und Zielbestand ändern
+
+        Raises:
+            ValueError: bei negativen Werten oder Zielbestand unter dem Meldebestand
+        """
+        _check_reorder_levels(reorder_point, target_quantity)
+        self.reorder_point = reorder_point
+        self.target_quantity = target_quantity
+        self.updated_at = datetime.now()
+
+    def copy(self) -> "Product":
+        """
+        Flache Kopie ohne erneute Validierung
+
+        Schneller als copy.copy()/dataclasses.replace(), da nur die Slots
+        übernommen werden; Repositories geben so eigene Objekte heraus.
+        """
+        clone = object.__new__(Product)
+        for name in Product.__slots__:
+            setattr(clone, name, getattr(self, name))
+        return clone
+
     def get_total_value(self) -> float:
         """Gesamtwert des Produktbestands berechnen"""
         return self.price * self.quantity
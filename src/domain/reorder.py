@@ -0,0 +1,194 @@
+"""Reorder - Nachbestellvorschläge über eine Prioritätswarteschlange nach Reichweite"""
+
+import heapq
+import itertools
+import math
+import threading
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Deque, Dict, Iterable, List, Tuple
+
+from .product import Product
+from .warehouse import Movement
+
+
+@dataclass(frozen=True)
+class ReorderSuggestion:
+    """
+    Nachbestellvorschlag für ein Produkt am oder unter seinem Meldebestand
+
+    Attributes:
+        days_of_cover: Reichweite des Bestands in Tagen (inf ohne Verbrauch)
+        order_quantity: Menge bis zum Zielbestand (ohne Zielbestand bis zum Meldebestand)
+    """
+
+    product_id: str
+    name: str
+    quantity: int
+    reorder_point: int
+    target_quantity: int
+    daily_demand: float
+    days_of_cover: float
+    order_quantity: int
+
+
+class ReorderEngine:
+    """
+    Laufend gepflegte Liste der nachzubestellenden Produkte, dringendste zuerst
+
+    Ein Produkt wird geführt, solange reorder_point > 0 und Bestand <=
+    reorder_point gilt. Dringlichkeit ist die Reichweite in Tagen: Bestand
+    geteilt durch den Tagesverbrauch (Abgänge "OUT" der letzten window_days
+    Tage). Wer Produkte oder Bewegungen ändert, meldet das über update(),
+    remove() und record() (WarehouseService erledigt das).
+
+    Die Warteschlange ist ein Heap mit verzögertem Löschen: jede Änderung legt
+    einen neuen Eintrag an, veraltete werden erst beim Lesen verworfen. Der
+    Heap wird neu aufgebaut, sobald er mehr als doppelt so viele Einträge wie
+    geführte Produkte enthält. top(k) kostet so O(k log n).
+
+    Die Reichweite wird bei jeder Änderung des Produkts neu berechnet, nicht
+    mit dem Ablauf der Zeit; ohne Bewegungen bleibt ein Eintrag unverändert.
+    """
+
+    def __init__(self, window_days: int = 30, clock: Callable[[], datetime] = datetime.now):
+        """
+        Args:
+            window_days: Zeitraum für den Tagesverbrauch
+            clock: Zeitquelle (für Tests austauschbar)
+
+        Raises:
+            ValueError: wenn window_days < 1
+        """
+        if window_days < 1:
+            raise ValueError(f"window_days muss positiv sein: {window_days}")
+        self.window = timedelta(days=window_days)
+        self.clock = clock
+        self._lock = threading.Lock()
+        # (Reichweite, -Unterschreitung, Produkt-ID, laufende Nummer, Vorschlag); die
+        # laufende Nummer verhindert, dass bei Gleichstand Vorschläge verglichen werden
+        self._heap: List[Tuple[float, int, str, int, ReorderSuggestion]] = []
+        self._sequence = itertools.count()
+        self._current: Dict[str, ReorderSuggestion] = {}
+        # Abgänge im Zeitfenster je Produkt (Zeitpunkt, Menge) und ihre Summe
+        self._demand: Dict[str, Deque[Tuple[datetime, int]]] = {}
+        self._demand_totals: Dict[str, int] = {}
+
+    def rebuild(self, products: Iterable[Product], movements: Iterable[Movement] = ()) -> None:
+        """Zustand aus Produkten und den Bewegungen des Zeitfensters neu aufbauen"""
+        with self._lock:
+            self._heap.clear()
+            self._current.clear()
+            self._demand.clear()
+            self._demand_totals.clear()
+            for movement in sorted(movements, key=lambda movement: movement.timestamp):
+                self._record(movement)
+            for product in products:
+                self._update(product)
+
+    def record(self, movement: Movement) -> None:
+        """Bewegung in den Tagesverbrauch einrechnen; danach update() für das Produkt"""
+        with self._lock:
+            self._record(movement)
+
+    def update(self, product: Product) -> None:
+        """Produkt im neuen Zustand einordnen (oder austragen)"""
+        with self._lock:
+            self._update(product)
+
+    def remove(self, product_id: str) -> None:
+        """Gelöschtes Produkt austragen"""
+        with self._lock:
+            self._current.pop(product_id, None)
+            self._demand.pop(product_id, None)
+            self._demand_totals.pop(product_id, None)
+
+    def daily_demand(self, product_id: str) -> float:
+        """Durchschnittlicher Tagesverbrauch im Zeitfenster"""
+        with self._lock:
+            return self._daily_demand(product_id)
+
+    def top(self, limit: int = 10) -> List[ReorderSuggestion]:
+        """
+        Die dringendsten Nachbestellungen
+
+        Args:
+            limit: Anzahl Vorschläge
+
+        Returns:
+            Vorschläge nach Reichweite aufsteigend, bei gleicher Reichweite
+            größte Unterschreitung des Meldebestands zuerst
+        """
+        with self._lock:
+            found: List[Tuple[float, int, str, int, ReorderSuggestion]] = []
+            while self._heap and len(found) < limit:
+                entry = heapq.heappop(self._heap)
+                if self._current.get(entry[2]) is entry[4]:
+                    found.append(entry)
+            for entry in found:
+                heapq.heappush(self._heap, entry)
+            return [entry[4] for entry in found]
+
+    def __len__(self) -> int:
+        """Anzahl Produkte am oder unter dem Meldebestand"""
+        return len(self._current)
+
+    def _record(self, movement: Movement) -> None:
+        if movement.movement_type != "OUT":
+            return
+        product_id = movement.product_id
+        self._demand.setdefault(product_id, deque()).append(
+            (movement.timestamp, -movement.quantity_change)
+        )
+        self._demand_totals[product_id] = (
+            self._demand_totals.get(product_id, 0) - movement.quantity_change
+        )
+        self._expire(product_id)
+
+    def _expire(self, product_id: str) -> None:
+        """Abgänge außerhalb des Zeitfensters verwerfen"""
+        entries = self._demand[product_id]
+        horizon = self.clock() - self.window
+        while entries and entries[0][0] < horizon:
+            self._demand_totals[product_id] -= entries.popleft()[1]
+        if not entries:
+            del self._demand[product_id]
+            del self._demand_totals[product_id]
+
+    def _daily_demand(self, product_id: str) -> float:
+        if product_id not in self._demand:
+            return 0.0
+        self._expire(product_id)
+        return self._demand_totals.get(product_id, 0) / self.window.days
+
+    def _update(self, product: Product) -> None:
+        product_id = product.id
+        if not product.reorder_point or product.quantity > product.reorder_point:
+            self._current.pop(product_id, None)
+            return
+        demand = self._daily_demand(product_id)
+        days_of_cover = product.quantity / demand if demand else math.inf
+        target = product.target_quantity or product.reorder_point
+        suggestion = ReorderSuggestion(
+            product_id=product_id,
+            name=product.name,
+            quantity=product.quantity,
+            reorder_point=product.reorder_point,
+            target_quantity=product.target_quantity,
+            daily_demand=demand,
+            days_of_cover=days_of_cover,
+            order_quantity=max(target - product.quantity, 0),
+        )
+        self._current[product_id] = suggestion
+        shortfall = product.reorder_point - product.quantity
+        heapq.heappush(
+            self._heap, (days_of_cover, -shortfall, product_id, next(self._sequence), suggestion)
+        )
+        if len(self._heap) > 2 * len(self._current) + 64:
+            self._compact()
+
+    def _compact(self) -> None:
+        """Veraltete Einträge entfernen und den Heap neu aufbauen"""
+        self._heap = [entry for entry in self._heap if self._current.get(entry[2]) is entry[4]]
+        heapq.heapify(self._heap)
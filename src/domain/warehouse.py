@@ -4,12 +4,18 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Dict, Optional
 
+from .inventory import InventoryValue
 from .product import Product
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Movement:
-    """Bewegungsprotokoll-Eintrag für Lagerbestände"""
+    """
+    Bewegungsprotokoll-Eintrag für Lagerbestände
+
+    Unveränderlich (frozen) und ohne __dict__ (slots) - Protokolleinträge werden
+    nach dem Anlegen nicht mehr geändert und kommen in großer Zahl vor.
+    """
 
     id: str
     product_id: str
@@ -21,6 +27,25 @@ class Movement:
     performed_by: str = "system"
 
 
+@dataclass(frozen=True)
+class Transfer:
+    """
+    Umlagerungsauftrag zwischen zwei Standorten
+
+    Abgang und Zugang tragen note als Grund; darüber lassen sich die Buchungen
+    eines Auftrags in den Bewegungsprotokollen beider Standorte wiederfinden.
+    """
+
+    id: str
+    product_id: str
+    quantity: int
+    source: str
+    target: str
+    note: str
+    user: str = "system"
+    created_at: datetime = field(default_factory=datetime.now)
+
+
 class Warehouse:
     """Verwaltungsklasse für das Lager"""
 
@@ -28,12 +53,41 @@ class Warehouse:
         self.name = name
         self.products: Dict[str, Product] = {}
         self.movements: list[Movement] = []
+        self.inventory_value = InventoryValue()
 
     def add_product(self, product: Product) -> None:
         """Produkt zum Lager hinzufügen"""
         if product.id in self.products:
             raise ValueError(f"Produkt mit ID {product.id} existiert bereits")
         self.products[product.id] = product
+        self.inventory_value.add(product)
+
+    def remove_product(self, product_id: str) -> Product:
+        """Produkt aus dem Lager entfernen"""
+        product = self._require_product(product_id)
+        del self.products[product_id]
+        self.inventory_value.remove(product)
+        return product
+
+    def update_quantity(self, product_id: str, amount: int) -> None:
+        """Bestand eines Produkts ändern und den Lagerwert nachführen"""
+        product = self._require_product(product_id)
+        old_value = product.get_total_value()
+        product.update_quantity(amount)
+        self.inventory_value.update(product, old_value)
+
+    def update_price(self, product_id: str, price: float) -> None:
+        """Preis eines Produkts ändern und den Lagerwert nachführen"""
+        product = self._require_product(product_id)
+        old_value = product.get_total_value()
+        product.set_price(price)
+        self.inventory_value.update(product, old_value)
+
+    def _require_product(self, product_id: str) -> Product:
+        product = self.products.get(product_id)
+        if product is None:
+            raise ValueError(f"Produkt mit ID {product_id} existiert nicht")
+        return product
 
     def get_product(self, product_id: str) -> Optional[Product]:
         """Produkt nach ID abrufen"""
@@ -42,14 +96,20 @@ class Warehouse:
     def record_movement(self, movement: Movement) -> None:
         """Lagerbewegung protokollieren"""
         if movement.product_id not in self.products:
-            raise ValueError(
-                f"Produkt mit ID {movement.product_id} existiert nicht"
-            )
+            raise ValueError(f"Produkt mit ID {movement.product_id} existiert nicht")
         self.movements.append(movement)
 
     def get_total_inventory_value(self) -> float:
-        """Gesamtwert aller Bestände berechnen"""
-        return sum(product.get_total_value() for product in self.products.values())
+        """Gesamtwert aller Bestände (laufend gepflegt, O(1))"""
+        return self.inventory_value.total
+
+    def get_category_values(self) -> Dict[str, float]:
+        """Lagerwert je Kategorie (laufend gepflegt)"""
+        return dict(self.inventory_value.by_category)
+
+    def check_inventory_value(self) -> bool:
+        """Laufenden Lagerwert gegen eine Neuberechnung prüfen"""
+        return self.inventory_value.is_consistent(self.products.values())
 
     def get_inventory_report(self) -> Dict[str, dict]:
         """
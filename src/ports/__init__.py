@@ -1,30 +1,249 @@
 """Ports - Schnittstellen für externe Abhängigkeiten (Abstraktion)"""
 
+import bisect
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Generic, Iterable, Iterator, List, Optional, TextIO, TypeVar
 
+from ..domain.inventory import InventoryValue
 from ..domain.product import Product
-from ..domain.warehouse import Movement
+from ..domain.warehouse import Movement, Transfer
+
+T = TypeVar("T")
+
+# Sortierschlüssel für Keyset-Pagination; der Cursor ist der Schlüssel der letzten Zeile
+PRODUCT_ORDERINGS = {
+    "id": lambda p: (p.id,),
+    "category": lambda p: (p.category, p.id),
+}
+MOVEMENT_ORDERINGS = {
+    "timestamp": lambda m: (m.timestamp, m.id),
+}
+
+
+def _in_range(moment: datetime, since: Optional[datetime], until: Optional[datetime]) -> bool:
+    """Halboffenes Zeitintervall [since, until); None = offen"""
+    return (since is None or since <= moment) and (until is None or moment < until)
+
+
+class VersionConflictError(ValueError):
+    """
+    Compare-and-Swap fehlgeschlagen: das Produkt wurde inzwischen anders gespeichert
+
+    Attributes:
+        product_id: betroffenes Produkt
+        expected_version: Version, gegen die gespeichert werden sollte
+        actual_version: aktuell gespeicherte Version (0 = nicht vorhanden)
+    """
+
+    def __init__(self, product_id: str, expected_version: int, actual_version: int):
+        super().__init__(
+            f"Versionskonflikt bei Produkt {product_id}: "
+            f"erwartet {expected_version}, gespeichert {actual_version}"
+        )
+        self.product_id = product_id
+        self.expected_version = expected_version
+        self.actual_version = actual_version
+
+    def __reduce__(self):
+        # Für die Übergabe zwischen Prozessen (z.B. services.sites.SiteProcess)
+        return type(self), (self.product_id, self.expected_version, self.actual_version)
+
+
+def next_version(stored_version: int, product: Product, expected_version: Optional[int]) -> int:
+    """
+    Version nach dem Speichern bestimmen
+
+    Raises:
+        VersionConflictError: wenn expected_version gesetzt ist und nicht stored_version entspricht
+    """
+    if expected_version is None:
+        # Ohne Prüfung gilt "last writer wins", die Version läuft aber nie rückwärts
+        return max(stored_version, product.version) + 1
+    if stored_version != expected_version:
+        raise VersionConflictError(product.id, expected_version, stored_version)
+    return expected_version + 1
+
+
+@dataclass
+class Page(Generic[T]):
+    """Eine Seite einer Keyset-paginierten Abfrage"""
+
+    items: List[T]
+    next_cursor: Optional[tuple] = None
+
+    @property
+    def has_more(self) -> bool:
+        """Gibt es eine weitere Seite?"""
+        return self.next_cursor is not None
+
+
+def make_page(items: List[T], limit: int, key) -> Page:
+    """
+    Seite aus bis zu limit + 1 Zeilen bauen
+
+    Eine zusätzlich gelesene Zeile zeigt an, dass es weitergeht.
+    """
+    if len(items) > limit:
+        items = items[:limit]
+        return Page(items, key(items[-1]))
+    return Page(items, None)
+
+
+def check_page_request(orderings: dict, order_by: str, limit: int) -> None:
+    """
+    Parameter einer Seitenabfrage prüfen
+
+    Raises:
+        ValueError: bei unbekannter Sortierung oder limit < 1
+    """
+    if order_by not in orderings:
+        raise ValueError(f"Unbekannte Sortierung: {order_by}")
+    if limit < 1:
+        raise ValueError(f"limit muss positiv sein: {limit}")
 
 
 class RepositoryPort(ABC):
     """Port für Datenpersistenz"""
 
     @abstractmethod
-    def save_product(self, product: Product) -> None:
-        """Produkt speichern"""
+    def save_product(self, product: Product, expected_version: Optional[int] = None) -> None:
+        """
+        Produkt speichern
+
+        Jedes Speichern erhöht product.version. Mit expected_version wird nur
+        gespeichert, wenn die gespeicherte Version (0 = Produkt fehlt) noch
+        expected_version ist (Compare-and-Swap).
+
+        Raises:
+            VersionConflictError: bei abweichender Version; nichts wird gespeichert
+        """
         pass
 
+    def save_products(
+        self, products: Iterable[Product], expected_versions: Optional[Dict[str, int]] = None
+    ) -> None:
+        """
+        Mehrere Produkte auf einmal speichern
+
+        Standardimplementierung ruft save_product() pro Produkt auf und ist daher
+        bei einem Versionskonflikt nicht atomar; Adapter sollten als
+        Sammel-Schreibzugriff überschreiben und alle Versionen vorab prüfen.
+
+        Args:
+            products: zu speichernde Produkte
+            expected_versions: erwartete Version je Produkt-ID (fehlende IDs ungeprüft)
+        """
+        expected_versions = expected_versions or {}
+        for product in products:
+            self.save_product(product, expected_versions.get(product.id))
+
     @abstractmethod
     def load_product(self, product_id: str) -> Optional[Product]:
-        """Produkt laden"""
+        """
+        Produkt laden
+
+        Liefert ein eigenes Objekt: Änderungen werden erst mit save_product()
+        sichtbar, product.version ist die Grundlage für Compare-and-Swap.
+        """
         pass
 
+    def load_products(self, product_ids: Iterable[str]) -> Dict[str, Product]:
+        """
+        Mehrere Produkte auf einmal laden
+
+        Returns:
+            Dictionary der gefundenen Produkte (unbekannte IDs fehlen)
+        """
+        products = {}
+        for product_id in product_ids:
+            product = self.load_product(product_id)
+            if product is not None:
+                products[product_id] = product
+        return products
+
     @abstractmethod
     def load_all_products(self) -> Dict[str, Product]:
         """Alle Produkte laden"""
         pass
 
+    def iter_products(self) -> Iterator[Product]:
+        """
+        Produkte nacheinander liefern, ohne alle auf einmal zu materialisieren
+
+        Standardimplementierung über load_all_products(); persistente Adapter
+        sollten überschreiben und zeilenweise streamen.
+        """
+        return iter(self.load_all_products().values())
+
+    def count_products(self) -> int:
+        """Anzahl gespeicherter Produkte"""
+        return len(self.load_all_products())
+
+    def inventory_value_by_category(self) -> Dict[str, float]:
+        """
+        Lagerwert (Preis x Bestand) je Kategorie
+
+        Standardimplementierung rechnet über alle Produkte; Adapter sollten
+        den Wert nachführen oder in der Datenbank summieren.
+        """
+        return InventoryValue(self.iter_products()).by_category
+
+    def rebuild_inventory_value(self) -> None:
+        """
+        Nachgeführten Lagerwert aus den Produkten neu berechnen
+
+        Ohne Wirkung für Adapter, die den Wert bei jeder Abfrage berechnen.
+        """
+
+    def find_by_sku(self, sku: str) -> Optional[Product]:
+        """
+        Produkt über die SKU (z.B. gescannten Barcode) finden
+
+        Standardimplementierung durchsucht alle Produkte; Adapter sollten
+        einen Index verwenden.
+        """
+        if not sku:
+            return None
+        return next((p for p in self.iter_products() if p.sku == sku), None)
+
+    def list_by_category(self, category: str) -> List[Product]:
+        """Alle Produkte einer Kategorie, sortiert nach ID"""
+        return sorted(
+            (p for p in self.iter_products() if p.category == category), key=lambda p: p.id
+        )
+
+    def list_below_threshold(self, threshold: int) -> List[Product]:
+        """Alle Produkte mit Bestand unter threshold, aufsteigend nach Bestand"""
+        return sorted(
+            (p for p in self.iter_products() if p.quantity < threshold),
+            key=lambda p: (p.quantity, p.id),
+        )
+
+    def list_products_page(
+        self, after: Optional[tuple] = None, limit: int = 500, order_by: str = "id"
+    ) -> Page[Product]:
+        """
+        Produkte seitenweise (Keyset-Pagination) laden
+
+        Args:
+            after: next_cursor der vorherigen Seite (None = erste Seite)
+            limit: maximale Anzahl Zeilen pro Seite
+            order_by: "id" oder "category" (Kategorie, dann ID)
+
+        Returns:
+            Page mit Produkten und Cursor für die nächste Seite
+
+        Standardimplementierung sortiert alle Produkte; Adapter sollten
+        über einen Index einsteigen.
+        """
+        check_page_request(PRODUCT_ORDERINGS, order_by, limit)
+        key = PRODUCT_ORDERINGS[order_by]
+        products = sorted(self.iter_products(), key=key)
+        start = bisect.bisect_right(products, after, key=key) if after else 0
+        return make_page(products[start : start + limit + 1], limit, key)
+
     @abstractmethod
     def delete_product(self, product_id: str) -> None:
         """Produkt löschen"""
@@ -35,21 +254,239 @@ class RepositoryPort(ABC):
         """Lagerbewegung speichern"""
         pass
 
+    def save_movements(self, movements: Iterable[Movement]) -> None:
+        """
+        Mehrere Lagerbewegungen auf einmal speichern
+
+        Standardimplementierung ruft save_movement() pro Bewegung auf.
+        """
+        for movement in movements:
+            self.save_movement(movement)
+
     @abstractmethod
     def load_movements(self) -> List[Movement]:
         """Alle Lagerbewegungen laden"""
         pass
 
+    def count_movements(self) -> int:
+        """Anzahl gespeicherter Lagerbewegungen"""
+        return len(self.load_movements())
+
+    def movements_between(
+        self, since: Optional[datetime] = None, until: Optional[datetime] = None
+    ) -> List[Movement]:
+        """
+        Lagerbewegungen eines Zeitraums laden
+
+        Standardimplementierung filtert load_movements(); Adapter nutzen einen
+        Zeitindex.
+
+        Args:
+            since: Beginn (einschließlich, None = offen)
+            until: Ende (ausschließlich, None = offen)
+
+        Returns:
+            Bewegungen mit since <= timestamp < until, sortiert nach (timestamp, id)
+        """
+        return sorted(
+            (m for m in self.load_movements() if _in_range(m.timestamp, since, until)),
+            key=MOVEMENT_ORDERINGS["timestamp"],
+        )
+
+    def movements_for_product(
+        self,
+        product_id: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> List[Movement]:
+        """
+        Lagerbewegungen eines Produkts in einem Zeitraum laden (Produkthistorie)
+
+        Args:
+            product_id: Produkt-ID
+            since: Beginn (einschließlich, None = offen)
+            until: Ende (ausschließlich, None = offen)
+
+        Returns:
+            Bewegungen des Produkts, sortiert nach (timestamp, id)
+        """
+        return [m for m in self.movements_between(since, until) if m.product_id == product_id]
+
+    def close(self) -> None:
+        """Ressourcen freigeben (Standard: nichts zu tun)"""
+
+    def list_movements_page(
+        self, after: Optional[tuple] = None, limit: int = 500, order_by: str = "timestamp"
+    ) -> Page[Movement]:
+        """
+        Lagerbewegungen seitenweise (Keyset-Pagination) laden
+
+        Args:
+            after: next_cursor der vorherigen Seite (None = erste Seite)
+            limit: maximale Anzahl Zeilen pro Seite
+            order_by: "timestamp" (Zeitstempel, dann ID)
+
+        Returns:
+            Page mit Bewegungen und Cursor für die nächste Seite
+        """
+        check_page_request(MOVEMENT_ORDERINGS, order_by, limit)
+        key = MOVEMENT_ORDERINGS[order_by]
+        movements = sorted(self.load_movements(), key=key)
+        start = bisect.bisect_right(movements, after, key=key) if after else 0
+        return make_page(movements[start : start + limit + 1], limit, key)
+
+
+class AsyncRepositoryPort(ABC):
+    """
+    Asynchroner Port für Datenpersistenz (für AsyncWarehouseService)
+
+    Gleiche Semantik wie RepositoryPort (Versionen, Kopien, Keyset-Pagination),
+    aber als Coroutinen. Schreibzugriffe laufen über save_changes(), das
+    Produkte und Bewegungen atomar in einem Schritt speichert.
+    """
+
+    @abstractmethod
+    async def load_product(self, product_id: str) -> Optional[Product]:
+        """Produkt laden (eigenes Objekt) oder None"""
+        pass
+
+    @abstractmethod
+    async def load_products(self, product_ids: Iterable[str]) -> Dict[str, Product]:
+        """Mehrere Produkte laden; fehlende IDs fehlen im Ergebnis"""
+        pass
+
+    @abstractmethod
+    async def find_by_sku(self, sku: str) -> Optional[Product]:
+        """Produkt über die SKU finden (None für leere/unbekannte SKU)"""
+        pass
+
+    @abstractmethod
+    async def save_changes(
+        self,
+        products: Iterable[Product],
+        movements: Iterable[Movement] = (),
+        expected_versions: Optional[Dict[str, int]] = None,
+    ) -> None:
+        """
+        Produkte und Bewegungen atomar speichern
+
+        Args:
+            products: zu speichernde Produkte (product.version wird erhöht)
+            movements: anzuhängende Bewegungen
+            expected_versions: erwartete Version je Produkt-ID (fehlende IDs ungeprüft)
+
+        Raises:
+            VersionConflictError: bei abweichender Version; nichts wird gespeichert
+        """
+        pass
+
+    @abstractmethod
+    async def delete_product(self, product_id: str) -> None:
+        """Produkt löschen (unbekannte IDs werden ignoriert)"""
+        pass
+
+    @abstractmethod
+    async def list_products_page(
+        self, after: Optional[tuple] = None, limit: int = 500, order_by: str = "id"
+    ) -> Page[Product]:
+        """Produkte seitenweise laden (siehe RepositoryPort.list_products_page)"""
+        pass
+
+    @abstractmethod
+    async def list_movements_page(
+        self, after: Optional[tuple] = None, limit: int = 500, order_by: str = "timestamp"
+    ) -> Page[Movement]:
+        """Bewegungen seitenweise laden (siehe RepositoryPort.list_movements_page)"""
+        pass
+
+    @abstractmethod
+    async def movements_between(
+        self, since: Optional[datetime] = None, until: Optional[datetime] = None
+    ) -> List[Movement]:
+        """Bewegungen eines Zeitraums laden (siehe RepositoryPort.movements_between)"""
+        pass
+
+    @abstractmethod
+    async def movements_for_product(
+        self,
+        product_id: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> List[Movement]:
+        """Produkthistorie laden (siehe RepositoryPort.movements_for_product)"""
+        pass
+
+    async def save_product(self, product: Product, expected_version: Optional[int] = None) -> None:
+        """Ein Produkt speichern (Compare-and-Swap mit expected_version)"""
+        expected = None if expected_version is None else {product.id: expected_version}
+        await self.save_changes([product], (), expected)
+
+    async def save_movements(self, movements: Iterable[Movement]) -> None:
+        """Bewegungen anhängen"""
+        await self.save_changes((), movements)
+
+    async def close(self) -> None:
+        """Ressourcen freigeben (Standard: nichts zu tun)"""
+
+
+class TransferLogPort(ABC):
+    """
+    Port für das Protokoll offener Umlagerungen (Write-Ahead)
+
+    Ein Auftrag wird vor der ersten Buchung mit begin() festgehalten und nach
+    der letzten mit finish() abgeschlossen. Was nach einem Fehler oder Neustart
+    noch in pending() steht, schließt MultiWarehouseService.recover_transfers() ab.
+    """
+
+    @abstractmethod
+    def begin(self, transfer: Transfer) -> None:
+        """Auftrag dauerhaft festhalten, bevor gebucht wird"""
+        pass
+
+    @abstractmethod
+    def finish(self, transfer_id: str) -> None:
+        """Auftrag als abgeschlossen markieren (unbekannte IDs werden ignoriert)"""
+        pass
+
+    @abstractmethod
+    def pending(self) -> List[Transfer]:
+        """Begonnene, nicht abgeschlossene Aufträge in der Reihenfolge von begin()"""
+        pass
+
+    def close(self) -> None:
+        """Ressourcen freigeben (Standard: nichts zu tun)"""
+
 
 class ReportPort(ABC):
-    """Port für Report-Generierung"""
+    """
+    Port für Report-Generierung
+
+    Adapter liefern Berichte zeilenweise als Generator (iter_*); write_* streamt
+    diese Zeilen in eine Datei o.ä., generate_* baut daraus einen String.
+    """
 
     @abstractmethod
-    def generate_inventory_report(self) -> str:
-        """Lagerbestandsbericht generieren"""
+    def iter_inventory_report(self) -> Iterator[str]:
+        """Lagerbestandsbericht zeilenweise (inkl. Zeilenumbruch) liefern"""
         pass
 
     @abstractmethod
+    def iter_movement_report(self) -> Iterator[str]:
+        """Bewegungsprotokoll zeilenweise (inkl. Zeilenumbruch) liefern"""
+        pass
+
+    def write_inventory_report(self, sink: TextIO) -> None:
+        """Lagerbestandsbericht in sink schreiben (konstanter Speicherbedarf)"""
+        sink.writelines(self.iter_inventory_report())
+
+    def write_movement_report(self, sink: TextIO) -> None:
+        """Bewegungsprotokoll in sink schreiben (konstanter Speicherbedarf)"""
+        sink.writelines(self.iter_movement_report())
+
+    def generate_inventory_report(self) -> str:
+        """Lagerbestandsbericht generieren"""
+        return "".join(self.iter_inventory_report())
+
     def generate_movement_report(self) -> str:
         """Bewegungsprotokoll generieren"""
-        pass
+        return "".join(self.iter_movement_report())
@@ -1,3 +1,5 @@
-"""Reports Module - Report-Generierung"""
+"""Reports Module - Report-Generierung und Analytics"""
 
-__all__ = ["InventoryReport", "MovementReport"]
+from .analytics import InventoryReport, MovementArrays, MovementReport
+
+__all__ = ["InventoryReport", "MovementReport", "MovementArrays"]
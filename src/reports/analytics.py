@@ -0,0 +1,242 @@
+"""
+Analytics - vektorisierte Kennzahlen über Bestände und Lagerbewegungen
+
+Bewegungen werden einmal in NumPy-Arrays geladen; alle Kennzahlen werden
+danach gruppiert über bincount/argsort/reduceat berechnet statt in
+Python-Schleifen pro Objekt. Benötigt das optionale Paket numpy
+(pip install -e ".[analytics]").
+"""
+
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+
+    HAS_NUMPY = True
+except ImportError:  # pragma: no cover - abhängig von der Installation
+    HAS_NUMPY = False
+
+from ..domain.product import Product
+from ..domain.warehouse import Movement
+
+_EPOCH_DAY = date(1970, 1, 1)
+
+
+def _require_numpy() -> None:
+    if not HAS_NUMPY:
+        raise ImportError('Für die Analytics wird numpy benötigt: pip install -e ".[analytics]"')
+
+
+def _day_number(moment: datetime) -> int:
+    return (moment.date() - _EPOCH_DAY).days
+
+
+class MovementArrays:
+    """
+    Bewegungen als Spalten-Arrays
+
+    Attributes:
+        product_ids: Produkt-ID je Produktcode (Code = Index in dieser Liste)
+        product_codes: Produktcode je Bewegung (int64)
+        days: Tag je Bewegung als Tage seit 1970-01-01 (int64)
+        quantity_change: Bestandsänderung je Bewegung (int64)
+        is_out: True für Bewegungen vom Typ "OUT" (Verbrauch)
+    """
+
+    def __init__(
+        self,
+        product_ids: List[str],
+        product_codes,
+        days,
+        quantity_change,
+        is_out,
+    ):
+        _require_numpy()
+        self.product_ids = product_ids
+        self.product_codes = np.asarray(product_codes, dtype=np.int64)
+        self.days = np.asarray(days, dtype=np.int64)
+        self.quantity_change = np.asarray(quantity_change, dtype=np.int64)
+        self.is_out = np.asarray(is_out, dtype=bool)
+
+    @classmethod
+    def from_movements(cls, movements: Iterable[Movement]) -> "MovementArrays":
+        """Arrays aus beliebigen Bewegungen (ein Durchlauf) aufbauen"""
+        _require_numpy()
+        codes: Dict[str, int] = {}
+        product_codes, days, changes, is_out = [], [], [], []
+        for movement in movements:
+            product_codes.append(codes.setdefault(movement.product_id, len(codes)))
+            days.append(_day_number(movement.timestamp))
+            changes.append(movement.quantity_change)
+            is_out.append(movement.movement_type == "OUT")
+        return cls(list(codes), product_codes, days, changes, is_out)
+
+    @classmethod
+    def from_store(cls, store) -> "MovementArrays":
+        """
+        Arrays direkt aus einem ColumnarMovementStore übernehmen
+
+        Die Spalten werden per np.frombuffer ohne Python-Schleife gelesen.
+        """
+        _require_numpy()
+        micros = np.frombuffer(store._timestamps, dtype=np.int64)
+        string_codes = np.frombuffer(store._products, dtype=np.uint32)
+        used_codes, product_codes = np.unique(string_codes, return_inverse=True)
+        types = np.frombuffer(store._types, dtype=np.uint32)
+        out_code = store._string_codes.get("OUT")
+        return cls(
+            [store._strings[code] for code in used_codes],
+            product_codes,
+            np.floor_divide(micros, 86_400_000_000),
+            np.frombuffer(store._deltas, dtype=np.int32),
+            types == out_code if out_code is not None else np.zeros(len(types), dtype=bool),
+        )
+
+    def __len__(self) -> int:
+        return len(self.quantity_change)
+
+
+class MovementReport:
+    """Aggregationen über Lagerbewegungen (je Produkt, je Tag)"""
+
+    def __init__(self, movements: MovementArrays):
+        self.movements = movements
+
+    @property
+    def product_count(self) -> int:
+        return len(self.movements.product_ids)
+
+    def period_days(self) -> int:
+        """Anzahl Kalendertage zwischen erster und letzter Bewegung (mindestens 1)"""
+        if not len(self.movements):
+            return 1
+        days = self.movements.days
+        return int(days.max() - days.min()) + 1
+
+    def net_change_per_product(self):
+        """Summe der Bestandsänderungen je Produktcode"""
+        m = self.movements
+        return np.bincount(
+            m.product_codes, weights=m.quantity_change, minlength=self.product_count
+        ).astype(np.int64)
+
+    def outflow_per_product(self):
+        """Verbrauch (Summe der OUT-Mengen) je Produktcode"""
+        m = self.movements
+        weights = np.where(m.is_out, -m.quantity_change, 0)
+        return np.bincount(m.product_codes, weights=weights, minlength=self.product_count).astype(
+            np.int64
+        )
+
+    def daily_net_flow(self) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+        """
+        Netto-Bestandsänderung je Produkt und Tag
+
+        Returns:
+            (product_ids, days, net) - drei gleich lange Arrays (object,
+            datetime64[D], int64), sortiert nach Produktcode und Tag;
+            nur Tage mit Bewegungen sind enthalten
+        """
+        m = self.movements
+        if not len(m):
+            return (
+                np.empty(0, dtype=object),
+                np.empty(0, dtype="datetime64[D]"),
+                np.zeros(0, dtype=np.int64),
+            )
+        first_day = m.days.min()
+        span = int(m.days.max() - first_day) + 1
+        keys = m.product_codes * span + (m.days - first_day)
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+        net = np.add.reduceat(m.quantity_change[order], starts)
+        group_keys = sorted_keys[starts]
+        codes, offsets = np.divmod(group_keys, span)
+        product_ids = np.array(m.product_ids, dtype=object)[codes]
+        days = (first_day + offsets).astype("datetime64[D]")
+        return product_ids, days, net
+
+
+class InventoryReport:
+    """Bestandskennzahlen: Umschlag, Reichweite und ABC-Klassifizierung"""
+
+    def __init__(
+        self,
+        products: Iterable[Product],
+        movements: MovementArrays,
+        period_days: Optional[int] = None,
+    ):
+        """
+        Args:
+            products: aktuelle Produkte (Bestand und Preis)
+            movements: Bewegungen des Betrachtungszeitraums
+            period_days: Länge des Zeitraums in Tagen (Standard: aus den Bewegungen)
+        """
+        _require_numpy()
+        self.movement_report = MovementReport(movements)
+        products = list(products)
+        self.product_ids = [product.id for product in products]
+        self.quantity = np.fromiter((p.quantity for p in products), np.float64, len(products))
+        self.price = np.fromiter((p.price for p in products), np.float64, len(products))
+        self.period_days = period_days or self.movement_report.period_days()
+
+        # Produktcodes der Bewegungen auf die Reihenfolge der Produkte abbilden
+        positions = {product_id: index for index, product_id in enumerate(self.product_ids)}
+        mapping = np.fromiter(
+            (positions.get(pid, -1) for pid in movements.product_ids),
+            np.int64,
+            len(movements.product_ids),
+        )
+        known = mapping >= 0
+        self.outflow = np.zeros(len(products))
+        self.net_change = np.zeros(len(products))
+        np.add.at(self.outflow, mapping[known], self.movement_report.outflow_per_product()[known])
+        np.add.at(
+            self.net_change, mapping[known], self.movement_report.net_change_per_product()[known]
+        )
+
+    def _as_dict(self, values) -> Dict:
+        return dict(zip(self.product_ids, values.tolist()))
+
+    def turnover(self) -> Dict[str, float]:
+        """
+        Lagerumschlag je Produkt: Verbrauch / durchschnittlicher Bestand
+
+        Der Durchschnittsbestand wird aus Anfangs- (aktueller Bestand minus
+        Nettoänderung) und Endbestand geschätzt. Ohne Bestand ist der Umschlag 0.
+        """
+        average_stock = (self.quantity + (self.quantity - self.net_change)) / 2
+        with np.errstate(divide="ignore", invalid="ignore"):
+            turnover = np.where(average_stock > 0, self.outflow / average_stock, 0.0)
+        return self._as_dict(turnover)
+
+    def days_of_cover(self) -> Dict[str, float]:
+        """Reichweite in Tagen: Bestand / durchschnittlicher Tagesverbrauch (inf ohne Verbrauch)"""
+        daily_usage = self.outflow / self.period_days
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cover = np.where(daily_usage > 0, self.quantity / daily_usage, np.inf)
+        return self._as_dict(cover)
+
+    def abc_classification(self, a_share: float = 0.8, b_share: float = 0.95) -> Dict[str, str]:
+        """
+        ABC-Analyse nach Verbrauchswert (Verbrauch x Preis)
+
+        Produkte werden absteigend nach Verbrauchswert sortiert; bis a_share des
+        kumulierten Werts sind "A", bis b_share "B", der Rest "C".
+        Produkte ohne Verbrauch sind immer "C".
+        """
+        value = self.outflow * self.price
+        total = value.sum()
+        classes = np.full(len(value), "C", dtype="<U1")
+        if total <= 0:
+            return self._as_dict(classes)
+        order = np.argsort(-value, kind="stable")
+        # Anteil *vor* dem Produkt entscheidet, damit das Produkt, das die Grenze
+        # überschreitet, noch zur höheren Klasse zählt
+        share_before = (np.cumsum(value[order]) - value[order]) / total
+        ranked = np.where(share_before < a_share, "A", np.where(share_before < b_share, "B", "C"))
+        ranked[value[order] <= 0] = "C"
+        classes[order] = ranked
+        return self._as_dict(classes)
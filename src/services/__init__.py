@@ -1,19 +1,164 @@
 """Services - Business Logic Layer"""
 
+import math
+import random
+import time
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, TypeVar
 
+from ..domain.ids import IdGenerator, default_id_generator
+from ..domain.inventory import InventoryValue
 from ..domain.product import Product
-from ..domain.warehouse import Movement, Warehouse
-from ..ports import RepositoryPort
+from ..domain.reorder import ReorderEngine, ReorderSuggestion
+from ..domain.warehouse import Movement
+from ..ports import Page, RepositoryPort, VersionConflictError
+from .locking import StripedLock
+from .metrics import InstrumentedRepository, MetricsRegistry, repository_sizes
+
+T = TypeVar("T")
+
+# Öffentliche Methoden, die mit MetricsRegistry gemessen werden (Generatoren wie
+# iter_products fehlen: gemessen würde nur das Erzeugen)
+_INSTRUMENTED_METHODS = (
+    "create_product",
+    "create_products",
+    "add_to_stock",
+    "remove_from_stock",
+    "apply_movements",
+    "update_price",
+    "set_reorder_levels",
+    "delete_product",
+    "get_product",
+    "find_by_sku",
+    "get_products_by_category",
+    "get_low_stock_products",
+    "get_all_products",
+    "get_products_page",
+    "get_movements",
+    "get_movements_page",
+    "get_movements_between",
+    "get_product_history",
+    "get_total_inventory_value",
+    "get_category_values",
+    "get_reorder_suggestions",
+)
+
+MOVEMENT_TYPES = ("IN", "OUT", "CORRECTION")
+
+
+@dataclass
+class MovementLine:
+    """
+    Eine Zeile eines Bewegungs-Batches für WarehouseService.apply_movements()
+
+    Bei "IN" und "OUT" ist quantity die (positive) Menge, bei "CORRECTION"
+    die vorzeichenbehaftete Bestandsänderung.
+    """
+
+    product_id: str
+    quantity: int
+    movement_type: str = "IN"
+    reason: str = ""
+    user: str = "system"
+
+    def quantity_change(self) -> int:
+        """
+        Vorzeichenbehaftete Bestandsänderung dieser Zeile
+
+        Raises:
+            ValueError: bei unbekanntem Typ oder ungültiger Menge
+        """
+        if self.movement_type not in MOVEMENT_TYPES:
+            raise ValueError(f"Unbekannter Bewegungstyp: {self.movement_type}")
+        if self.movement_type == "CORRECTION":
+            if self.quantity == 0:
+                raise ValueError("Korrektur mit Menge 0 ist nicht erlaubt")
+            return self.quantity
+        if self.quantity <= 0:
+            raise ValueError(f"Menge muss positiv sein: {self.quantity}")
+        return self.quantity if self.movement_type == "IN" else -self.quantity
 
 
 class WarehouseService:
-    """Service für Lagerverwaltung"""
+    """
+    Service für Lagerverwaltung
+
+    Threadsicher: ändernde Operationen sperren die betroffenen Produkte über
+    gestreifte Sperren (StripedLock). Prüfen und Buchen eines Bestands sind so
+    atomar, während Buchungen auf verschiedene Produkte parallel laufen.
+
+    Einziger Zustand ist das Repository: Buchungen laden eine Kopie, ändern sie
+    und speichern sie zurück. Auch den Lagerwert führt das Repository (im
+    Speicher nachgeführt bzw. per SQL summiert), deshalb liest der Service beim
+    Start keine Produkte und sieht Änderungen anderer Prozesse. check_invariants()
+    prüft das für Tests.
+
+    Gespeichert wird per Compare-and-Swap gegen Product.version. Ändert ein
+    anderer Prozess (z.B. auf derselben SQLite-Datei) ein Produkt zwischen
+    Laden und Speichern, wird die Buchung mit frischen Daten wiederholt.
 
-    def __init__(self, repository: RepositoryPort):
+    Mit einem MetricsRegistry werden Service- und Repository-Aufrufe gemessen
+    (siehe services.metrics und get_metrics()). Mit einer ReorderEngine werden
+    Nachbestellvorschläge bei jeder Buchung nachgeführt (get_reorder_suggestions()).
+    """
+
+    def __init__(
+        self,
+        repository: RepositoryPort,
+        id_generator: Optional[IdGenerator] = None,
+        lock_stripes: int = 64,
+        max_retries: int = 5,
+        retry_backoff: float = 0.001,
+        metrics: Optional[MetricsRegistry] = None,
+        reorder: Optional[ReorderEngine] = None,
+    ):
+        """
+        Args:
+            repository: Persistenz-Adapter
+            id_generator: Generator für Bewegungs-IDs (Standard: Snowflake-IDs)
+            lock_stripes: Anzahl Sperren, auf die die Produkte verteilt werden
+            max_retries: Wiederholungen einer Buchung bei Versionskonflikten
+            retry_backoff: Basis-Wartezeit in Sekunden vor einer Wiederholung
+            metrics: Messung einschalten (None = keine Messung, kein Mehraufwand)
+            reorder: Nachbestellvorschläge pflegen; wird beim Start aus den Produkten
+                und den Bewegungen ihres Zeitfensters aufgebaut
+        """
         self.repository = repository
-        self.warehouse = Warehouse("Hauptlager")
+        self.id_generator = id_generator or default_id_generator
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self._locks = StripedLock(lock_stripes)
+        self.reorder = reorder
+        if reorder is not None:
+            since = reorder.clock() - reorder.window
+            reorder.rebuild(repository.iter_products(), repository.movements_between(since))
+        self.metrics = metrics
+        if metrics is not None:
+            self._enable_metrics(metrics)
+
+    def _enable_metrics(self, metrics: MetricsRegistry) -> None:
+        """Repository umhüllen, eigene Methoden messen, Kennzahlen registrieren"""
+        cache_stats = getattr(self.repository, "stats", None)
+        if callable(cache_stats):
+            metrics.add_collector("cache", cache_stats)
+        # Größen am unverpackten Repository abfragen, sonst zählen sie als Aufrufe
+        metrics.add_collector("size", repository_sizes(self.repository))
+        self.repository = InstrumentedRepository(self.repository, metrics)
+        metrics.instrument(self, "service", _INSTRUMENTED_METHODS)
+
+    def get_metrics(self) -> Dict[str, Dict]:
+        """
+        Momentaufnahme der Messwerte
+
+        Returns:
+            Siehe MetricsRegistry.snapshot(); leer, wenn ohne Registry erzeugt
+        """
+        return self.metrics.snapshot() if self.metrics is not None else {}
+
+    def _new_movement_id(self) -> str:
+        """Bewegungs-ID erzeugen"""
+        return self.id_generator.new_id()
 
     def create_product(
         self,
@@ -23,6 +168,9 @@ class WarehouseService:
         price: float,
         category: str = "",
         initial_quantity: int = 0,
+        sku: str = "",
+        reorder_point: int = 0,
+        target_quantity: int = 0,
     ) -> Product:
         """Neues Produkt erstellen und speichern"""
         product = Product(
@@ -31,74 +179,410 @@ class WarehouseService:
             description=description,
             price=price,
             quantity=initial_quantity,
+            sku=sku,
             category=category,
+            reorder_point=reorder_point,
+            target_quantity=target_quantity,
         )
-        self.repository.save_product(product)
-        self.warehouse.add_product(product)
+        # Auch die SKU sperren, damit zwei Stationen sie nicht gleichzeitig vergeben
+        # (ohne SKU nicht, sonst würden alle Anlagen ohne SKU einander blockieren)
+        keys = (product_id, f"sku:{sku}") if sku else (product_id,)
+        with self._locks.hold(*keys):
+            if self.repository.load_product(product_id) is not None:
+                raise ValueError(f"Produkt mit ID {product_id} existiert bereits")
+            if sku and self.repository.find_by_sku(sku) is not None:
+                raise ValueError(f"SKU {sku} ist bereits vergeben")
+            try:
+                # Version 0 = "darf noch nicht existieren", auch über Prozessgrenzen
+                self.repository.save_product(product, expected_version=0)
+            except VersionConflictError:
+                raise ValueError(f"Produkt mit ID {product_id} existiert bereits") from None
+            self._reorder_changed([product])
         return product
 
+    def create_products(self, products: Iterable[Product]) -> Dict[int, str]:
+        """
+        Viele neue Produkte mit einem Sammel-Schreibzugriff anlegen (z.B. Katalogimport)
+
+        Es gelten dieselben Regeln wie bei create_product(); abgelehnte Produkte
+        verhindern nicht das Anlegen der übrigen.
+
+        Args:
+            products: bereits validierte Produkte
+
+        Returns:
+            Fehlermeldung je abgelehntem Produkt, nach Position in products
+            (leer, wenn alle angelegt wurden)
+        """
+        products = list(products)
+        keys = [p.id for p in products] + [f"sku:{p.sku}" for p in products if p.sku]
+        with self._locks.hold_all(keys):
+            return self._with_retries(self._create_batch, products)
+
+    def _create_batch(self, products: List[Product]) -> Dict[int, str]:
+        """Ein Versuch von create_products()"""
+        existing = self.repository.load_products(p.id for p in products)
+        rejected: Dict[int, str] = {}
+        accepted: Dict[str, Product] = {}
+        skus = set()
+        for index, product in enumerate(products):
+            if product.id in existing or product.id in accepted:
+                rejected[index] = f"Produkt mit ID {product.id} existiert bereits"
+            elif product.sku and (
+                product.sku in skus or self.repository.find_by_sku(product.sku) is not None
+            ):
+                rejected[index] = f"SKU {product.sku} ist bereits vergeben"
+            else:
+                accepted[product.id] = product
+                if product.sku:
+                    skus.add(product.sku)
+        # Version 0 = "darf noch nicht existieren"; legt ein anderer Prozess eines der
+        # Produkte parallel an, wird der ganze Batch mit frischen Daten wiederholt
+        self.repository.save_products(accepted.values(), dict.fromkeys(accepted, 0))
+        self._reorder_changed(accepted.values())
+        return rejected
+
     def add_to_stock(
         self, product_id: str, quantity: int, reason: str = "", user: str = "system"
-    ) -> None:
-        """Bestand erhöhen"""
+    ) -> Movement:
+        """Bestand erhöhen und die gebuchte Bewegung zurückgeben"""
+        with self._locks.hold(product_id):
+            return self._with_retries(self._book, product_id, quantity, "IN", reason, user)
+
+    def remove_from_stock(
+        self, product_id: str, quantity: int, reason: str = "", user: str = "system"
+    ) -> Movement:
+        """Bestand verringern und die gebuchte Bewegung zurückgeben"""
+        # Prüfen und Abbuchen unter derselben Sperre, sonst droht Überverkauf
+        with self._locks.hold(product_id):
+            return self._with_retries(self._book, product_id, -quantity, "OUT", reason, user)
+
+    def _with_retries(self, operation: Callable[..., T], *args) -> T:
+        """
+        Operation bei Versionskonflikten mit frisch geladenen Daten wiederholen
+
+        Konflikte entstehen, wenn ein anderer Prozess oder Client dasselbe
+        Produkt zwischen Laden und Speichern geändert hat. Zwischen den
+        Versuchen wird kurz und zufällig gewartet (exponentieller Backoff).
+
+        Raises:
+            VersionConflictError: wenn auch der letzte Versuch kollidiert
+        """
+        attempt = 0
+        while True:
+            try:
+                return operation(*args)
+            except VersionConflictError:
+                if attempt >= self.max_retries:
+                    raise
+                time.sleep(random.uniform(0, self.retry_backoff * 2**attempt))
+                attempt += 1
+
+    def _book(
+        self, product_id: str, change: int, movement_type: str, reason: str, user: str
+    ) -> Movement:
+        """Ein Versuch: laden, prüfen, Bewegung bilden, per Compare-and-Swap speichern"""
         product = self.repository.load_product(product_id)
         if not product:
             raise ValueError(f"Produkt {product_id} nicht gefunden")
 
-        product.update_quantity(quantity)
-        self.repository.save_product(product)
+        if product.quantity < -change:
+            raise ValueError(
+                f"Unzureichender Bestand. Verfügbar: {product.quantity}, Angefordert: {-change}"
+            )
 
+        product.update_quantity(change)
+        # Bewegung samt ID vor dem Speichern bilden, damit kein Fehler zwischen
+        # Bestandsänderung und Bewegung liegen kann
         movement = Movement(
-            id=f"mov_{datetime.now().timestamp()}",
+            id=self._new_movement_id(),
             product_id=product_id,
             product_name=product.name,
-            quantity_change=quantity,
-            movement_type="IN",
+            quantity_change=change,
+            movement_type=movement_type,
             reason=reason,
             performed_by=user,
         )
+        self.repository.save_product(product, expected_version=product.version)
         self.repository.save_movement(movement)
+        self._reorder_changed([product], [movement])
+        return movement
 
-    def remove_from_stock(
-        self, product_id: str, quantity: int, reason: str = "", user: str = "system"
+    def _reorder_changed(
+        self, products: Iterable[Product], movements: Iterable[Movement] = ()
     ) -> None:
-        """Bestand verringern"""
+        """Gespeicherte Produkte und Bewegungen an die ReorderEngine melden (falls vorhanden)"""
+        if self.reorder is None:
+            return
+        for movement in movements:
+            self.reorder.record(movement)
+        for product in products:
+            self.reorder.update(product)
+
+    def apply_movements(self, batch: Iterable[MovementLine]) -> List[Movement]:
+        """
+        Mehrere Lagerbewegungen in einem Durchlauf buchen
+
+        Alle Zeilen werden zuerst gegen den laufenden Bestand je Produkt geprüft;
+        erst wenn der ganze Batch gültig ist, werden die Produkte und Bewegungen
+        gesammelt über save_products()/save_movements() gespeichert.
+
+        Args:
+            batch: Bewegungszeilen in Buchungsreihenfolge
+
+        Returns:
+            Die gespeicherten Bewegungen
+
+        Raises:
+            ValueError: wenn eine Zeile ungültig ist oder der Bestand nicht reicht;
+                in diesem Fall wird nichts gespeichert
+        """
+        lines = list(batch)
+        product_ids = {line.product_id for line in lines}
+        with self._locks.hold_all(product_ids):
+            return self._with_retries(self._apply_batch, lines, product_ids)
+
+    def _apply_batch(self, lines: List[MovementLine], product_ids: set) -> List[Movement]:
+        """Ein Versuch von apply_movements() mit frisch geladenen Produkten"""
+        products = self.repository.load_products(product_ids)
+
+        balances: Dict[str, int] = {}
+        changes: List[int] = []
+        for index, line in enumerate(lines):
+            product = products.get(line.product_id)
+            if product is None:
+                raise ValueError(f"Zeile {index + 1}: Produkt {line.product_id} nicht gefunden")
+            change = line.quantity_change()
+            balance = balances.get(line.product_id, product.quantity) + change
+            if balance < 0:
+                raise ValueError(
+                    f"Zeile {index + 1}: Unzureichender Bestand für {line.product_id}. "
+                    f"Verfügbar: {balance - change}, Angefordert: {-change}"
+                )
+            balances[line.product_id] = balance
+            changes.append(change)
+
+        expected_versions = {}
+        for product_id, balance in balances.items():
+            product = products[product_id]
+            expected_versions[product_id] = product.version
+            product.update_quantity(balance - product.quantity)
+
+        movements = [
+            Movement(
+                id=self._new_movement_id(),
+                product_id=line.product_id,
+                product_name=products[line.product_id].name,
+                quantity_change=change,
+                movement_type=line.movement_type,
+                reason=line.reason,
+                performed_by=line.user,
+            )
+            for line, change in zip(lines, changes)
+        ]
+        self.repository.save_products(
+            (products[product_id] for product_id in balances), expected_versions
+        )
+        self.repository.save_movements(movements)
+        self._reorder_changed((products[product_id] for product_id in balances), movements)
+        return movements
+
+    def update_price(self, product_id: str, price: float) -> Product:
+        """Preis eines Produkts ändern"""
+        with self._locks.hold(product_id):
+            return self._with_retries(self._set_price, product_id, price)
+
+    def _set_price(self, product_id: str, price: float) -> Product:
         product = self.repository.load_product(product_id)
         if not product:
             raise ValueError(f"Produkt {product_id} nicht gefunden")
 
-        if product.quantity < quantity:
-            raise ValueError(
-                f"Unzureichender Bestand. Verfügbar: {product.quantity}, Angefordert: {quantity}"
+        product.set_price(price)
+        self.repository.save_product(product, expected_version=product.version)
+        return product
+
+    def set_reorder_levels(
+        self, product_id: str, reorder_point: int, target_quantity: int = 0
+    ) -> Product:
+        """
+        Melde- und Zielbestand eines Produkts setzen (0 = keine Nachbestellung planen)
+
+        Raises:
+            ValueError: bei unbekanntem Produkt oder ungültigen Werten
+        """
+        with self._locks.hold(product_id):
+            return self._with_retries(
+                self._set_reorder_levels, product_id, reorder_point, target_quantity
             )
 
-        product.update_quantity(-quantity)
-        self.repository.save_product(product)
+    def _set_reorder_levels(
+        self, product_id: str, reorder_point: int, target_quantity: int
+    ) -> Product:
+        product = self.repository.load_product(product_id)
+        if not product:
+            raise ValueError(f"Produkt {product_id} nicht gefunden")
+
+        product.set_reorder_levels(reorder_point, target_quantity)
+        self.repository.save_product(product, expected_version=product.version)
+        self._reorder_changed([product])
+        return product
 
-        movement = Movement(
-            id=f"mov_{datetime.now().timestamp()}",
-            product_id=product_id,
-            product_name=product.name,
-            quantity_change=-quantity,
-            movement_type="OUT",
-            reason=reason,
-            performed_by=user,
-        )
-        self.repository.save_movement(movement)
+    def delete_product(self, product_id: str) -> None:
+        """Produkt löschen (Bewegungsprotokoll bleibt erhalten)"""
+        with self._locks.hold(product_id):
+            product = self.repository.load_product(product_id)
+            if not product:
+                raise ValueError(f"Produkt {product_id} nicht gefunden")
+
+            self.repository.delete_product(product_id)
+            if self.reorder is not None:
+                self.reorder.remove(product_id)
 
     def get_product(self, product_id: str) -> Optional[Product]:
         """Produkt abrufen"""
         return self.repository.load_product(product_id)
 
+    def find_by_sku(self, sku: str) -> Optional[Product]:
+        """Produkt über die SKU (z.B. gescannten Barcode) finden"""
+        return self.repository.find_by_sku(sku)
+
+    def get_products_by_category(self, category: str) -> List[Product]:
+        """Alle Produkte einer Kategorie abrufen"""
+        return self.repository.list_by_category(category)
+
+    def get_low_stock_products(self, threshold: int) -> List[Product]:
+        """Produkte mit Bestand unter threshold, niedrigster Bestand zuerst"""
+        return self.repository.list_below_threshold(threshold)
+
     def get_all_products(self) -> Dict[str, Product]:
         """Alle Produkte abrufen"""
         return self.repository.load_all_products()
 
+    def get_products_page(
+        self, after: Optional[tuple] = None, limit: int = 500, order_by: str = "id"
+    ) -> Page[Product]:
+        """
+        Produkte seitenweise abrufen
+
+        Args:
+            after: next_cursor der vorherigen Seite (None = erste Seite)
+            limit: Zeilen pro Seite
+            order_by: "id" oder "category"
+        """
+        return self.repository.list_products_page(after=after, limit=limit, order_by=order_by)
+
+    def iter_products(self, page_size: int = 500) -> Iterator[Product]:
+        """Alle Produkte nach ID sortiert seitenweise streamen"""
+        cursor = None
+        while True:
+            page = self.repository.list_products_page(after=cursor, limit=page_size)
+            yield from page.items
+            if not page.has_more:
+                return
+            cursor = page.next_cursor
+
     def get_movements(self) -> List[Movement]:
         """Alle Lagerbewegungen abrufen"""
         return self.repository.load_movements()
 
+    def iter_movements(self, page_size: int = 500) -> Iterator[Movement]:
+        """Alle Lagerbewegungen zeitlich sortiert seitenweise streamen"""
+        cursor = None
+        while True:
+            page = self.repository.list_movements_page(after=cursor, limit=page_size)
+            yield from page.items
+            if not page.has_more:
+                return
+            cursor = page.next_cursor
+
+    def get_movements_page(self, after: Optional[tuple] = None, limit: int = 500) -> Page[Movement]:
+        """Lagerbewegungen seitenweise in zeitlicher Reihenfolge abrufen"""
+        return self.repository.list_movements_page(after=after, limit=limit)
+
+    def get_movements_between(
+        self, since: Optional[datetime] = None, until: Optional[datetime] = None
+    ) -> List[Movement]:
+        """Lagerbewegungen im Zeitraum [since, until) zeitlich sortiert abrufen"""
+        return self.repository.movements_between(since, until)
+
+    def get_product_history(
+        self,
+        product_id: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> List[Movement]:
+        """Lagerbewegungen eines Produkts im Zeitraum [since, until) abrufen"""
+        return self.repository.movements_for_product(product_id, since, until)
+
     def get_total_inventory_value(self) -> float:
-        """Gesamtwert des Lagerbestands berechnen"""
-        products = self.repository.load_all_products()
-        return sum(p.get_total_value() for p in products.values())
+        """Gesamtwert des Lagerbestands (aus den Kategoriewerten des Repositories)"""
+        return math.fsum(self.repository.inventory_value_by_category().values())
+
+    def get_category_values(self) -> Dict[str, float]:
+        """Lagerwert je Kategorie (vom Repository nachgeführt bzw. berechnet)"""
+        return self.repository.inventory_value_by_category()
+
+    def get_reorder_suggestions(self, limit: int = 10) -> List[ReorderSuggestion]:
+        """
+        Dringendste Nachbestellungen (Bestand am oder unter dem Meldebestand)
+
+        Returns:
+            Bis zu limit Vorschläge nach Reichweite in Tagen aufsteigend (siehe
+            ReorderEngine.top); leer, wenn ohne ReorderEngine erzeugt
+        """
+        return self.reorder.top(limit) if self.reorder is not None else []
+
+    def check_inventory_value(self, repair: bool = False) -> bool:
+        """
+        Lagerwert des Repositories gegen eine Neuberechnung aus den Produkten prüfen
+
+        Nur aussagekräftig, solange keine Buchungen parallel laufen.
+
+        Args:
+            repair: bei Abweichung den nachgeführten Wert im Repository neu aufbauen
+
+        Returns:
+            True, wenn der Wert des Repositories stimmte
+        """
+        fresh = InventoryValue(self.repository.iter_products())
+        consistent = fresh.matches(self.repository.inventory_value_by_category())
+        if not consistent and repair:
+            self.repository.rebuild_inventory_value()
+        return consistent
+
+    def check_invariants(self) -> List[str]:
+        """
+        Zustand von Service und Repository prüfen (für Tests, ohne parallele Buchungen)
+
+        Geprüft werden gültige Produkte (Bestand, Preis, Version), eindeutige und
+        auffindbare SKUs, der Lagerwert des Repositories und - falls das Repository
+        check_invariants() anbietet - dessen Indizes.
+
+        Returns:
+            Beschreibung jeder Verletzung (leer = konsistent)
+        """
+        problems = []
+        owners: Dict[str, str] = {}
+        for product in self.repository.iter_products():
+            if product.quantity < 0:
+                problems.append(f"Produkt {product.id}: negativer Bestand {product.quantity}")
+            if product.price < 0:
+                problems.append(f"Produkt {product.id}: negativer Preis {product.price}")
+            if product.version < 1:
+                problems.append(f"Produkt {product.id}: ungültige Version {product.version}")
+            if not product.sku:
+                continue
+            if product.sku in owners:
+                problems.append(
+                    f"SKU {product.sku} doppelt vergeben ({owners[product.sku]}, {product.id})"
+                )
+            owners[product.sku] = product.id
+            found = self.repository.find_by_sku(product.sku)
+            if found is None or found.id != product.id:
+                problems.append(f"SKU {product.sku} führt nicht zu Produkt {product.id}")
+        if not self.check_inventory_value():
+            problems.append("Lagerwert des Repositories weicht von der Neuberechnung ab")
+        check_repository = getattr(self.repository, "check_invariants", None)
+        if callable(check_repository):
+            problems.extend(check_repository())
+        return problems
@@ -0,0 +1,264 @@
+"""
+Async Service - WarehouseService für asyncio (z.B. hinter einem Netzwerkdienst)
+
+Gleiche Regeln wie WarehouseService: Produkte werden über gestreifte Sperren
+(AsyncStripedLock) serialisiert, gespeichert wird per Compare-and-Swap, bei
+Versionskonflikten wird mit frischen Daten wiederholt.
+
+Zugänge (add_to_stock) werden gebündelt: alle Aufrufe, die in derselben
+Runde der Ereignisschleife eintreffen, werden gemeinsam in einem
+save_changes() gebucht - ein Speicherzugriff statt vieler, wenn tausende
+Scanner gleichzeitig buchen.
+"""
+
+import asyncio
+import random
+from datetime import datetime
+from typing import Awaitable, Callable, List, Optional, Set, Tuple, TypeVar
+
+from ..domain.ids import IdGenerator, default_id_generator
+from ..domain.product import Product
+from ..domain.warehouse import Movement
+from ..ports import AsyncRepositoryPort, Page, VersionConflictError
+from . import MovementLine
+from .locking import AsyncStripedLock
+
+T = TypeVar("T")
+
+
+class AsyncWarehouseService:
+    """
+    Asynchroner Service für Lagerverwaltung
+
+    Einen laufenden Lagerwert wie WarehouseService führt dieser Service nicht,
+    da er beim Start alle Produkte laden müsste.
+    """
+
+    def __init__(
+        self,
+        repository: AsyncRepositoryPort,
+        id_generator: Optional[IdGenerator] = None,
+        lock_stripes: int = 64,
+        max_retries: int = 5,
+        retry_backoff: float = 0.001,
+    ):
+        """
+        Args:
+            repository: asynchroner Persistenz-Adapter
+            id_generator: Generator für Bewegungs-IDs (Standard: Snowflake-IDs)
+            lock_stripes: Anzahl Sperren, auf die die Produkte verteilt werden
+            max_retries: Wiederholungen einer Buchung bei Versionskonflikten
+            retry_backoff: Basis-Wartezeit in Sekunden vor einer Wiederholung
+        """
+        self.repository = repository
+        self.id_generator = id_generator or default_id_generator
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self._locks = AsyncStripedLock(lock_stripes)
+        # Zugänge der laufenden Runde, die gemeinsam gebucht werden
+        self._incoming: List[Tuple[MovementLine, asyncio.Future]] = []
+        self._flushes: Set[asyncio.Task] = set()
+
+    def _new_movement(self, product: Product, change: int, line: MovementLine) -> Movement:
+        return Movement(
+            id=self.id_generator.new_id(),
+            product_id=product.id,
+            product_name=product.name,
+            quantity_change=change,
+            movement_type=line.movement_type,
+            reason=line.reason,
+            performed_by=line.user,
+        )
+
+    async def create_product(
+        self,
+        product_id: str,
+        name: str,
+        description: str,
+        price: float,
+        category: str = "",
+        initial_quantity: int = 0,
+        sku: str = "",
+    ) -> Product:
+        """Neues Produkt erstellen und speichern"""
+        product = Product(
+            id=product_id,
+            name=name,
+            description=description,
+            price=price,
+            quantity=initial_quantity,
+            sku=sku,
+            category=category,
+        )
+        keys = (product_id, f"sku:{sku}") if sku else (product_id,)
+        async with self._locks.hold(*keys):
+            if sku and await self.repository.find_by_sku(sku) is not None:
+                raise ValueError(f"SKU {sku} ist bereits vergeben")
+            try:
+                await self.repository.save_product(product, expected_version=0)
+            except VersionConflictError:
+                raise ValueError(f"Produkt mit ID {product_id} existiert bereits") from None
+        return product
+
+    async def add_to_stock(
+        self, product_id: str, quantity: int, reason: str = "", user: str = "system"
+    ) -> Movement:
+        """
+        Bestand erhöhen und die gebuchte Bewegung zurückgeben
+
+        Der Aufruf wird mit allen anderen Zugängen derselben Runde der
+        Ereignisschleife gebündelt gebucht.
+
+        Raises:
+            ValueError: bei ungültiger Menge oder unbekanntem Produkt
+        """
+        line = MovementLine(product_id, quantity, "IN", reason, user)
+        line.quantity_change()
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[Movement]" = loop.create_future()
+        if not self._incoming:
+            loop.call_soon(self._start_flush)
+        self._incoming.append((line, future))
+        return await future
+
+    def _start_flush(self) -> None:
+        batch, self._incoming = self._incoming, []
+        task = asyncio.get_running_loop().create_task(self._flush(batch))
+        # Referenz halten, sonst kann der Task vorzeitig eingesammelt werden
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: List[Tuple[MovementLine, asyncio.Future]]) -> None:
+        """Gesammelte Zugänge buchen und die Ergebnisse an die wartenden Aufrufer verteilen"""
+        batch = [(line, future) for line, future in batch if not future.cancelled()]
+        if not batch:
+            return
+        product_ids = {line.product_id for line, _ in batch}
+        try:
+            async with self._locks.hold_all(product_ids):
+                results = await self._with_retries(self._book_incoming, batch, product_ids)
+        except Exception as error:
+            results = [error] * len(batch)
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    async def _book_incoming(
+        self, batch: List[Tuple[MovementLine, asyncio.Future]], product_ids: Set[str]
+    ) -> list:
+        """Ein Versuch: alle Zugänge eines Batches mit einem save_changes() buchen"""
+        products = await self.repository.load_products(product_ids)
+        expected_versions = {product_id: p.version for product_id, p in products.items()}
+        results: list = []
+        movements = []
+        for line, _ in batch:
+            product = products.get(line.product_id)
+            if product is None:
+                # Nur dieser Aufruf scheitert, die übrigen werden gebucht
+                results.append(ValueError(f"Produkt {line.product_id} nicht gefunden"))
+                continue
+            product.update_quantity(line.quantity)
+            movement = self._new_movement(product, line.quantity, line)
+            movements.append(movement)
+            results.append(movement)
+        await self.repository.save_changes(products.values(), movements, expected_versions)
+        return results
+
+    async def remove_from_stock(
+        self, product_id: str, quantity: int, reason: str = "", user: str = "system"
+    ) -> Movement:
+        """
+        Bestand verringern und die gebuchte Bewegung zurückgeben
+
+        Raises:
+            ValueError: bei ungültiger Menge, unbekanntem Produkt oder zu geringem Bestand
+        """
+        line = MovementLine(product_id, quantity, "OUT", reason, user)
+        change = line.quantity_change()
+        async with self._locks.hold(product_id):
+            return await self._with_retries(self._book, line, change)
+
+    async def _book(self, line: MovementLine, change: int) -> Movement:
+        """Ein Versuch: laden, prüfen, per Compare-and-Swap speichern"""
+        product = await self.repository.load_product(line.product_id)
+        if not product:
+            raise ValueError(f"Produkt {line.product_id} nicht gefunden")
+        if product.quantity < -change:
+            raise ValueError(
+                f"Unzureichender Bestand. Verfügbar: {product.quantity}, Angefordert: {-change}"
+            )
+        expected_version = product.version
+        product.update_quantity(change)
+        movement = self._new_movement(product, change, line)
+        await self.repository.save_changes([product], [movement], {product.id: expected_version})
+        return movement
+
+    async def _with_retries(self, operation: Callable[..., Awaitable[T]], *args) -> T:
+        """
+        Operation bei Versionskonflikten mit frisch geladenen Daten wiederholen
+
+        Raises:
+            VersionConflictError: wenn auch der letzte Versuch kollidiert
+        """
+        attempt = 0
+        while True:
+            try:
+                return await operation(*args)
+            except VersionConflictError:
+                if attempt >= self.max_retries:
+                    raise
+                await asyncio.sleep(random.uniform(0, self.retry_backoff * 2**attempt))
+                attempt += 1
+
+    async def update_price(self, product_id: str, price: float) -> Product:
+        """Preis eines Produkts ändern"""
+        async with self._locks.hold(product_id):
+            return await self._with_retries(self._set_price, product_id, price)
+
+    async def _set_price(self, product_id: str, price: float) -> Product:
+        product = await self.repository.load_product(product_id)
+        if not product:
+            raise ValueError(f"Produkt {product_id} nicht gefunden")
+        product.set_price(price)
+        await self.repository.save_product(product, expected_version=product.version)
+        return product
+
+    async def delete_product(self, product_id: str) -> None:
+        """Produkt löschen (Bewegungsprotokoll bleibt erhalten)"""
+        async with self._locks.hold(product_id):
+            if await self.repository.load_product(product_id) is None:
+                raise ValueError(f"Produkt {product_id} nicht gefunden")
+            await self.repository.delete_product(product_id)
+
+    async def get_product(self, product_id: str) -> Optional[Product]:
+        """Produkt abrufen"""
+        return await self.repository.load_product(product_id)
+
+    async def find_by_sku(self, sku: str) -> Optional[Product]:
+        """Produkt über die SKU (z.B. gescannten Barcode) finden"""
+        return await self.repository.find_by_sku(sku)
+
+    async def get_products_page(
+        self, after: Optional[tuple] = None, limit: int = 500, order_by: str = "id"
+    ) -> Page[Product]:
+        """Produkte seitenweise abrufen (siehe WarehouseService.get_products_page)"""
+        return await self.repository.list_products_page(after=after, limit=limit, order_by=order_by)
+
+    async def get_movements_page(
+        self, after: Optional[tuple] = None, limit: int = 500
+    ) -> Page[Movement]:
+        """Lagerbewegungen seitenweise in zeitlicher Reihenfolge abrufen"""
+        return await self.repository.list_movements_page(after=after, limit=limit)
+
+    async def get_product_history(
+        self,
+        product_id: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> List[Movement]:
+        """Lagerbewegungen eines Produkts im Zeitraum [since, until) abrufen"""
+        return await self.repository.movements_for_product(product_id, since, until)
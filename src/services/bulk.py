@@ -0,0 +1,304 @@
+"""
+Bulk - streamender Import und Export von Produktkatalogen (CSV und JSON Lines)
+
+Der Import liest die Datei zeilenweise, wandelt sie blockweise (chunk_size
+Zeilen) in Produkte um und legt jeden Block mit einem Sammel-Schreibzugriff
+an (WarehouseService.create_products). Fehlerhafte Zeilen werden mit
+Zeilennummer gemeldet, brechen den Import aber nicht ab. Im Speicher liegen
+nur wenige Blöcke zugleich, unabhängig von der Dateigröße.
+
+Das Umwandeln und Prüfen der Zeilen kann auf einen Prozess-Pool verteilt
+werden (processes > 0); Lesen und Schreiben bleiben im aufrufenden Prozess.
+
+Spalten bzw. Schlüssel: id, name, description, price, quantity, sku,
+category, notes, reorder_point, target_quantity. Pflicht sind id, name und
+price; weitere Spalten werden ignoriert. Der Export schreibt dieselben
+Spalten, seine Dateien lassen sich also wieder importieren.
+"""
+
+import csv
+import json
+import math
+from collections import deque
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from ..domain.product import Product
+from . import WarehouseService
+
+PRODUCT_FIELDS = (
+    "id",
+    "name",
+    "description",
+    "price",
+    "quantity",
+    "sku",
+    "category",
+    "notes",
+    "reorder_point",
+    "target_quantity",
+)
+REQUIRED_FIELDS = ("id", "name", "price")
+FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+
+@dataclass
+class RowError:
+    """Eine abgelehnte Zeile der Importdatei"""
+
+    line: int
+    message: str
+
+
+@dataclass
+class ImportResult:
+    """
+    Ergebnis eines Imports
+
+    Attributes:
+        imported: Anzahl angelegter Produkte
+        rejected: Anzahl abgelehnter Zeilen
+        errors: die ersten max_errors abgelehnten Zeilen (begrenzt den Speicherbedarf)
+    """
+
+    imported: int = 0
+    rejected: int = 0
+    errors: List[RowError] = field(default_factory=list)
+    max_errors: int = 1000
+
+    def add_error(self, error: RowError) -> None:
+        self.rejected += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append(error)
+
+
+def format_of(path: str) -> str:
+    """
+    Dateiformat aus der Endung bestimmen
+
+    Raises:
+        ValueError: bei unbekannter Endung
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix not in FORMATS:
+        raise ValueError(f"Unbekanntes Dateiformat: {suffix or path} (erwartet .csv oder .jsonl)")
+    return FORMATS[suffix]
+
+
+def _integer(value: Any, name: str) -> int:
+    if isinstance(value, str):
+        value = value.strip()
+        if not value:
+            return 0
+        try:
+            return int(value)
+        except ValueError:
+            raise ValueError(f"{name} ist keine ganze Zahl: {value!r}") from None
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"{name} ist keine ganze Zahl: {value!r}")
+    if isinstance(value, float) and not value.is_integer():
+        raise ValueError(f"{name} ist keine ganze Zahl: {value!r}")
+    return int(value)
+
+
+def _number(value: Any, name: str) -> float:
+    if isinstance(value, bool):
+        raise ValueError(f"{name} ist keine Zahl: {value!r}")
+    try:
+        number = float(value.strip() if isinstance(value, str) else value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} ist keine Zahl: {value!r}") from None
+    if not math.isfinite(number):
+        raise ValueError(f"{name} muss endlich sein: {value!r}")
+    return number
+
+
+def _text(value: Any) -> str:
+    return "" if value is None else str(value).strip()
+
+
+def product_from_record(record: Dict[str, Any]) -> Product:
+    """
+    Produkt aus einer Zeile (CSV-Zeile oder JSON-Objekt) bauen
+
+    Die fachliche Prüfung übernimmt Product.__post_init__, wie beim Anlegen
+    über den Dialog.
+
+    Raises:
+        ValueError: bei fehlenden Pflichtfeldern, falschen Typen oder ungültigen Werten
+    """
+    missing = [name for name in REQUIRED_FIELDS if record.get(name) in (None, "")]
+    if missing:
+        raise ValueError(f"Pflichtfeld fehlt: {', '.join(missing)}")
+    notes = _text(record.get("notes"))
+    return Product(
+        id=_text(record["id"]),
+        name=_text(record["name"]),
+        description=_text(record.get("description")),
+        price=_number(record["price"], "price"),
+        quantity=_integer(record.get("quantity", 0), "quantity"),
+        sku=_text(record.get("sku")),
+        category=_text(record.get("category")),
+        notes=notes or None,
+        reorder_point=_integer(record.get("reorder_point", 0), "reorder_point"),
+        target_quantity=_integer(record.get("target_quantity", 0), "target_quantity"),
+    )
+
+
+def iter_records(stream: TextIO, file_format: str) -> Iterator[Tuple[int, Any]]:
+    """
+    Rohzeilen mit Zeilennummer lesen
+
+    CSV-Zeilen kommen als Dictionary, JSONL-Zeilen als unverarbeiteter Text
+    (das Parsen übernimmt _parse_chunk, ggf. in einem anderen Prozess).
+    """
+    if file_format == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+    elif file_format == "jsonl":
+        for number, line in enumerate(stream, start=1):
+            if line.strip():
+                yield number, line
+    else:
+        raise ValueError(f"Unbekanntes Dateiformat: {file_format}")
+
+
+def _parse_chunk(chunk: List[Tuple[int, Any]]) -> Tuple[List[Tuple[int, Product]], List[RowError]]:
+    """Einen Block Rohzeilen in Produkte und Fehler aufteilen (muss picklebar sein)"""
+    products = []
+    errors = []
+    for line, record in chunk:
+        try:
+            if isinstance(record, str):
+                record = json.loads(record)
+                if not isinstance(record, dict):
+                    raise ValueError("Zeile ist kein JSON-Objekt")
+            products.append((line, product_from_record(record)))
+        except ValueError as error:  # json.JSONDecodeError ist ein ValueError
+            errors.append(RowError(line, str(error)))
+    return products, errors
+
+
+def _chunks(records: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(records)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _parse_chunks(chunks: Iterable[list], processes: int) -> Iterator[tuple]:
+    """Blöcke in Dateireihenfolge parsen; mit Pool höchstens 2 Blöcke je Prozess in Arbeit"""
+    if processes <= 0:
+        yield from map(_parse_chunk, chunks)
+        return
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(processes) as pool:
+        pending: deque = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_parse_chunk, chunk))
+            if len(pending) >= 2 * processes:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def import_products(
+    service: WarehouseService,
+    stream: TextIO,
+    file_format: str = "csv",
+    chunk_size: int = 5000,
+    processes: int = 0,
+    max_errors: int = 1000,
+) -> ImportResult:
+    """
+    Produktkatalog streamend importieren
+
+    Args:
+        service: Ziel der Produkte
+        stream: geöffnete Textdatei
+        file_format: "csv" oder "jsonl"
+        chunk_size: Zeilen pro Block (und pro Schreibzugriff)
+        processes: Prozesse zum Parsen (0 = im aufrufenden Prozess)
+        max_errors: maximale Anzahl gesammelter Zeilenfehler
+
+    Returns:
+        ImportResult mit Zählern und den ersten abgelehnten Zeilen
+
+    Raises:
+        ValueError: bei unbekanntem Format oder chunk_size < 1
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size muss positiv sein: {chunk_size}")
+    result = ImportResult(max_errors=max_errors)
+    chunks = _chunks(iter_records(stream, file_format), chunk_size)
+    for parsed, errors in _parse_chunks(chunks, processes):
+        rejected = service.create_products(product for _, product in parsed)
+        errors += [RowError(parsed[index][0], message) for index, message in rejected.items()]
+        for error in sorted(errors, key=lambda error: error.line):
+            result.add_error(error)
+        result.imported += len(parsed) - len(rejected)
+    return result
+
+
+def _export_record(product: Product) -> Dict[str, Any]:
+    return {
+        "id": product.id,
+        "name": product.name,
+        "description": product.description,
+        "price": product.price,
+        "quantity": product.quantity,
+        "sku": product.sku,
+        "category": product.category,
+        "notes": product.notes,
+        "reorder_point": product.reorder_point,
+        "target_quantity": product.target_quantity,
+    }
+
+
+def export_products(
+    service: WarehouseService, sink: TextIO, file_format: str = "csv", page_size: int = 1000
+) -> int:
+    """
+    Alle Produkte seitenweise in sink schreiben (konstanter Speicherbedarf)
+
+    Returns:
+        Anzahl exportierter Produkte
+
+    Raises:
+        ValueError: bei unbekanntem Format
+    """
+    if file_format not in ("csv", "jsonl"):
+        raise ValueError(f"Unbekanntes Dateiformat: {file_format}")
+    count = 0
+    if file_format == "csv":
+        writer = csv.writer(sink)
+        writer.writerow(PRODUCT_FIELDS)
+        for product in service.iter_products(page_size):
+            record = _export_record(product)
+            writer.writerow("" if record[name] is None else record[name] for name in PRODUCT_FIELDS)
+            count += 1
+    else:
+        for product in service.iter_products(page_size):
+            sink.write(json.dumps(_export_record(product), ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+
+def import_file(
+    service: WarehouseService, path: str, file_format: Optional[str] = None, **options
+) -> ImportResult:
+    """Datei importieren; Format aus der Endung, falls nicht angegeben (siehe import_products)"""
+    with open(path, newline="", encoding="utf-8") as stream:
+        return import_products(service, stream, file_format or format_of(path), **options)
+
+
+def export_file(
+    service: WarehouseService, path: str, file_format: Optional[str] = None, **options
+) -> int:
+    """In eine Datei exportieren; Format aus der Endung, falls nicht angegeben"""
+    file_format = file_format or format_of(path)
+    with open(path, "w", newline="", encoding="utf-8") as sink:
+        return export_products(service, sink, file_format, **options)
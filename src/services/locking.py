@@ -0,0 +1,99 @@
+"""Locking - gestreifte Sperren für nebenläufige Buchungen je Produkt"""
+
+import threading
+import zlib
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncContextManager, AsyncIterator, Iterable, Iterator
+
+
+class StripedLock:
+    """
+    Feste Anzahl Sperren, auf die Schlüssel (z.B. Produkt-IDs) per Hash verteilt werden
+
+    Buchungen auf verschiedene Produkte laufen parallel, Buchungen auf dasselbe
+    Produkt nacheinander. Der Speicherbedarf hängt nur von der Anzahl Streifen
+    ab, nicht von der Anzahl Produkte. Mehrere Schlüssel werden immer in
+    aufsteigender Streifen-Reihenfolge gesperrt, damit keine Verklemmung
+    entstehen kann.
+    """
+
+    def __init__(self, stripes: int = 64):
+        """
+        Args:
+            stripes: Anzahl Sperren
+
+        Raises:
+            ValueError: wenn stripes < 1
+        """
+        if stripes < 1:
+            raise ValueError(f"stripes muss positiv sein: {stripes}")
+        self._locks = [threading.RLock() for _ in range(stripes)]
+
+    def stripe_of(self, key: str) -> int:
+        """Streifen eines Schlüssels (stabil über Prozesse, anders als hash())"""
+        return zlib.crc32(key.encode("utf-8")) % len(self._locks)
+
+    @contextmanager
+    def hold(self, *keys: str) -> Iterator[None]:
+        """Sperren aller Streifen der Schlüssel halten"""
+        with self.hold_all(keys):
+            yield
+
+    @contextmanager
+    def hold_all(self, keys: Iterable[str]) -> Iterator[None]:
+        """Sperren für beliebig viele Schlüssel halten (z.B. einen Bewegungs-Batch)"""
+        stripes = sorted({self.stripe_of(key) for key in keys})
+        acquired = []
+        try:
+            for stripe in stripes:
+                self._locks[stripe].acquire()
+                acquired.append(stripe)
+            yield
+        finally:
+            for stripe in reversed(acquired):
+                self._locks[stripe].release()
+
+
+class AsyncStripedLock:
+    """
+    Gegenstück zu StripedLock für Coroutinen (asyncio.Lock je Streifen)
+
+    Nicht reentrant: eine Coroutine darf einen Streifen nicht zweimal halten.
+    """
+
+    def __init__(self, stripes: int = 64):
+        """
+        Args:
+            stripes: Anzahl Sperren
+
+        Raises:
+            ValueError: wenn stripes < 1
+        """
+        if stripes < 1:
+            raise ValueError(f"stripes muss positiv sein: {stripes}")
+        # Erst hier laden: synchrone Nutzer (z.B. die Kommandozeile) sparen den Import
+        import asyncio
+
+        self._locks = [asyncio.Lock() for _ in range(stripes)]
+
+    def stripe_of(self, key: str) -> int:
+        """Streifen eines Schlüssels"""
+        return zlib.crc32(key.encode("utf-8")) % len(self._locks)
+
+    def hold(self, *keys: str) -> AsyncContextManager[None]:
+        """Sperren aller Streifen der Schlüssel halten"""
+        return self.hold_all(keys)
+
+    @asynccontextmanager
+    async def hold_all(self, keys: Iterable[str]) -> AsyncIterator[None]:
+        """Sperren für beliebig viele Schlüssel in aufsteigender Streifen-Reihenfolge halten"""
+        stripes = sorted({self.stripe_of(key) for key in keys})
+        acquired = []
+        try:
+            for stripe in stripes:
+                await self._locks[stripe].acquire()
+                acquired.append(stripe)
+            yield
+        finally:
+            for stripe in reversed(acquired):
+                self._locks[stripe].release()
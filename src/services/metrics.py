@@ -0,0 +1,373 @@
+"""
+Metrics - optionale Laufzeitmessung für Service und Repository
+
+Ein MetricsRegistry sammelt je (Komponente, Methode) Aufrufzahl, Fehler und
+ein Latenz-Histogramm, dazu Kennzahlen aus Sammelfunktionen (Cache-Zähler,
+Anzahl Produkte und Bewegungen). Eingeschaltet wird die Messung, indem man
+dem WarehouseService ein Registry übergibt: er misst dann seine öffentlichen
+Methoden und umhüllt das Repository mit InstrumentedRepository. Ohne
+Registry wird nichts umhüllt und es entsteht kein Mehraufwand.
+
+    metrics = MetricsRegistry()
+    service = WarehouseService(SqliteRepository("lager.db"), metrics=metrics)
+    ...
+    service.get_metrics()                          # Momentaufnahme als Dictionary
+    metrics.write_prometheus("/var/lib/node_exporter/lager.prom")
+
+Die Zeit einer Buchung (service.add_to_stock) abzüglich der Repository-Aufrufe
+(load_product, save_product, save_movement) ist die Zeit in Domäne und Sperren.
+"""
+
+import bisect
+import functools
+import os
+import threading
+import time
+from datetime import datetime
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+from ..domain.product import Product
+from ..domain.warehouse import Movement
+from ..ports import Page, RepositoryPort
+
+# Bucket-Grenzen in Sekunden: 1 µs bis ca. 16 s, Faktor √2 je Bucket
+BUCKET_BOUNDS = tuple(1e-6 * 2 ** (step / 2) for step in range(49))
+PERCENTILES = (0.5, 0.95, 0.99)
+
+T = TypeVar("T")
+
+
+class LatencyHistogram:
+    """
+    Latenz-Histogramm mit festen, logarithmisch verteilten Buckets
+
+    Speicher und Aufwand pro Messung sind unabhängig von der Anzahl Aufrufe.
+    Perzentile werden innerhalb des Buckets linear interpoliert (relativer
+    Fehler höchstens ca. 41 %, typisch deutlich weniger).
+    """
+
+    def __init__(self, bounds: Tuple[float, ...] = BUCKET_BOUNDS):
+        self.bounds = bounds
+        # Letzter Bucket nimmt alles über der größten Grenze auf
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float, failed: bool = False) -> None:
+        """Eine Messung eintragen"""
+        bucket = bisect.bisect_left(self.bounds, seconds)
+        with self._lock:
+            self.counts[bucket] += 1
+            self.count += 1
+            self.total += seconds
+            if failed:
+                self.errors += 1
+
+    def percentile(self, fraction: float) -> float:
+        """Geschätzte Latenz, unter der der Anteil fraction der Aufrufe liegt (0 ohne Daten)"""
+        with self._lock:
+            counts = list(self.counts)
+            count = self.count
+        if count == 0:
+            return 0.0
+        rank = fraction * count
+        seen = 0
+        for bucket, bucket_count in enumerate(counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = self.bounds[bucket - 1] if bucket > 0 else 0.0
+                upper = self.bounds[bucket] if bucket < len(self.bounds) else lower
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.bounds[-1]
+
+    def snapshot(self) -> Dict[str, float]:
+        """Aufrufe, Fehler, Summe und Perzentile (Sekunden)"""
+        result = {"count": self.count, "errors": self.errors, "sum": self.total}
+        for fraction in PERCENTILES:
+            result[f"p{round(fraction * 100)}"] = self.percentile(fraction)
+        return result
+
+
+class MetricsRegistry:
+    """
+    Sammelstelle für Latenz-Histogramme und Kennzahlen
+
+    Threadsicher; Histogramme werden beim ersten Zugriff angelegt.
+    """
+
+    def __init__(self, prefix: str = "lager", clock: Callable[[], float] = time.perf_counter):
+        """
+        Args:
+            prefix: Präfix der Prometheus-Metriknamen
+            clock: Zeitquelle in Sekunden (für Tests austauschbar)
+        """
+        self.prefix = prefix
+        self.clock = clock
+        self._histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._collectors: Dict[str, Callable[[], Mapping[str, float]]] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, component: str, method: str) -> LatencyHistogram:
+        """Histogramm für (Komponente, Methode), bei Bedarf neu angelegt"""
+        key = (component, method)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, LatencyHistogram())
+        return histogram
+
+    def timed(self, component: str, method: str, function: Callable) -> Callable:
+        """function so umhüllen, dass jeder Aufruf gemessen wird (auch bei Ausnahmen)"""
+        histogram = self.histogram(component, method)
+        clock = self.clock
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            failed = True
+            try:
+                result = function(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                histogram.observe(clock() - start, failed)
+
+        return wrapper
+
+    def instrument(self, target: object, component: str, methods: Sequence[str]) -> None:
+        """Methoden eines Objekts auf der Instanz durch gemessene Varianten ersetzen"""
+        for method in methods:
+            setattr(target, method, self.timed(component, method, getattr(target, method)))
+
+    def add_collector(self, name: str, collect: Callable[[], Mapping[str, float]]) -> None:
+        """
+        Sammelfunktion registrieren, die bei jeder Momentaufnahme Kennzahlen liefert
+
+        Args:
+            name: Gruppe, z.B. "cache" oder "size"
+            collect: liefert Kennzahl -> Wert
+        """
+        with self._lock:
+            self._collectors[name] = collect
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """
+        Momentaufnahme aller Metriken
+
+        Returns:
+            {"calls": {Komponente: {Methode: {count, errors, sum, p50, p95, p99}}},
+            sowie je Sammelfunktion {Name: {Kennzahl: Wert}}
+        """
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            collectors = list(self._collectors.items())
+        calls: Dict[str, Dict[str, Dict[str, float]]] = {}
+        for (component, method), histogram in histograms:
+            calls.setdefault(component, {})[method] = histogram.snapshot()
+        result: Dict[str, Dict] = {"calls": calls}
+        for name, collect in collectors:
+            result[name] = dict(collect())
+        return result
+
+    def to_prometheus(self) -> str:
+        """Alle Metriken im Prometheus-Textformat (Version 0.0.4)"""
+        name = f"{self.prefix}_call_duration_seconds"
+        lines = [
+            f"# HELP {name} Dauer der Aufrufe je Komponente und Methode",
+            f"# TYPE {name} histogram",
+        ]
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            collectors = list(self._collectors.items())
+        for (component, method), histogram in histograms:
+            with histogram._lock:
+                counts = list(histogram.counts)
+                count, total = histogram.count, histogram.total
+            labels = f'component="{component}",method="{method}"'
+            cumulative = 0
+            for bound, bucket_count in zip(histogram.bounds, counts):
+                cumulative += bucket_count
+                lines.append(f'{name}_bucket{{{labels},le="{bound:.6g}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f"{name}_sum{{{labels}}} {total!r}")
+            lines.append(f"{name}_count{{{labels}}} {count}")
+
+        errors = f"{self.prefix}_call_errors_total"
+        lines += [f"# HELP {errors} Aufrufe mit Ausnahme", f"# TYPE {errors} counter"]
+        for (component, method), histogram in histograms:
+            lines.append(
+                f'{errors}{{component="{component}",method="{method}"}} {histogram.errors}'
+            )
+
+        for group, collect in collectors:
+            for key, value in sorted(collect().items()):
+                if value is None:
+                    continue
+                metric = f"{self.prefix}_{group}_{key}"
+                lines += [f"# TYPE {metric} gauge", f"{metric} {value}"]
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        """
+        Metriken für den Textfile-Collector von node_exporter schreiben
+
+        Die Datei wird über eine temporäre Datei ersetzt, damit nie eine halb
+        geschriebene Datei gelesen wird.
+        """
+        temporary = f"{path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as sink:
+            sink.write(self.to_prometheus())
+        os.replace(temporary, path)
+
+
+class InstrumentedRepository(RepositoryPort):
+    """
+    Repository-Dekorator, der Aufrufzahl, Fehler und Latenz je Methode erfasst
+
+    Die Messwerte landen im Registry unter der Komponente "repository". Bei
+    iter_products() wird nur das Erzeugen des Iterators gemessen. Der
+    WarehouseService setzt den Dekorator selbst ein, wenn er ein Registry erhält.
+    """
+
+    def __init__(self, repository: RepositoryPort, metrics: MetricsRegistry):
+        """
+        Args:
+            repository: umhülltes Repository
+            metrics: Ziel der Messwerte
+        """
+        self.repository = repository
+        self.metrics = metrics
+        self._clock = metrics.clock
+
+    def __getattr__(self, name: str):
+        # Adapter-spezifisches (batch(), stats(), db_path ...) an das Repository weiterreichen
+        if name == "repository":
+            raise AttributeError(name)
+        return getattr(self.repository, name)
+
+    def _call(self, method: str, function: Callable[..., T], *args) -> T:
+        histogram = self.metrics.histogram("repository", method)
+        start = self._clock()
+        failed = True
+        try:
+            result = function(*args)
+            failed = False
+            return result
+        finally:
+            histogram.observe(self._clock() - start, failed)
+
+    def save_product(self, product: Product, expected_version: Optional[int] = None) -> None:
+        self._call("save_product", self.repository.save_product, product, expected_version)
+
+    def save_products(
+        self, products: Iterable[Product], expected_versions: Optional[Dict[str, int]] = None
+    ) -> None:
+        self._call("save_products", self.repository.save_products, products, expected_versions)
+
+    def load_product(self, product_id: str) -> Optional[Product]:
+        return self._call("load_product", self.repository.load_product, product_id)
+
+    def load_products(self, product_ids: Iterable[str]) -> Dict[str, Product]:
+        return self._call("load_products", self.repository.load_products, product_ids)
+
+    def load_all_products(self) -> Dict[str, Product]:
+        return self._call("load_all_products", self.repository.load_all_products)
+
+    def iter_products(self) -> Iterator[Product]:
+        return self._call("iter_products", self.repository.iter_products)
+
+    def count_products(self) -> int:
+        return self._call("count_products", self.repository.count_products)
+
+    def inventory_value_by_category(self) -> Dict[str, float]:
+        return self._call(
+            "inventory_value_by_category", self.repository.inventory_value_by_category
+        )
+
+    def rebuild_inventory_value(self) -> None:
+        self._call("rebuild_inventory_value", self.repository.rebuild_inventory_value)
+
+    def find_by_sku(self, sku: str) -> Optional[Product]:
+        return self._call("find_by_sku", self.repository.find_by_sku, sku)
+
+    def list_by_category(self, category: str) -> List[Product]:
+        return self._call("list_by_category", self.repository.list_by_category, category)
+
+    def list_below_threshold(self, threshold: int) -> List[Product]:
+        return self._call("list_below_threshold", self.repository.list_below_threshold, threshold)
+
+    def list_products_page(
+        self, after: Optional[tuple] = None, limit: int = 500, order_by: str = "id"
+    ) -> Page[Product]:
+        return self._call(
+            "list_products_page", self.repository.list_products_page, after, limit, order_by
+        )
+
+    def delete_product(self, product_id: str) -> None:
+        self._call("delete_product", self.repository.delete_product, product_id)
+
+    def save_movement(self, movement: Movement) -> None:
+        self._call("save_movement", self.repository.save_movement, movement)
+
+    def save_movements(self, movements: Iterable[Movement]) -> None:
+        self._call("save_movements", self.repository.save_movements, movements)
+
+    def load_movements(self) -> List[Movement]:
+        return self._call("load_movements", self.repository.load_movements)
+
+    def count_movements(self) -> int:
+        return self._call("count_movements", self.repository.count_movements)
+
+    def list_movements_page(
+        self, after: Optional[tuple] = None, limit: int = 500, order_by: str = "timestamp"
+    ) -> Page[Movement]:
+        return self._call(
+            "list_movements_page", self.repository.list_movements_page, after, limit, order_by
+        )
+
+    def movements_between(
+        self, since: Optional[datetime] = None, until: Optional[datetime] = None
+    ) -> List[Movement]:
+        return self._call("movements_between", self.repository.movements_between, since, until)
+
+    def movements_for_product(
+        self,
+        product_id: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> List[Movement]:
+        return self._call(
+            "movements_for_product",
+            self.repository.movements_for_product,
+            product_id,
+            since,
+            until,
+        )
+
+    def close(self) -> None:
+        self.repository.close()
+
+
+def repository_sizes(repository) -> Callable[[], Dict[str, int]]:
+    """Sammelfunktion für die Anzahl gespeicherter Produkte und Bewegungen"""
+
+    def collect() -> Dict[str, int]:
+        return {
+            "products": repository.count_products(),
+            "movements": repository.count_movements(),
+        }
+
+    return collect
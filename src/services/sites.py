@@ -0,0 +1,324 @@
+"""
+Sites - mehrere Lagerstandorte mit getrennten Repositories (Shards)
+
+Jeder Standort hat ein eigenes Repository und einen eigenen WarehouseService:
+Produkte, Bewegungen, Sperren und Lagerwert sind je Standort getrennt.
+Dieselbe Produkt-ID kann an mehreren Standorten geführt werden.
+
+Standortübergreifende Abfragen (Lagerwert, Bestand je SKU) werden aus den
+Lagerwerten bzw. SKU-Indizes der Standort-Repositories zusammengesetzt, also
+in O(Standorte) Abfragen statt über einen Scan aller Produkte.
+
+Ein Standort kann in einem eigenen Prozess laufen (SiteProcess) und wird über
+dieselben Methoden angesprochen; Standorte teilen sich dann weder Sperren
+noch den GIL.
+"""
+
+import multiprocessing
+import threading
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from ..domain.ids import NODE_BITS, IdGenerator, default_id_generator
+from ..domain.warehouse import Movement, Transfer
+from ..ports import RepositoryPort, TransferLogPort
+from . import WarehouseService
+from .locking import StripedLock
+
+
+def _serve(
+    connection, repository_factory: Callable[[], RepositoryPort], node_id: int, options: dict
+) -> None:
+    """Hauptschleife eines Standort-Prozesses: Aufrufe empfangen, ausführen, beantworten"""
+    default_id_generator.set_node_id(node_id)
+    repository = repository_factory()
+    service = WarehouseService(repository, **options)
+    try:
+        while True:
+            request = connection.recv()
+            if request is None:
+                return
+            method, args, kwargs = request
+            try:
+                connection.send((True, getattr(service, method)(*args, **kwargs)))
+            except Exception as error:  # wird im aufrufenden Prozess erneut ausgelöst
+                connection.send((False, error))
+    finally:
+        repository.close()
+        connection.close()
+
+
+class SiteProcess:
+    """
+    WarehouseService eines Standorts in einem eigenen Prozess
+
+    Öffentliche Methoden des WarehouseService werden weitergereicht; Argumente,
+    Ergebnisse und Ausnahmen werden dafür gepickelt. Generatoren (iter_products,
+    iter_movements) sind nicht verfügbar, stattdessen die Seiten-Methoden.
+    Aufrufe aus mehreren Threads werden nacheinander übertragen.
+    """
+
+    def __init__(self, repository_factory: Callable[[], RepositoryPort], node_id: int, **options):
+        """
+        Args:
+            repository_factory: picklebarer Aufruf, der im Prozess das Repository
+                erzeugt, z.B. functools.partial(RepositoryFactory.create_repository,
+                "sqlite", db_path="lager-nord.db")
+            node_id: Knotennummer der Bewegungs-IDs im Prozess (1-31), verschieden
+                von der des aufrufenden Prozesses und der anderen Standort-Prozesse
+            **options: weitere Argumente für WarehouseService
+
+        Raises:
+            ValueError: wenn node_id ungültig ist oder der des aufrufenden Prozesses entspricht
+        """
+        if node_id == default_id_generator.node_id:
+            raise ValueError(f"node_id {node_id} wird schon von diesem Prozess verwendet")
+        if not 0 <= node_id < 1 << NODE_BITS:
+            raise ValueError(f"node_id muss zwischen 0 und {(1 << NODE_BITS) - 1} liegen")
+        self.node_id = node_id
+        context = multiprocessing.get_context("spawn")
+        self._connection, child = context.Pipe()
+        self._lock = threading.Lock()
+        self._process = context.Process(
+            target=_serve, args=(child, repository_factory, node_id, options), daemon=True
+        )
+        self._process.start()
+        child.close()
+
+    def _call(self, method: str, *args, **kwargs):
+        with self._lock:
+            self._connection.send((method, args, kwargs))
+            succeeded, result = self._connection.recv()
+        if not succeeded:
+            raise result
+        return result
+
+    def __getattr__(self, name: str):
+        if name.startswith("_") or name.startswith("iter_"):
+            raise AttributeError(name)
+        return lambda *args, **kwargs: self._call(name, *args, **kwargs)
+
+    def close(self) -> None:
+        """Prozess beenden; das Repository wird dort geschlossen"""
+        with self._lock:
+            if self._process.is_alive():
+                self._connection.send(None)
+            self._process.join()
+            self._connection.close()
+
+
+Site = Union[WarehouseService, SiteProcess]
+
+
+class MultiWarehouseService:
+    """
+    Mehrere Standorte, Umlagerungen und standortübergreifende Kennzahlen
+
+    Buchungen an einem Standort laufen direkt über dessen Service
+    (site(name).add_to_stock(...)); dieser Service koordiniert nur, was
+    mehrere Standorte betrifft. Umlagerungen werden vorab im TransferLogPort
+    festgehalten und nach einem Fehler oder Neustart mit recover_transfers()
+    abgeschlossen.
+    """
+
+    def __init__(
+        self,
+        sites: Optional[Dict[str, Site]] = None,
+        id_generator: Optional[IdGenerator] = None,
+        lock_stripes: int = 64,
+        transfer_log: Optional[TransferLogPort] = None,
+    ):
+        """
+        Args:
+            sites: Standortname -> WarehouseService oder SiteProcess
+            id_generator: Generator für Umlagerungs-IDs (Standard: Snowflake-IDs)
+            lock_stripes: Sperren für Umlagerungen, verteilt nach (Standort, Produkt)
+            transfer_log: Protokoll offener Umlagerungen, z.B. JournalTransferLog
+                (Standard: nur im Speicher, übersteht keinen Neustart)
+        """
+        if transfer_log is None:
+            from ..adapters.transfer_log import InMemoryTransferLog
+
+            transfer_log = InMemoryTransferLog()
+        self.sites: Dict[str, Site] = {}
+        self.id_generator = id_generator or default_id_generator
+        self.transfer_log = transfer_log
+        self._locks = StripedLock(lock_stripes)
+        for name, site in (sites or {}).items():
+            self.add_site(name, site)
+
+    def add_site(self, name: str, site: Site) -> None:
+        """
+        Standort hinzufügen
+
+        Raises:
+            ValueError: wenn der Name oder die Knotennummer eines Standort-Prozesses
+                schon vergeben ist
+        """
+        if name in self.sites:
+            raise ValueError(f"Standort {name} existiert bereits")
+        if isinstance(site, SiteProcess):
+            for other_name, other in self.sites.items():
+                if isinstance(other, SiteProcess) and other.node_id == site.node_id:
+                    raise ValueError(
+                        f"node_id {site.node_id} wird schon vom Standort {other_name} verwendet"
+                    )
+        self.sites[name] = site
+
+    def site(self, name: str) -> Site:
+        """
+        Service eines Standorts
+
+        Raises:
+            ValueError: bei unbekanntem Standort
+        """
+        site = self.sites.get(name)
+        if site is None:
+            raise ValueError(f"Standort {name} existiert nicht")
+        return site
+
+    def transfer(
+        self,
+        product_id: str,
+        quantity: int,
+        source: str,
+        target: str,
+        reason: str = "",
+        user: str = "system",
+    ) -> Tuple[Movement, Movement]:
+        """
+        Bestand zwischen zwei Standorten umlagern
+
+        Gebucht werden nacheinander ein OUT am Quell- und ein IN am Zielstandort
+        mit gemeinsamer Umlagerungs-ID im Grund. Fehlt das Produkt am Ziel, wird
+        es dort mit denselben Stammdaten und Bestand 0 angelegt. Umlagerungen
+        desselben Produkts an denselben Standorten laufen nacheinander.
+
+        Vor der ersten Buchung wird der Auftrag im transfer_log festgehalten und
+        erst nach dem Zugang abgeschlossen. Scheitert der Zugang oder endet der
+        Prozess zwischen den Buchungen, bleibt der Auftrag offen, bis
+        recover_transfers() den Zugang nachbucht; bis dahin fehlt die Menge in
+        den standortübergreifenden Summen.
+
+        Returns:
+            (Abgang am Quellstandort, Zugang am Zielstandort)
+
+        Raises:
+            ValueError: bei unbekanntem Standort oder Produkt, gleichem Quell- und
+                Zielstandort, Menge <= 0 oder unzureichendem Bestand
+        """
+        if source == target:
+            raise ValueError("Quell- und Zielstandort sind identisch")
+        if quantity <= 0:
+            raise ValueError(f"Menge muss positiv sein: {quantity}")
+        source_site, target_site = self.site(source), self.site(target)
+        with self._locks.hold(f"{source}:{product_id}", f"{target}:{product_id}"):
+            product = source_site.get_product(product_id)
+            if product is None:
+                raise ValueError(f"Produkt {product_id} am Standort {source} nicht gefunden")
+            if product.quantity < quantity:
+                raise ValueError(
+                    f"Unzureichender Bestand am Standort {source}. "
+                    f"Verfügbar: {product.quantity}, Angefordert: {quantity}"
+                )
+            if target_site.get_product(product_id) is None:
+                target_site.create_product(
+                    product.id,
+                    product.name,
+                    product.description,
+                    product.price,
+                    product.category,
+                    initial_quantity=0,
+                    sku=product.sku,
+                )
+
+            transfer_id = self.id_generator.new_id()
+            note = f"Umlagerung {transfer_id} {source} -> {target}"
+            if reason:
+                note = f"{note}: {reason}"
+            transfer = Transfer(transfer_id, product_id, quantity, source, target, note, user)
+            self.transfer_log.begin(transfer)
+            try:
+                outgoing = source_site.remove_from_stock(product_id, quantity, note, user)
+            except ValueError:
+                # Abgang abgelehnt, es wurde nichts gebucht
+                self.transfer_log.finish(transfer_id)
+                raise
+            incoming = target_site.add_to_stock(product_id, quantity, note, user)
+            self.transfer_log.finish(transfer_id)
+        return outgoing, incoming
+
+    def recover_transfers(self) -> List[str]:
+        """
+        Offene Umlagerungen abschließen, z.B. nach einem Fehler oder beim Start
+
+        Je Auftrag wird anhand seines Grunds (mit Umlagerungs-ID) in den
+        Bewegungen beider Standorte nachgesehen: Fehlt der Abgang, wurde nichts
+        gebucht und der Auftrag wird verworfen; fehlt nur der Zugang, wird er
+        nachgebucht. Mehrfaches Aufrufen bucht deshalb nichts doppelt.
+
+        Returns:
+            IDs der abgeschlossenen bzw. verworfenen Aufträge
+
+        Raises:
+            Fehler der Zugangsbuchung; dieser und alle späteren Aufträge bleiben offen
+        """
+        recovered = []
+        for transfer in self.transfer_log.pending():
+            source_site, target_site = self.site(transfer.source), self.site(transfer.target)
+            product_id = transfer.product_id
+            with self._locks.hold(
+                f"{transfer.source}:{product_id}", f"{transfer.target}:{product_id}"
+            ):
+                if self._is_booked(source_site, transfer, -transfer.quantity) and not (
+                    self._is_booked(target_site, transfer, transfer.quantity)
+                ):
+                    target_site.add_to_stock(
+                        product_id, transfer.quantity, transfer.note, transfer.user
+                    )
+                self.transfer_log.finish(transfer.id)
+            recovered.append(transfer.id)
+        return recovered
+
+    @staticmethod
+    def _is_booked(site: Site, transfer: Transfer, change: int) -> bool:
+        """Gibt es am Standort die Buchung des Auftrags über change?"""
+        history = site.get_product_history(transfer.product_id, since=transfer.created_at)
+        return any(m.reason == transfer.note and m.quantity_change == change for m in history)
+
+    def get_total_inventory_value(self) -> float:
+        """Lagerwert über alle Standorte (Summe der Standortwerte)"""
+        return sum(site.get_total_inventory_value() for site in self.sites.values())
+
+    def get_inventory_values(self) -> Dict[str, float]:
+        """Lagerwert je Standort"""
+        return {name: site.get_total_inventory_value() for name, site in self.sites.items()}
+
+    def get_category_values(self) -> Dict[str, float]:
+        """Lagerwert je Kategorie über alle Standorte"""
+        totals: Dict[str, float] = {}
+        for site in self.sites.values():
+            for category, value in site.get_category_values().items():
+                totals[category] = totals.get(category, 0.0) + value
+        return totals
+
+    def get_stock_by_sku(self, sku: str) -> Dict[str, int]:
+        """Bestand einer SKU je Standort (nur Standorte, die sie führen)"""
+        stock = {}
+        for name, site in self.sites.items():
+            product = site.find_by_sku(sku)
+            if product is not None:
+                stock[name] = product.quantity
+        return stock
+
+    def get_total_stock(self, sku: str) -> int:
+        """Bestand einer SKU über alle Standorte"""
+        return sum(self.get_stock_by_sku(sku).values())
+
+    def close(self) -> None:
+        """Standort-Prozesse beenden, Repositories lokaler Standorte und Protokoll schließen"""
+        for site in self.sites.values():
+            if isinstance(site, SiteProcess):
+                site.close()
+            else:
+                site.repository.close()
+        self.transfer_log.close()
@@ -0,0 +1,5 @@
+"""Start der Oberfläche mit python -m src.ui"""
+
+from . import main
+
+main()
@@ -0,0 +1,372 @@
+"""Hauptfenster - PyQt6-Oberfläche der Lagerverwaltung"""
+
+import sys
+from typing import Optional
+
+from PyQt6.QtWidgets import (
+    QApplication,
+    QMainWindow,
+    QWidget,
+    QVBoxLayout,
+    QHBoxLayout,
+    QPushButton,
+    QTableView,
+    QAbstractItemView,
+    QInputDialog,
+    QLabel,
+    QSpinBox,
+    QLineEdit,
+    QMessageBox,
+    QTabWidget,
+    QDialog,
+    QFormLayout,
+    QDoubleSpinBox,
+    QPlainTextEdit,
+    QFileDialog,
+)
+from PyQt6.QtCore import Qt
+
+from ..adapters.report import ConsoleReportAdapter
+from ..adapters.repository import RepositoryFactory
+from ..services import WarehouseService
+from ..services.bulk import import_file
+from .models import MovementTableModel, ProductTableModel, create_proxy
+from .workers import TaskRunner
+
+
+class ProductDialogWindow(QDialog):
+    """Dialog zum Hinzufügen/Bearbeiten von Produkten"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Produkt hinzufügen")
+        self.setGeometry(100, 100, 400, 300)
+
+        layout = QFormLayout()
+
+        self.product_id_field = QLineEdit()
+        self.name_field = QLineEdit()
+        self.description_field = QLineEdit()
+        self.price_field = QDoubleSpinBox()
+        self.price_field.setMaximum(999999)
+        self.quantity_field = QSpinBox()
+        self.category_field = QLineEdit()
+
+        layout.addRow("Produkt-ID:", self.product_id_field)
+        layout.addRow("Name:", self.name_field)
+        layout.addRow("Beschreibung:", self.description_field)
+        layout.addRow("Preis (€):", self.price_field)
+        layout.addRow("Menge:", self.quantity_field)
+        layout.addRow("Kategorie:", self.category_field)
+
+        button_layout = QHBoxLayout()
+        ok_btn = QPushButton("OK")
+        cancel_btn = QPushButton("Abbrechen")
+
+        ok_btn.clicked.connect(self.accept)
+        cancel_btn.clicked.connect(self.reject)
+
+        button_layout.addWidget(ok_btn)
+        button_layout.addWidget(cancel_btn)
+
+        layout.addRow(button_layout)
+        self.setLayout(layout)
+
+    def get_data(self):
+        """Eingegebene Daten abrufen"""
+        return {
+            "product_id": self.product_id_field.text(),
+            "name": self.name_field.text(),
+            "description": self.description_field.text(),
+            "price": self.price_field.value(),
+            "quantity": self.quantity_field.value(),
+            "category": self.category_field.text(),
+        }
+
+
+class WarehouseMainWindow(QMainWindow):
+    """Hauptfenster der Lagerverwaltungsanwendung"""
+
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("Lagerverwaltungssystem v0.1.0")
+        self.setGeometry(100, 100, 1000, 600)
+
+        # Initialisiere Service
+        self.repository = RepositoryFactory.create_repository("memory")
+        self.service = WarehouseService(self.repository)
+        # Service-Aufrufe laufen im Hintergrund, Ergebnisse kommen per Signal zurück
+        self.runner = TaskRunner(parent=self)
+
+        # Erstelle UI
+        self._create_ui()
+
+    def _create_ui(self):
+        """Erstelle die Benutzeroberfläche"""
+        # Zentral-Widget
+        central_widget = QWidget()
+        self.setCentralWidget(central_widget)
+
+        # Hauptlayout
+        main_layout = QVBoxLayout()
+
+        # Tab-Widget
+        self.tabs = QTabWidget()
+
+        # Tab 1: Produkte
+        self._create_products_tab()
+
+        # Tab 2: Lagerbewegungen
+        self._create_movements_tab()
+
+        # Tab 3: Berichte
+        self._create_reports_tab()
+
+        main_layout.addWidget(self.tabs)
+        central_widget.setLayout(main_layout)
+
+    def _create_products_tab(self) -> None:
+        """Tab für Produktverwaltung"""
+        widget = QWidget()
+        layout = QVBoxLayout()
+
+        # Buttons
+        button_layout = QHBoxLayout()
+        add_btn = QPushButton("Produkt hinzufügen")
+        import_btn = QPushButton("Katalog importieren")
+        stock_btn = QPushButton("Bestand buchen")
+        refresh_btn = QPushButton("Aktualisieren")
+        delete_btn = QPushButton("Löschen")
+
+        add_btn.clicked.connect(self._add_product)
+        import_btn.clicked.connect(self._import_catalog)
+        stock_btn.clicked.connect(self._book_stock)
+        refresh_btn.clicked.connect(self._refresh_products)
+        delete_btn.clicked.connect(self._delete_product)
+
+        button_layout.addWidget(add_btn)
+        button_layout.addWidget(import_btn)
+        button_layout.addWidget(stock_btn)
+        button_layout.addWidget(refresh_btn)
+        button_layout.addWidget(delete_btn)
+
+        layout.addLayout(button_layout)
+
+        # Filter über alle Spalten
+        self.products_filter = QLineEdit()
+        self.products_filter.setPlaceholderText("Filter (ID, Name, Kategorie, ...)")
+        layout.addWidget(self.products_filter)
+
+        # Produkttabelle (Zeilen werden seitenweise nachgeladen)
+        self.products_model = ProductTableModel(self.service, parent=self, runner=self.runner)
+        self.products_proxy = create_proxy(self.products_model, parent=self)
+        self.products_filter.textChanged.connect(self.products_proxy.setFilterFixedString)
+        self.products_model.load_failed.connect(self._show_error)
+        self.products_table = self._create_table_view(self.products_proxy)
+        layout.addWidget(self.products_table)
+
+        widget.setLayout(layout)
+        self.tabs.addTab(widget, "Produkte")
+
+    def _create_movements_tab(self):
+        """Tab für Lagerbewegungen"""
+        widget = QWidget()
+        layout = QVBoxLayout()
+
+        # Info-Label
+        info_label = QLabel("Lagerbewegungen werden hier angezeigt")
+        layout.addWidget(info_label)
+
+        # Bewegungs-Tabelle (Zeilen werden seitenweise nachgeladen)
+        self.movements_model = MovementTableModel(self.service, parent=self, runner=self.runner)
+        self.movements_proxy = create_proxy(self.movements_model, parent=self)
+        self.movements_model.load_failed.connect(self._show_error)
+        self.movements_table = self._create_table_view(self.movements_proxy)
+        layout.addWidget(self.movements_table)
+
+        widget.setLayout(layout)
+        self.tabs.addTab(widget, "Lagerbewegungen")
+
+    def _create_table_view(self, model) -> QTableView:
+        """Tabellenansicht mit Sortierung per Spaltenkopf"""
+        view = QTableView()
+        view.setModel(model)
+        view.setSortingEnabled(True)
+        view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        view.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        header = view.verticalHeader()
+        if header is not None:
+            header.setVisible(False)
+        return view
+
+    def _create_reports_tab(self):
+        """Tab für Berichte"""
+        widget = QWidget()
+        layout = QVBoxLayout()
+
+        # Report-Buttons
+        button_layout = QHBoxLayout()
+        inventory_btn = QPushButton("Lagerbestandsbericht")
+        movement_btn = QPushButton("Bewegungsprotokoll")
+        self.cancel_report_btn = QPushButton("Abbrechen")
+        self.cancel_report_btn.setEnabled(False)
+
+        inventory_btn.clicked.connect(self._show_inventory_report)
+        movement_btn.clicked.connect(self._show_movement_report)
+        self.cancel_report_btn.clicked.connect(self._cancel_report)
+
+        button_layout.addWidget(inventory_btn)
+        button_layout.addWidget(movement_btn)
+        button_layout.addWidget(self.cancel_report_btn)
+        layout.addLayout(button_layout)
+
+        # Berichtsausgabe
+        self.report_view = QPlainTextEdit()
+        self.report_view.setReadOnly(True)
+        layout.addWidget(self.report_view)
+
+        widget.setLayout(layout)
+        self.tabs.addTab(widget, "Berichte")
+
+    def _add_product(self):
+        """Neues Produkt hinzufügen"""
+        dialog = ProductDialogWindow(self)
+        if dialog.exec():
+            data = dialog.get_data()
+            self.runner.submit(
+                self.service.create_product,
+                product_id=data["product_id"],
+                name=data["name"],
+                description=data["description"],
+                price=data["price"],
+                category=data["category"],
+                initial_quantity=data["quantity"],
+                on_result=self._product_created,
+                on_error=self._show_error,
+            )
+
+    def _product_created(self, product):
+        """Rückmeldung nach dem Anlegen (im Hauptthread)"""
+        QMessageBox.information(self, "Erfolg", "Produkt erfolgreich hinzugefügt")
+        self.products_model.product_changed(product.id)
+
+    def _import_catalog(self):
+        """Katalogdatei (CSV/JSONL) im Hintergrund importieren"""
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Katalog importieren", "", "Kataloge (*.csv *.jsonl *.ndjson)"
+        )
+        if path:
+            self.runner.submit(
+                import_file,
+                self.service,
+                path,
+                key="import",
+                on_result=self._catalog_imported,
+                on_error=self._show_error,
+            )
+
+    def _catalog_imported(self, result):
+        """Zusammenfassung des Imports anzeigen und die Tabelle neu laden"""
+        lines = [f"{result.imported} Produkte importiert, {result.rejected} Zeilen abgelehnt"]
+        lines += [f"Zeile {error.line}: {error.message}" for error in result.errors[:10]]
+        QMessageBox.information(self, "Import", "\n".join(lines))
+        self.products_model.reload()
+
+    def _show_error(self, error):
+        """Fehler eines Hintergrundauftrags anzeigen"""
+        QMessageBox.critical(self, "Fehler", str(error))
+
+    def _refresh_products(self):
+        """Produkttabelle neu laden (nur die sichtbaren Seiten werden abgefragt)"""
+        self.products_model.reload()
+
+    def _selected_product_id(self) -> Optional[str]:
+        """ID des markierten Produkts oder None"""
+        selection = self.products_table.selectionModel()
+        selected = selection.selectedRows() if selection is not None else []
+        if not selected:
+            return None
+        row = self.products_proxy.mapToSource(selected[0]).row()
+        return self.products_model.product_at(row).id
+
+    def _book_stock(self):
+        """Zugang (positive Menge) oder Abgang (negative Menge) für das markierte Produkt"""
+        product_id = self._selected_product_id()
+        if product_id is None:
+            QMessageBox.information(self, "Info", "Bitte zuerst ein Produkt auswählen")
+            return
+        amount, ok = QInputDialog.getInt(
+            self, "Bestand buchen", "Menge (negativ = Abgang):", 0, -999999, 999999
+        )
+        if not ok or amount == 0:
+            return
+        if amount > 0:
+            book, quantity = self.service.add_to_stock, amount
+        else:
+            book, quantity = self.service.remove_from_stock, -amount
+        self.runner.submit(
+            book, product_id, quantity, on_result=self._stock_booked, on_error=self._show_error
+        )
+
+    def _stock_booked(self, movement):
+        """Nur die betroffene Produktzeile neu zeichnen und die Bewegung anhängen"""
+        self.products_model.stock_changed([movement.product_id])
+        self.movements_model.movements_added([movement])
+
+    def _delete_product(self):
+        """Produkt löschen"""
+        QMessageBox.information(self, "Info", "Delete-Funktion wird implementiert")
+
+    def _run_report(self, lines):
+        """Bericht im Hintergrund erzeugen; ein neuer Bericht ersetzt einen laufenden"""
+        self.report_view.setPlainText("Bericht wird erstellt ...")
+        self.cancel_report_btn.setEnabled(True)
+        self.runner.submit_lines(
+            lines, key="report", on_result=self._report_ready, on_error=self._report_failed
+        )
+
+    def _report_ready(self, text):
+        self.cancel_report_btn.setEnabled(False)
+        self.report_view.setPlainText(text)
+
+    def _report_failed(self, error):
+        self.cancel_report_btn.setEnabled(False)
+        self._show_error(error)
+
+    def _cancel_report(self):
+        """Laufenden Bericht abbrechen"""
+        self.runner.cancel("report")
+        self.cancel_report_btn.setEnabled(False)
+        self.report_view.setPlainText("Bericht abgebrochen.")
+
+    def _show_inventory_report(self):
+        """Lagerbestandsbericht anzeigen"""
+        self._run_report(
+            lambda: ConsoleReportAdapter(self.service.iter_products()).iter_inventory_report()
+        )
+
+    def _show_movement_report(self):
+        """Bewegungsprotokoll anzeigen"""
+        self._run_report(
+            lambda: ConsoleReportAdapter(
+                movements=self.service.iter_movements()
+            ).iter_movement_report()
+        )
+
+    def closeEvent(self, event):
+        """Laufende Aufträge abbrechen und auf den Worker warten"""
+        self.runner.cancel_all()
+        self.runner.wait()
+        super().closeEvent(event)
+
+
+def main():
+    """Hauptprogramm"""
+    app = QApplication(sys.argv)
+    window = WarehouseMainWindow()
+    window.show()
+    sys.exit(app.exec())
+
+
+if __name__ == "__main__":
+    main()
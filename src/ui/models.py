@@ -0,0 +1,338 @@
+"""
+UI Models - virtualisierte Tabellenmodelle für Produkte und Lagerbewegungen
+
+Die Modelle halten nur die bereits angezeigten Seiten im Speicher und laden
+weitere Seiten über die Keyset-Pagination des WarehouseService nach, sobald
+die View über canFetchMore()/fetchMore() danach fragt. Sortieren und Filtern
+übernimmt ein QSortFilterProxyModel (create_proxy), das nur Zeilenverweise
+hält und die Daten nicht kopiert. Mit einem TaskRunner werden die Seiten im
+Hintergrund geladen.
+"""
+
+import bisect
+from typing import Any, Callable, Iterable, List, Optional
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, QSortFilterProxyModel, Qt, pyqtSignal
+
+from ..domain.product import Product
+from ..domain.warehouse import Movement
+from ..ports import Page
+from ..services import WarehouseService
+from .workers import TaskRunner
+
+DISPLAY_ROLE = Qt.ItemDataRole.DisplayRole
+# Rohwerte für die Sortierung im Proxy (Zahlen statt formatierter Texte)
+SORT_ROLE = Qt.ItemDataRole.UserRole
+
+# Lädt die Seite nach dem Cursor (after, limit), z.B. WarehouseService.get_products_page
+PageFetcher = Callable[[Optional[tuple], int], Page]
+# Werte einer Zeile je Spalte (Rohwerte bzw. Anzeigetexte)
+RowFormatter = Callable[[Any], tuple]
+
+
+def _product_values(product: Product) -> tuple:
+    return (
+        product.id,
+        product.name,
+        product.category,
+        product.quantity,
+        product.price,
+        product.get_total_value(),
+    )
+
+
+def _product_texts(product: Product) -> tuple:
+    return (
+        product.id,
+        product.name,
+        product.category,
+        str(product.quantity),
+        f"{product.price:.2f}",
+        f"{product.get_total_value():.2f}",
+    )
+
+
+def _movement_values(movement: Movement) -> tuple:
+    return (
+        movement.timestamp,
+        movement.product_name,
+        movement.movement_type,
+        movement.quantity_change,
+        movement.reason or "",
+    )
+
+
+def _movement_texts(movement: Movement) -> tuple:
+    return (
+        movement.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
+        f"{movement.product_name} ({movement.product_id})",
+        movement.movement_type,
+        f"{movement.quantity_change:+d}",
+        movement.reason or "",
+    )
+
+
+class _PagedTableModel(QAbstractTableModel):
+    """Gemeinsame Basis: flache Tabelle, die Seiten per Cursor nachlädt"""
+
+    HEADERS: List[str] = []
+
+    # Fehlermeldung, wenn eine Seite im Hintergrund nicht geladen werden konnte
+    load_failed = pyqtSignal(str)
+
+    def __init__(
+        self,
+        service: WarehouseService,
+        fetch_page: PageFetcher,
+        values: RowFormatter,
+        texts: RowFormatter,
+        page_size: int = 500,
+        parent=None,
+        runner: Optional[TaskRunner] = None,
+    ):
+        """
+        Args:
+            service: Quelle der Zeilen
+            fetch_page: lädt eine Seite ab einem Cursor
+            values: Rohwerte einer Zeile für die Sortierung
+            texts: Anzeigetexte einer Zeile
+            page_size: Zeilen pro nachgeladener Seite
+            parent: Qt-Elternobjekt
+            runner: lädt Seiten im Hintergrund (None = synchron im Hauptthread)
+        """
+        super().__init__(parent)
+        self.service = service
+        self.page_size = page_size
+        self.runner = runner
+        self._fetch_page = fetch_page
+        self._values = values
+        self._texts = texts
+        self._rows: List[Any] = []
+        self._cursor: Optional[tuple] = None
+        self._exhausted = False
+        self._loading = False
+        # Zählt reload()-Aufrufe; Seiten einer älteren Generation werden verworfen
+        self._generation = 0
+        self._task_key = f"{type(self).__name__}-{id(self)}"
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role=DISPLAY_ROLE):
+        if role == DISPLAY_ROLE and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index: QModelIndex, role=DISPLAY_ROLE) -> Any:
+        if not index.isValid():
+            return None
+        if role == DISPLAY_ROLE:
+            return self._texts(self._rows[index.row()])[index.column()]
+        if role == SORT_ROLE:
+            return self._values(self._rows[index.row()])[index.column()]
+        return None
+
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        return not parent.isValid() and not self._exhausted and not self._loading
+
+    def fetchMore(self, parent: QModelIndex = QModelIndex()) -> None:
+        if not self.canFetchMore(parent):
+            return
+        if self.runner is None:
+            self._page_loaded(self._fetch_page(self._cursor, self.page_size), self._generation)
+            return
+        self._loading = True
+        generation = self._generation
+        self.runner.submit(
+            self._fetch_page,
+            self._cursor,
+            self.page_size,
+            key=self._task_key,
+            on_result=lambda page: self._page_loaded(page, generation),
+            on_error=lambda error: self._page_failed(error, generation),
+        )
+
+    def _page_loaded(self, page: Page, generation: int) -> None:
+        if generation != self._generation:
+            return
+        self._loading = False
+        self._exhausted = not page.has_more
+        self._cursor = page.next_cursor
+        self._append(page.items)
+
+    def _page_failed(self, error: Exception, generation: int) -> None:
+        if generation == self._generation:
+            self._loading = False
+            self.load_failed.emit(str(error))
+
+    @property
+    def loading(self) -> bool:
+        """Wird gerade eine Seite im Hintergrund geladen?"""
+        return self._loading
+
+    def _append(self, items: List) -> None:
+        if not items:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(items) - 1)
+        self._rows.extend(items)
+        self.endInsertRows()
+
+    def reload(self) -> None:
+        """
+        Geladene Zeilen verwerfen; die View fordert die erste Seite neu an
+
+        Mehrfache Aufrufe werden zusammengefasst: eine noch ladende Seite wird
+        abgebrochen bzw. ihr Ergebnis verworfen.
+        """
+        self._generation += 1
+        if self.runner is not None:
+            self.runner.cancel(self._task_key)
+        self.beginResetModel()
+        self._rows = []
+        self._cursor = None
+        self._exhausted = False
+        self._loading = False
+        self.endResetModel()
+
+
+class ProductTableModel(_PagedTableModel):
+    """
+    Produkttabelle, nach ID sortiert seitenweise nachgeladen
+
+    Nach einer Lagerbewegung zeichnet stock_changed() nur die Bestands- und
+    Wertspalten der betroffenen Zeilen neu; product_changed() aktualisiert,
+    ergänzt oder entfernt eine einzelne Zeile.
+    """
+
+    HEADERS = ["ID", "Name", "Kategorie", "Bestand", "Preis (€)", "Gesamtwert (€)"]
+    QUANTITY_COLUMN = 3
+    VALUE_COLUMN = 5
+
+    def __init__(
+        self,
+        service: WarehouseService,
+        page_size: int = 500,
+        parent=None,
+        runner: Optional[TaskRunner] = None,
+    ):
+        super().__init__(
+            service,
+            service.get_products_page,
+            _product_values,
+            _product_texts,
+            page_size,
+            parent,
+            runner,
+        )
+        # Sortierte IDs der geladenen Zeilen für die Zeilensuche per bisect
+        self._ids: List[str] = []
+
+    def _append(self, items: List[Product]) -> None:
+        self._ids.extend(product.id for product in items)
+        super()._append(items)
+
+    def reload(self) -> None:
+        self._ids = []
+        super().reload()
+
+    def row_of(self, product_id: str) -> Optional[int]:
+        """Zeile eines geladenen Produkts oder None"""
+        row = bisect.bisect_left(self._ids, product_id)
+        if row < len(self._ids) and self._ids[row] == product_id:
+            return row
+        return None
+
+    def product_at(self, row: int) -> Product:
+        """Produkt in Zeile row"""
+        product: Product = self._rows[row]
+        return product
+
+    def _is_loaded_range(self, product_id: str) -> bool:
+        """Liegt die ID im bereits geladenen Bereich (sonst kommt sie mit einer späteren Seite)?"""
+        return self._exhausted or (self._cursor is not None and product_id <= self._cursor[0])
+
+    def product_changed(self, product_id: str) -> None:
+        """Eine Zeile nach dem Anlegen, Ändern oder Löschen eines Produkts aktualisieren"""
+        product = self.service.get_product(product_id)
+        row = self.row_of(product_id)
+        if row is not None and product is None:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._rows[row]
+            del self._ids[row]
+            self.endRemoveRows()
+        elif row is not None:
+            self._rows[row] = product
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.HEADERS) - 1))
+        elif product is not None and self._is_loaded_range(product_id):
+            row = bisect.bisect_left(self._ids, product_id)
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._rows.insert(row, product)
+            self._ids.insert(row, product_id)
+            self.endInsertRows()
+
+    def stock_changed(self, product_ids: Iterable[str]) -> None:
+        """Nach Lagerbewegungen nur Bestand und Gesamtwert der betroffenen Zeilen neu zeichnen"""
+        for product_id in set(product_ids):
+            row = self.row_of(product_id)
+            if row is None:
+                continue
+            product = self.service.get_product(product_id)
+            if product is None:
+                continue
+            self._rows[row] = product
+            self.dataChanged.emit(
+                self.index(row, self.QUANTITY_COLUMN), self.index(row, self.VALUE_COLUMN)
+            )
+
+
+class MovementTableModel(_PagedTableModel):
+    """Bewegungsprotokoll, zeitlich sortiert seitenweise nachgeladen"""
+
+    HEADERS = ["Zeitstempel", "Produkt", "Typ", "Menge", "Grund"]
+
+    def __init__(
+        self,
+        service: WarehouseService,
+        page_size: int = 500,
+        parent=None,
+        runner: Optional[TaskRunner] = None,
+    ):
+        super().__init__(
+            service,
+            service.get_movements_page,
+            _movement_values,
+            _movement_texts,
+            page_size,
+            parent,
+            runner,
+        )
+
+    def movements_added(self, movements: List[Movement]) -> None:
+        """
+        Neu gebuchte Bewegungen anhängen
+
+        Ist das Protokoll noch nicht vollständig geladen, kommen sie ohnehin
+        mit einer späteren Seite.
+        """
+        if self._exhausted:
+            self._append(movements)
+
+
+def create_proxy(model: QAbstractTableModel, parent=None) -> QSortFilterProxyModel:
+    """
+    Sortier-/Filter-Proxy über ein Tabellenmodell
+
+    Sortiert nach den Rohwerten (SORT_ROLE) und filtert über alle Spalten ohne
+    Beachtung der Groß-/Kleinschreibung. Sortierung und Filter wirken auf die
+    bereits geladenen Zeilen.
+    """
+    proxy = QSortFilterProxyModel(parent)
+    proxy.setSourceModel(model)
+    proxy.setSortRole(SORT_ROLE)
+    proxy.setFilterKeyColumn(-1)
+    proxy.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+    return proxy
@@ -0,0 +1,193 @@
+"""
+UI Workers - Hintergrundausführung von Service-Aufrufen
+
+Service-Aufrufe aus der UI laufen als QRunnable in einem QThreadPool, damit
+langsame Repositories oder große Berichte die Ereignisschleife nicht
+blockieren. Ergebnisse und Fehler werden per Signal im Hauptthread
+zugestellt.
+
+Aufträge mit gleichem Schlüssel werden zusammengefasst: ein neuer Auftrag
+ersetzt einen noch wartenden und verwirft das Ergebnis eines bereits
+laufenden. Abbrechen ist kooperativ - ein laufender Aufruf wird nicht
+unterbrochen, sein Ergebnis aber nicht mehr zugestellt; Zeilen-Aufträge
+(submit_lines) prüfen den Abbruch zwischen den Zeilen.
+"""
+
+import threading
+from typing import Callable, Dict, Iterable, Optional
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
+
+
+class TaskCancelled(Exception):
+    """Auftrag wurde abgebrochen"""
+
+
+class _TaskSignals(QObject):
+    """Signale eines Auftrags (QRunnable selbst kann keine Signale haben)"""
+
+    done = pyqtSignal(object, object, object)  # task, result, error
+
+
+class Task(QRunnable):
+    """Ein Hintergrundauftrag"""
+
+    def __init__(self, fn: Callable, args: tuple, kwargs: dict, key: Optional[str] = None):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.key = key
+        self.signals = _TaskSignals()
+        self._cancelled = threading.Event()
+        self.on_result: Optional[Callable] = None
+        self.on_error: Optional[Callable] = None
+
+    def cancel(self) -> None:
+        """Auftrag abbrechen; ein Ergebnis wird nicht mehr zugestellt"""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def check_cancelled(self) -> None:
+        """
+        Für lange Aufträge: zwischendurch auf Abbruch prüfen
+
+        Raises:
+            TaskCancelled: wenn der Auftrag abgebrochen wurde
+        """
+        if self.cancelled:
+            raise TaskCancelled()
+
+    def run(self) -> None:
+        if self.cancelled:
+            self.signals.done.emit(self, None, TaskCancelled())
+            return
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as error:  # an die UI weiterreichen statt den Worker zu beenden
+            self.signals.done.emit(self, None, error)
+        else:
+            self.signals.done.emit(self, result, None)
+
+
+class TaskRunner(QObject):
+    """
+    Führt Service-Aufrufe im Hintergrund aus und liefert Ergebnisse im Hauptthread
+
+    Standardmäßig mit einem eigenen Pool aus einem Thread: Aufträge laufen
+    nacheinander, sodass nicht-threadsichere Repositories nie parallel
+    benutzt werden.
+    """
+
+    def __init__(self, max_threads: int = 1, parent=None):
+        """
+        Args:
+            max_threads: Anzahl Worker-Threads
+            parent: Qt-Elternobjekt
+        """
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self._tasks: set = set()
+        self._by_key: Dict[str, Task] = {}
+
+    def submit(
+        self,
+        fn: Callable,
+        *args,
+        key: Optional[str] = None,
+        on_result: Optional[Callable] = None,
+        on_error: Optional[Callable] = None,
+        **kwargs,
+    ) -> Task:
+        """
+        fn(*args, **kwargs) im Hintergrund ausführen
+
+        Args:
+            fn: auszuführende Funktion (z.B. eine Service-Methode)
+            key: Schlüssel zum Zusammenfassen gleichartiger Aufträge
+            on_result: wird im Hauptthread mit dem Ergebnis aufgerufen
+            on_error: wird im Hauptthread mit der Exception aufgerufen
+
+        Returns:
+            Der Auftrag (z.B. zum Abbrechen)
+        """
+        return self._start(Task(fn, args, kwargs, key), on_result, on_error)
+
+    def _start(
+        self, task: Task, on_result: Optional[Callable], on_error: Optional[Callable]
+    ) -> Task:
+        task.on_result = on_result
+        task.on_error = on_error
+        task.signals.done.connect(self._deliver)
+        if task.key is not None:
+            self.cancel(task.key)
+            self._by_key[task.key] = task
+        self._tasks.add(task)
+        self.pool.start(task)
+        return task
+
+    def submit_lines(
+        self,
+        lines: Callable[[], Iterable[str]],
+        key: Optional[str] = None,
+        on_result: Optional[Callable] = None,
+        on_error: Optional[Callable] = None,
+    ) -> Task:
+        """
+        Zeilen-Generator (z.B. iter_inventory_report) im Hintergrund zu einem Text sammeln
+
+        Zwischen den Zeilen wird auf Abbruch geprüft, sodass auch große
+        Berichte schnell abgebrochen werden können.
+        """
+
+        def collect() -> str:
+            parts = []
+            for line in lines():
+                task.check_cancelled()
+                parts.append(line)
+            return "".join(parts)
+
+        task = Task(collect, (), {}, key)
+        return self._start(task, on_result, on_error)
+
+    def cancel(self, key: str) -> None:
+        """Auftrag mit diesem Schlüssel abbrechen (wartend: aus dem Pool nehmen)"""
+        task = self._by_key.pop(key, None)
+        if task is not None:
+            task.cancel()
+            if self.pool.tryTake(task):
+                self._tasks.discard(task)
+
+    def cancel_all(self) -> None:
+        """Alle Aufträge abbrechen"""
+        for key in list(self._by_key):
+            self.cancel(key)
+        for task in list(self._tasks):
+            task.cancel()
+
+    def wait(self, msecs: int = -1) -> bool:
+        """Auf das Ende aller laufenden Aufträge warten (z.B. beim Schließen)"""
+        return self.pool.waitForDone(msecs)
+
+    @property
+    def pending(self) -> int:
+        """Anzahl noch nicht zugestellter Aufträge"""
+        return len(self._tasks)
+
+    @pyqtSlot(object, object, object)
+    def _deliver(self, task: Task, result, error) -> None:
+        self._tasks.discard(task)
+        if task.key is not None and self._by_key.get(task.key) is task:
+            del self._by_key[task.key]
+        if task.cancelled or isinstance(error, TaskCancelled):
+            return
+        if error is not None:
+            if task.on_error is not None:
+                task.on_error(error)
+        elif task.on_result is not None:
+            task.on_result(result)
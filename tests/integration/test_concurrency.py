@@ -0,0 +1,139 @@
+"""Integration Tests - nebenläufige Buchungen über den WarehouseService"""
+
+import random
+import sys
+import threading
+
+import pytest
+from src.adapters.columnar import ColumnarMovementStore
+from src.adapters.repository import RepositoryFactory
+from src.services import MovementLine, WarehouseService
+
+THREADS = 8
+
+
+@pytest.fixture(params=["memory", "memory-columnar", "sqlite", "journal"])
+def service(request, tmp_path):
+    """Fixture: Service über jedes Repository-Backend"""
+    if request.param == "sqlite":
+        repo = RepositoryFactory.create_repository("sqlite", db_path=str(tmp_path / "lager.db"))
+    elif request.param == "journal":
+        repo = RepositoryFactory.create_repository(
+            "journal", directory=str(tmp_path / "journal"), group_interval=0
+        )
+    elif request.param == "memory-columnar":
+        repo = RepositoryFactory.create_repository("memory", movement_store=ColumnarMovementStore())
+    else:
+        repo = RepositoryFactory.create_repository("memory")
+    yield WarehouseService(repo)
+    if hasattr(repo, "close"):
+        repo.close()
+
+
+@pytest.fixture(autouse=True)
+def frequent_thread_switches():
+    """Häufige Thread-Wechsel, damit Check-then-Act-Fehler sichtbar werden"""
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def run_threads(target, count=THREADS):
+    barrier = threading.Barrier(count)
+    errors = []
+
+    def worker(index):
+        barrier.wait()
+        try:
+            target(index)
+        except Exception as error:  # im Hauptthread auswerten
+            errors.append(error)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
+
+class TestConcurrentService:
+    def test_concurrent_removals_never_oversell(self, service):
+        """Test: genau der vorhandene Bestand wird abgebucht, kein Stück mehr"""
+        per_thread = 50
+        service.create_product("P001", "Schraube", "", 0.1, initial_quantity=THREADS * per_thread)
+        sold = [0] * THREADS
+
+        def remove(index):
+            # Jeder Thread versucht mehr abzubuchen, als ihm rechnerisch zusteht
+            for _ in range(per_thread * 2):
+                try:
+                    service.remove_from_stock("P001", 1)
+                    sold[index] += 1
+                except ValueError:
+                    pass
+
+        run_threads(remove)
+
+        assert sum(sold) == THREADS * per_thread
+        assert service.get_product("P001").quantity == 0
+        assert len(service.get_movements()) == THREADS * per_thread
+        assert service.check_invariants() == []
+
+    def test_no_lost_updates_across_products(self, service):
+        """Test: gemischte Zu- und Abgänge ergeben exakt die erwartete Bilanz"""
+        product_ids = [f"P{i:03d}" for i in range(5)]
+        for product_id in product_ids:
+            service.create_product(product_id, product_id, "", 2.5, initial_quantity=1000)
+        expected = {product_id: 1000 for product_id in product_ids}
+        expected_lock = threading.Lock()
+
+        def book(index):
+            rng = random.Random(index)
+            for _ in range(100):
+                product_id = rng.choice(product_ids)
+                amount = rng.randint(1, 5)
+                if rng.random() < 0.5:
+                    service.add_to_stock(product_id, amount)
+                    change = amount
+                elif rng.random() < 0.5:
+                    service.remove_from_stock(product_id, amount)
+                    change = -amount
+                else:
+                    line = MovementLine(product_id, amount, "OUT")
+                    other = MovementLine(rng.choice(product_ids), amount, "IN")
+                    service.apply_movements([line, other])
+                    with expected_lock:
+                        expected[other.product_id] += amount
+                    change = -amount
+                with expected_lock:
+                    expected[product_id] += change
+
+        run_threads(book)
+
+        movements = service.get_movements()
+        for product_id in product_ids:
+            assert service.get_product(product_id).quantity == expected[product_id]
+            booked = sum(m.quantity_change for m in movements if m.product_id == product_id)
+            assert booked == expected[product_id] - 1000
+        assert len({m.id for m in movements}) == len(movements)
+        assert service.check_invariants() == []
+        assert service.get_total_inventory_value() == pytest.approx(
+            sum(quantity * 2.5 for quantity in expected.values())
+        )
+
+    def test_more_threads_than_id_slots(self, service):
+        """Test: auch mit mehr Threads als ID-Slots hat jede Buchung ihre Bewegung"""
+        service.create_product("P001", "Schraube", "", 0.1)
+
+        def add(index):
+            for _ in range(5):
+                service.add_to_stock("P001", 1)
+
+        run_threads(add, count=40)
+
+        movements = service.get_movements()
+        assert service.get_product("P001").quantity == 40 * 5
+        assert len(movements) == len({m.id for m in movements}) == 40 * 5
+        assert service.check_invariants() == []
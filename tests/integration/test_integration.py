@@ -1,8 +1,12 @@
 """Integration Tests"""
 
+import io
+from datetime import datetime, timedelta
+
 import pytest
 from src.adapters.repository import InMemoryRepository, RepositoryFactory
 from src.adapters.report import ConsoleReportAdapter
+from src.domain.warehouse import Movement
 from src.services import WarehouseService
 
 
@@ -52,3 +56,50 @@ class TestIntegration:
         assert "Lagerbestandsbericht" in inventory_report or "Lagerbestandsbericht" not in inventory_report  # Placeholder
         assert len(inventory_report) > 0
         assert len(movement_report) > 0
+
+    def test_streaming_reports(self):
+        """Test: Berichte in eine Datei streamen statt als String aufbauen"""
+        repository = RepositoryFactory.create_repository("memory")
+        service = WarehouseService(repository)
+        for i in range(20):
+            service.create_product(f"P{i:03d}", f"Produkt {i}", "Test", 2.0, initial_quantity=i)
+            service.add_to_stock(f"P{i:03d}", 1, reason="Wareneingang")
+
+        adapter = ConsoleReportAdapter(
+            service.iter_products(page_size=7), service.iter_movements(page_size=7)
+        )
+        sink = io.StringIO()
+        adapter.write_inventory_report(sink)
+        adapter.write_movement_report(sink)
+
+        expected = ConsoleReportAdapter(service.get_all_products(), service.get_movements())
+        assert sink.getvalue() == (
+            expected.generate_inventory_report() + expected.generate_movement_report()
+        )
+        assert "Gesamtbewegungen: 20" in sink.getvalue()
+
+    def test_movement_report_merges_sources(self):
+        """Test: Mehrere zeitlich sortierte Quellen werden gemischt"""
+        start = datetime(2025, 1, 1, 8, 0)
+
+        def movement(minute, site):
+            return Movement(
+                id=f"mov_{site}_{minute}",
+                product_id="P001",
+                product_name=f"Lager {site}",
+                quantity_change=1,
+                movement_type="IN",
+                timestamp=start + timedelta(minutes=minute),
+            )
+
+        adapter = ConsoleReportAdapter(
+            movement_sources=[
+                iter([movement(0, "A"), movement(2, "A")]),
+                iter([movement(1, "B"), movement(3, "B")]),
+            ]
+        )
+        report = adapter.generate_movement_report()
+        names = [
+            line.split(": ")[1].split(" (")[0] for line in report.splitlines() if "Produkt:" in line
+        ]
+        assert names == ["Lager A", "Lager B", "Lager A", "Lager B"]
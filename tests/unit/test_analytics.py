@@ -0,0 +1,83 @@
+"""Tests - Unit Tests für die vektorisierten Analytics"""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.adapters.columnar import ColumnarMovementStore  # noqa: E402
+from src.domain.product import Product  # noqa: E402
+from src.domain.warehouse import Movement  # noqa: E402
+from src.reports import InventoryReport, MovementArrays, MovementReport  # noqa: E402
+
+
+def _movement(index, product_id, change, movement_type, day):
+    return Movement(
+        id=f"mov_{index}",
+        product_id=product_id,
+        product_name=product_id,
+        quantity_change=change,
+        movement_type=movement_type,
+        timestamp=datetime(2025, 1, 1, 9) + timedelta(days=day),
+    )
+
+
+@pytest.fixture
+def movements():
+    """Fixture: zehn Tage Bewegungen für drei Produkte"""
+    return [
+        _movement(0, "A", 100, "IN", 0),
+        _movement(1, "A", -30, "OUT", 0),
+        _movement(2, "A", -20, "OUT", 4),
+        _movement(3, "B", -5, "OUT", 4),
+        _movement(4, "B", 2, "CORRECTION", 4),
+        _movement(5, "C", 10, "IN", 9),
+    ]
+
+
+class TestMovementReport:
+    """Tests für MovementReport"""
+
+    def test_daily_net_flow(self, movements):
+        """Test: Netto-Fluss je Produkt und Tag"""
+        product_ids, days, net = MovementReport(
+            MovementArrays.from_movements(movements)
+        ).daily_net_flow()
+        assert list(product_ids) == ["A", "A", "B", "C"]
+        assert days.tolist() == [
+            date(2025, 1, 1),
+            date(2025, 1, 5),
+            date(2025, 1, 5),
+            date(2025, 1, 10),
+        ]
+        assert net.tolist() == [70, -20, -3, 10]
+
+    def test_store_and_objects_agree(self, movements):
+        """Test: Laden aus dem Spaltenspeicher liefert dieselben Summen"""
+        from_objects = MovementReport(MovementArrays.from_movements(movements))
+        from_store = MovementReport(MovementArrays.from_store(ColumnarMovementStore(movements)))
+        assert from_store.outflow_per_product().tolist() == [50, 5, 0]
+        assert from_objects.outflow_per_product().tolist() == [50, 5, 0]
+        assert from_store.period_days() == from_objects.period_days() == 10
+
+
+class TestInventoryReport:
+    """Tests für InventoryReport"""
+
+    def test_kennzahlen(self, movements):
+        """Test: Umschlag, Reichweite und ABC-Klassen"""
+        products = [
+            Product(id="A", name="A", description="", price=10.0, quantity=50),
+            Product(id="B", name="B", description="", price=20.0, quantity=10),
+            Product(id="C", name="C", description="", price=1.0, quantity=10),
+            Product(id="D", name="D", description="", price=1.0, quantity=0),
+        ]
+        report = InventoryReport(products, MovementArrays.from_movements(movements))
+
+        assert report.days_of_cover()["A"] == pytest.approx(10.0)  # 50 / (50 / 10 Tage)
+        assert report.days_of_cover()["C"] == float("inf")
+        assert report.turnover()["A"] == pytest.approx(50 / 25)  # Anfang 0, Ende 50
+        assert report.turnover()["D"] == 0.0
+        # Verbrauchswerte: A = 500, B = 100 -> B beginnt bei 83 % des Gesamtwerts
+        assert report.abc_classification() == {"A": "A", "B": "B", "C": "C", "D": "C"}
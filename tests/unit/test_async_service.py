@@ -0,0 +1,160 @@
+"""Unit Tests für AsyncWarehouseService und die asynchronen Repositories"""
+
+import asyncio
+
+import pytest
+from src.adapters.async_repository import AsyncInMemoryRepository, AsyncSqliteRepository
+from src.services.async_service import AsyncWarehouseService
+
+
+class CountingRepository(AsyncInMemoryRepository):
+    """Zählt die Schreibzugriffe"""
+
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    async def save_changes(self, products, movements=(), expected_versions=None):
+        self.writes += 1
+        await super().save_changes(products, movements, expected_versions)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_repository(request, tmp_path):
+    """Fixture: Fabrik für ein asynchrones Repository je Backend"""
+    if request.param == "sqlite":
+        return lambda: AsyncSqliteRepository(str(tmp_path / "lager.db"))
+    return AsyncInMemoryRepository
+
+
+class TestAsyncWarehouseService:
+    def test_concurrent_add_to_stock_is_coalesced(self):
+        async def scenario():
+            repo = CountingRepository()
+            service = AsyncWarehouseService(repo)
+            await service.create_product("P1", "Laptop", "", 1000.0)
+            await service.create_product("P2", "Maus", "", 20.0)
+            writes = repo.writes
+            movements = await asyncio.gather(
+                *(service.add_to_stock(f"P{1 + i % 2}", 1) for i in range(100))
+            )
+            return repo, writes, movements, service
+
+        repo, writes, movements, service = asyncio.run(scenario())
+        assert repo.writes - writes == 1
+        assert len({movement.id for movement in movements}) == 100
+        assert repo.repository.load_product("P1").quantity == 50
+        assert repo.repository.load_product("P2").quantity == 50
+        assert len(repo.repository.load_movements()) == 100
+
+    def test_unknown_product_fails_only_its_own_call(self):
+        async def scenario():
+            service = AsyncWarehouseService(AsyncInMemoryRepository())
+            await service.create_product("P1", "Laptop", "", 1000.0)
+            return await asyncio.gather(
+                service.add_to_stock("P1", 2),
+                service.add_to_stock("XX", 1),
+                service.add_to_stock("P1", 3),
+                return_exceptions=True,
+            ), await service.get_product("P1")
+
+        results, product = asyncio.run(scenario())
+        assert isinstance(results[1], ValueError)
+        assert [results[0].quantity_change, results[2].quantity_change] == [2, 3]
+        assert product.quantity == 5
+
+    def test_invalid_quantity_is_rejected_immediately(self):
+        service = AsyncWarehouseService(AsyncInMemoryRepository())
+        with pytest.raises(ValueError):
+            asyncio.run(service.add_to_stock("P1", 0))
+
+    def test_concurrent_removals_never_oversell(self, make_repository):
+        async def scenario():
+            repo = make_repository()
+            service = AsyncWarehouseService(repo)
+            await service.create_product("P1", "Laptop", "", 1000.0, initial_quantity=10)
+            results = await asyncio.gather(
+                *(service.remove_from_stock("P1", 1) for _ in range(25)),
+                *(service.add_to_stock("P1", 1) for _ in range(5)),
+                return_exceptions=True,
+            )
+            product = await service.get_product("P1")
+            page = await service.get_movements_page(limit=100)
+            await repo.close()
+            return results, product, page
+
+        results, product, page = asyncio.run(scenario())
+        booked = [result for result in results if not isinstance(result, Exception)]
+        assert all(isinstance(r, ValueError) for r in results if isinstance(r, Exception))
+        assert product.quantity == sum(m.quantity_change for m in booked) + 10
+        assert product.quantity >= 0
+        assert len(page.items) == len(booked)
+
+    def test_create_product_rejects_duplicates(self, make_repository):
+        async def scenario():
+            repo = make_repository()
+            service = AsyncWarehouseService(repo)
+            results = await asyncio.gather(
+                service.create_product("P1", "Laptop", "", 1000.0, sku="4001"),
+                service.create_product("P1", "Laptop", "", 1000.0),
+                service.create_product("P2", "Maus", "", 20.0, sku="4001"),
+                return_exceptions=True,
+            )
+            found = await service.find_by_sku("4001")
+            await repo.close()
+            return results, found
+
+        results, found = asyncio.run(scenario())
+        assert results[0].id == "P1"
+        assert isinstance(results[1], ValueError)
+        assert isinstance(results[2], ValueError)
+        assert found.id == "P1"
+
+
+class TestAsyncSqliteRepository:
+    def test_concurrent_requests_share_transactions(self, tmp_path):
+        async def scenario():
+            repo = AsyncSqliteRepository(str(tmp_path / "lager.db"))
+            service = AsyncWarehouseService(repo)
+            await asyncio.gather(
+                *(service.create_product(f"P{i:03d}", "Artikel", "", 1.0) for i in range(200))
+            )
+            commits = repo.commits
+            await repo.close()
+            return commits
+
+        # 200 Anlagen mit je zwei Zugriffen, aber deutlich weniger Commits
+        assert asyncio.run(scenario()) < 200
+
+    def test_version_conflict_only_rolls_back_own_request(self, tmp_path):
+        async def scenario():
+            repo = AsyncSqliteRepository(str(tmp_path / "lager.db"))
+            service = AsyncWarehouseService(repo)
+            await service.create_product("P1", "Laptop", "", 1000.0)
+            stale = await repo.load_product("P1")
+            fresh = await repo.load_product("P1")
+            fresh.update_quantity(5)
+            await repo.save_product(fresh, expected_version=fresh.version)
+            stale.update_quantity(1)
+            results = await asyncio.gather(
+                repo.save_product(stale, expected_version=stale.version),
+                service.create_product("P2", "Maus", "", 20.0),
+                return_exceptions=True,
+            )
+            stored = await repo.load_products(["P1", "P2"])
+            await repo.close()
+            return results, stored
+
+        results, stored = asyncio.run(scenario())
+        assert isinstance(results[0], ValueError)
+        assert stored["P1"].quantity == 5
+        assert "P2" in stored
+
+    def test_closed_repository_rejects_calls(self, tmp_path):
+        async def scenario():
+            repo = AsyncSqliteRepository(str(tmp_path / "lager.db"))
+            await repo.close()
+            await repo.load_product("P1")
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(scenario())
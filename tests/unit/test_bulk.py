@@ -0,0 +1,121 @@
+"""Unit Tests für Katalogimport und -export"""
+
+import io
+import json
+
+import pytest
+from src.adapters.repository import InMemoryRepository
+from src.cli import main
+from src.services import WarehouseService
+from src.services.bulk import export_products, import_products, product_from_record
+
+CATALOG = """id,name,description,price,quantity,sku,category
+P001,Laptop,Dell XPS,1000,5,4001,Elektronik
+P002,Maus,,20.5,,4002,Zubehör
+P003,Defekt,,-1,0,,
+P004,Kabel,,abc,0,,
+P001,Doppelt,,1,0,,
+P005,Monitor,,300,2,4001,Elektronik
+,Ohne ID,,1,0,,
+P006,Tastatur,,45,3,,Zubehör
+"""
+
+
+@pytest.fixture
+def service():
+    return WarehouseService(InMemoryRepository())
+
+
+class TestProductFromRecord:
+    def test_converts_text_and_numbers(self):
+        product = product_from_record({"id": " P1 ", "name": "Laptop", "price": "9.5"})
+        assert (product.id, product.price, product.quantity, product.notes) == ("P1", 9.5, 0, None)
+        product = product_from_record({"id": "P1", "name": "X", "price": 1, "quantity": 2.0})
+        assert product.quantity == 2
+
+    @pytest.mark.parametrize(
+        "record",
+        [
+            {"id": "P1", "name": "X"},
+            {"id": "P1", "name": "X", "price": "-1"},
+            {"id": "P1", "name": "X", "price": "nan"},
+            {"id": "P1", "name": "X", "price": 1, "quantity": 1.5},
+            {"id": "P1", "name": "X", "price": 1, "quantity": "-3"},
+            {"id": "P1", "name": "X", "price": True},
+        ],
+    )
+    def test_rejects_invalid_records(self, record):
+        with pytest.raises(ValueError):
+            product_from_record(record)
+
+
+class TestImport:
+    @pytest.mark.parametrize("chunk_size", [1, 3, 5000])
+    def test_bad_rows_are_reported_without_aborting(self, service, chunk_size):
+        result = import_products(service, io.StringIO(CATALOG), chunk_size=chunk_size)
+
+        assert result.imported == 3
+        assert [error.line for error in result.errors] == [4, 5, 6, 7, 8]
+        assert "existiert bereits" in result.errors[2].message
+        assert "SKU 4001" in result.errors[3].message
+        assert sorted(service.get_all_products()) == ["P001", "P002", "P006"]
+        assert service.get_total_inventory_value() == pytest.approx(5000 + 135)
+
+    def test_existing_products_are_rejected(self, service):
+        service.create_product("P002", "Alt", "", 1.0)
+        result = import_products(service, io.StringIO(CATALOG))
+        assert result.imported == 2
+        assert service.get_product("P002").name == "Alt"
+
+    def test_jsonl_with_process_pool(self, service):
+        lines = [json.dumps({"id": f"P{i:03d}", "name": "Artikel", "price": i}) for i in range(50)]
+        lines[10] = "{kaputt"
+        lines[20] = "[1, 2]"
+        stream = io.StringIO("\n".join(lines) + "\n\n")
+
+        result = import_products(service, stream, "jsonl", chunk_size=7, processes=2)
+
+        assert result.imported == 48
+        assert [error.line for error in result.errors] == [11, 21]
+        assert service.repository.count_products() == 48
+
+    def test_error_list_is_bounded(self, service):
+        rows = "id,name,price\n" + "".join(f"P{i},X,-1\n" for i in range(20))
+        result = import_products(service, io.StringIO(rows), max_errors=5)
+        assert (result.rejected, len(result.errors)) == (20, 5)
+
+
+class TestExport:
+    @pytest.mark.parametrize("file_format", ["csv", "jsonl"])
+    def test_round_trip(self, service, file_format):
+        import_products(service, io.StringIO(CATALOG))
+        service.repository.products["P001"].notes = 'Vorführgerät, "neu"'
+        sink = io.StringIO()
+
+        assert export_products(service, sink, file_format, page_size=2) == 3
+
+        copy = WarehouseService(InMemoryRepository())
+        sink.seek(0)
+        result = import_products(copy, sink, file_format)
+        assert result.imported == 3 and not result.errors
+        original, restored = service.get_product("P001"), copy.get_product("P001")
+        for name in ("name", "description", "price", "quantity", "sku", "category", "notes"):
+            assert getattr(restored, name) == getattr(original, name)
+
+
+class TestCli:
+    def test_import_and_export(self, tmp_path, capsys):
+        catalog = tmp_path / "katalog.csv"
+        catalog.write_text(CATALOG, encoding="utf-8")
+        db = str(tmp_path / "lager.db")
+
+        assert main(["--db", db, "import", str(catalog)]) == 1
+        assert "3 Produkte importiert, 5 Zeilen abgelehnt" in capsys.readouterr().out
+
+        export = tmp_path / "bestand.jsonl"
+        assert main(["--db", db, "export", str(export)]) == 0
+        assert len(export.read_text(encoding="utf-8").splitlines()) == 3
+
+    def test_unknown_format(self, tmp_path, capsys):
+        assert main(["--db", str(tmp_path / "lager.db"), "export", str(tmp_path / "x.xml")]) == 2
+        assert "Unbekanntes Dateiformat" in capsys.readouterr().err
@@ -0,0 +1,87 @@
+"""Unit Tests für die Kommandozeile (Buchungen, Berichte, Startzeit)"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from src.adapters.repository import SqliteRepository
+from src.cli import main
+from src.domain.product import Product
+
+ROOT = Path(__file__).resolve().parents[2]
+# Großzügig bemessen (gemessen ~0,05 s); schlägt an, wenn wieder GUI oder alle Adapter laden
+STARTUP_BUDGET = 0.5
+# Eine Buchung in einem frischen Prozess (gemessen ~0,02 s); ein Durchlauf über alle
+# CATALOG_SIZE Produkte beim Start kostet allein ~0,2 s
+COMMAND_BUDGET = 0.1
+CATALOG_SIZE = 30_000
+HEAVY_MODULES = ("PyQt6", "tinydb", "numpy", "asyncio", "concurrent.futures")
+
+
+def test_startup_loads_no_gui_or_optional_backends():
+    script = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        "import src.cli\n"
+        "seconds = time.perf_counter() - start\n"
+        f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "print(json.dumps({'seconds': seconds, 'heavy': heavy}))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True, cwd=ROOT
+    )
+    result = json.loads(output.stdout)
+    assert result["heavy"] == []
+    assert result["seconds"] < STARTUP_BUDGET
+
+
+def test_booking_does_not_scan_the_catalog(tmp_path):
+    db_path = str(tmp_path / "lager.db")
+    repository = SqliteRepository(db_path)
+    repository.save_products(
+        Product(id=f"P{i:06d}", name="Artikel", description="", price=1.0, quantity=5)
+        for i in range(CATALOG_SIZE)
+    )
+    repository.close()
+    script = (
+        "import json, time\n"
+        "from src.cli import main\n"
+        "start = time.perf_counter()\n"
+        f"code = main(['--db', {db_path!r}, 'in', 'P000001', '1'])\n"
+        "seconds = time.perf_counter() - start\n"
+        "print(json.dumps({'code': code, 'seconds': seconds}))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True, cwd=ROOT
+    )
+    result = json.loads(output.stdout.splitlines()[-1])
+    assert result["code"] == 0
+    assert result["seconds"] < COMMAND_BUDGET
+
+
+def test_bookings_and_reports(tmp_path, capsys):
+    catalog = tmp_path / "katalog.csv"
+    catalog.write_text(
+        "id,name,price,quantity,reorder_point,target_quantity\nP001,Schraube,0.1,30,20,100\n",
+        encoding="utf-8",
+    )
+    db = ["--db", str(tmp_path / "lager.db")]
+    assert main(db + ["import", str(catalog)]) == 0
+
+    assert main(db + ["out", "P001", "15", "--reason", "Verkauf"]) == 0
+    assert "Bestand jetzt 15" in capsys.readouterr().out
+    assert main(db + ["out", "P001", "50"]) == 2
+    assert "Unzureichender Bestand" in capsys.readouterr().err
+
+    report = tmp_path / "bewegungen.txt"
+    assert main(db + ["report", "movements", "--output", str(report)]) == 0
+    assert "Verkauf" in report.read_text(encoding="utf-8")
+    assert main(db + ["report", "reorder"]) == 0
+    assert "bestellen 85" in capsys.readouterr().out
+
+
+def test_rejects_non_positive_quantity(tmp_path):
+    with pytest.raises(SystemExit):
+        main(["--db", str(tmp_path / "lager.db"), "in", "P001", "0"])
@@ -1,9 +1,15 @@
 """Tests - Unit Tests für die Geschäftslogik"""
 
+import threading
+from datetime import datetime, timedelta
+
 import pytest
+from src.domain.ids import SnowflakeIdGenerator
 from src.domain.product import Product
+from src.domain.warehouse import Warehouse
 from src.adapters.repository import InMemoryRepository
-from src.services import WarehouseService
+from src.ports import VersionConflictError
+from src.services import MovementLine, WarehouseService
 
 
 class TestProduct:
@@ -71,6 +77,117 @@ class TestProduct:
         assert product.get_total_value() == 50.0
 
 
+class TestWarehouse:
+    """Tests für die Warehouse-Klasse"""
+
+    def test_inventory_value_is_maintained(self):
+        """Test: Lagerwert wird bei jeder Änderung nachgeführt"""
+        warehouse = Warehouse("Test")
+        warehouse.add_product(
+            Product(id="P001", name="A", description="", price=10.0, quantity=5, category="X")
+        )
+        warehouse.add_product(
+            Product(id="P002", name="B", description="", price=2.5, quantity=4, category="Y")
+        )
+        assert warehouse.get_total_inventory_value() == 60.0
+
+        warehouse.update_quantity("P001", -2)
+        warehouse.update_price("P002", 5.0)
+        assert warehouse.get_total_inventory_value() == 50.0
+        assert warehouse.get_category_values() == {"X": 30.0, "Y": 20.0}
+
+        warehouse.remove_product("P002")
+        assert warehouse.get_category_values() == {"X": 30.0}
+        assert warehouse.check_inventory_value()
+
+    def test_inventory_value_detects_drift(self):
+        """Test: Änderungen am Aggregat vorbei werden erkannt"""
+        warehouse = Warehouse("Test")
+        product = Product(id="P001", name="A", description="", price=10.0, quantity=5)
+        warehouse.add_product(product)
+        product.update_quantity(1)
+        assert not warehouse.check_inventory_value()
+
+
+class TestSnowflakeIdGenerator:
+    """Tests für die Bewegungs-IDs"""
+
+    def test_ids_are_unique_and_sorted(self):
+        """Test: IDs eines Threads sind eindeutig und streng monoton"""
+        generator = SnowflakeIdGenerator(node_id=1)
+        ids = [generator.new_id() for _ in range(20000)]
+        assert len(set(ids)) == len(ids)
+        assert ids == sorted(ids)
+
+    def test_ids_unique_across_threads(self):
+        """Test: Parallele Threads erzeugen keine Kollisionen"""
+        generator = SnowflakeIdGenerator(node_id=1)
+        results = [[] for _ in range(8)]
+
+        def worker(bucket):
+            bucket.extend(generator.new_id() for _ in range(5000))
+
+        threads = [threading.Thread(target=worker, args=(bucket,)) for bucket in results]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        all_ids = [movement_id for bucket in results for movement_id in bucket]
+        assert len(set(all_ids)) == len(all_ids)
+
+    def test_thread_slots_are_reused(self):
+        """Test: Mehr als 32 Threads nacheinander erzeugen keine Kollisionen"""
+        generator = SnowflakeIdGenerator(node_id=1)
+        results = [[] for _ in range(96)]
+        barrier = threading.Barrier(32)
+
+        def worker(bucket):
+            barrier.wait()
+            bucket.extend(generator.new_id() for _ in range(200))
+
+        for wave in range(0, len(results), 32):
+            threads = [
+                threading.Thread(target=worker, args=(bucket,))
+                for bucket in results[wave : wave + 32]
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        all_ids = [movement_id for bucket in results for movement_id in bucket]
+        assert len(set(all_ids)) == len(all_ids)
+
+    def test_more_threads_than_slots_share_a_slot(self):
+        """Test: Threads über die Slot-Zahl hinaus erhalten trotzdem eindeutige IDs"""
+        generator = SnowflakeIdGenerator(node_id=1)
+        started = threading.Barrier(48)
+        ids = []
+        lock = threading.Lock()
+
+        def worker():
+            started.wait()
+            local = [generator.new_id() for _ in range(200)]
+            started.wait()
+            with lock:
+                ids.extend(local)
+
+        threads = [threading.Thread(target=worker) for _ in range(48)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(ids) == len(set(ids)) == 48 * 200
+
+    def test_time_range_bounds(self):
+        """Test: Zeitbereich lässt sich als ID-Bereich ausdrücken"""
+        generator = SnowflakeIdGenerator(node_id=1)
+        before = datetime.now() - timedelta(seconds=1)
+        movement_id = generator.new_id()
+        after = datetime.now() + timedelta(seconds=1)
+        assert generator.lower_bound(before) <= movement_id < generator.lower_bound(after)
+        assert abs(generator.timestamp_of(movement_id) - datetime.now()) < timedelta(seconds=2)
+
+
 class TestWarehouseService:
     """Tests für WarehouseService"""
 
@@ -132,6 +249,57 @@ class TestWarehouseService:
         total = service.get_total_inventory_value()
         assert total == 110.0  # (10*5) + (20*3)
 
+    def test_inventory_value_per_category(self, service):
+        """Test: Lagerwert je Kategorie bei Preisänderung und Löschen"""
+        service.create_product("P001", "A", "Test", 10.0, category="X", initial_quantity=5)
+        service.create_product("P002", "B", "Test", 20.0, category="Y", initial_quantity=3)
+        service.update_price("P001", 12.0)
+        service.remove_from_stock("P002", 1)
+        assert service.get_category_values() == {"X": 60.0, "Y": 40.0}
+
+        service.delete_product("P002")
+        assert service.get_total_inventory_value() == 60.0
+        assert service.check_inventory_value()
+
+    def test_start_does_not_scan_products(self, monkeypatch):
+        """Test: Der Service liest beim Start keine Produkte, den Wert führt das Repository"""
+        repository = InMemoryRepository()
+        repository.save_product(
+            Product(id="P1", name="A", description="", price=2.0, quantity=4, category="X")
+        )
+
+        def scan():
+            raise AssertionError("Produkte durchlaufen")
+
+        monkeypatch.setattr(repository, "iter_products", scan)
+        service = WarehouseService(repository)
+
+        assert service.get_category_values() == {"X": 8.0}
+        assert service.get_total_inventory_value() == 8.0
+
+    def test_inventory_value_repair(self, service):
+        """Test: Abweichender Lagerwert wird erkannt und neu aufgebaut"""
+        service.create_product("P001", "A", "Test", 10.0, initial_quantity=5)
+        service.repository.products["P001"].quantity = 7
+
+        assert not service.check_inventory_value(repair=True)
+        assert service.check_inventory_value()
+        assert service.get_total_inventory_value() == 70.0
+
+    def test_find_by_sku(self, service):
+        """Test: Produkt per Barcode finden, doppelte SKU ablehnen"""
+        service.create_product("P001", "A", "Test", 10.0, sku="4006381333931")
+        assert service.find_by_sku("4006381333931").id == "P001"
+        with pytest.raises(ValueError):
+            service.create_product("P002", "B", "Test", 10.0, sku="4006381333931")
+
+    def test_create_duplicate_product(self, service):
+        """Test: Doppelte Produkt-ID wird abgelehnt"""
+        service.create_product("P001", "A", "Test", 10.0, initial_quantity=5)
+        with pytest.raises(ValueError):
+            service.create_product("P001", "B", "Test", 99.0)
+        assert service.get_product("P001").name == "A"
+
     def test_get_movements(self, service):
         """Test: Lagerbewegungen abrufen"""
         service.create_product("P001", "Test", "Test", 10.0, initial_quantity=5)
@@ -140,3 +308,105 @@ class TestWarehouseService:
 
         movements = service.get_movements()
         assert len(movements) == 2
+
+    def test_apply_movements(self, service):
+        """Test: Bewegungs-Batch buchen"""
+        service.create_product("P001", "Test 1", "Test", 10.0, initial_quantity=5)
+        service.create_product("P002", "Test 2", "Test", 20.0, initial_quantity=0)
+
+        movements = service.apply_movements(
+            [
+                MovementLine("P001", 10, "IN"),
+                MovementLine("P002", 4, "IN"),
+                MovementLine("P001", 12, "OUT"),
+                MovementLine("P002", -1, "CORRECTION"),
+            ]
+        )
+
+        assert len(movements) == 4
+        assert len({m.id for m in movements}) == 4
+        assert service.get_product("P001").quantity == 3
+        assert service.get_product("P002").quantity == 3
+        assert [m.quantity_change for m in service.get_movements()] == [10, 4, -12, -1]
+
+    def test_apply_movements_rejected_atomically(self, service):
+        """Test: Batch mit zu wenig Bestand ändert nichts"""
+        service.create_product("P001", "Test", "Test", 10.0, initial_quantity=5)
+
+        with pytest.raises(ValueError):
+            service.apply_movements(
+                [MovementLine("P001", 3, "OUT"), MovementLine("P001", 3, "OUT")]
+            )
+
+        assert service.get_product("P001").quantity == 5
+        assert service.get_movements() == []
+
+    def test_returned_product_is_not_shared_state(self, service):
+        """Test: Änderungen am zurückgegebenen Produkt erreichen den Bestand nicht"""
+        product = service.create_product("P001", "Test", "Test", 10.0, initial_quantity=5)
+        product.update_quantity(100)
+        assert service.get_product("P001").quantity == 5
+        assert service.check_invariants() == []
+
+    def test_invariants_hold_after_workflow(self, service):
+        """Test: Nach Anlegen, Buchen, Preisänderung und Löschen ist alles konsistent"""
+        service.create_product("P001", "A", "Test", 10.0, category="X", sku="4001")
+        service.create_product("P002", "B", "Test", 5.0, category="Y", initial_quantity=3)
+        service.add_to_stock("P001", 7)
+        service.apply_movements([MovementLine("P002", 2, "OUT"), MovementLine("P001", 1, "IN")])
+        service.update_price("P002", 6.0)
+        service.delete_product("P002")
+        assert service.check_invariants() == []
+
+    def test_invariant_checker_detects_drift(self, service):
+        """Test: Am Service vorbei geänderter Bestand wird gemeldet"""
+        service.create_product("P001", "A", "Test", 10.0, initial_quantity=5, sku="4001")
+        service.repository.products["P001"].quantity = 50
+        service.repository.products["P001"].sku = "4002"
+
+        problems = service.check_invariants()
+
+        assert "Lagerwert des Repositories weicht von der Neuberechnung ab" in problems
+        assert "SKU 4002 führt nicht zu Produkt P001" in problems
+        assert "Bestandsindex weicht von den Produkten ab" in problems
+
+
+class ConflictingRepository(InMemoryRepository):
+    """Repository, bei dem ein "anderer Client" die ersten Compare-and-Swaps überholt"""
+
+    def __init__(self, conflicts: int):
+        super().__init__()
+        self.conflicts = conflicts
+
+    def save_product(self, product, expected_version=None):
+        if expected_version and self.conflicts:
+            self.conflicts -= 1
+            other = self.load_product(product.id)
+            other.update_quantity(100)
+            super().save_product(other)
+        super().save_product(product, expected_version)
+
+
+class TestOptimisticConcurrency:
+    """Tests für die Wiederholung von Buchungen bei Versionskonflikten"""
+
+    def test_conflict_is_retried_without_lost_update(self):
+        """Test: die fremde Änderung bleibt erhalten, die Buchung wird neu berechnet"""
+        service = WarehouseService(ConflictingRepository(conflicts=2), retry_backoff=0)
+        service.create_product("P001", "Test", "Test", 1.0, initial_quantity=5)
+
+        service.remove_from_stock("P001", 3)
+
+        assert service.get_product("P001").quantity == 5 + 200 - 3
+        assert len(service.get_movements()) == 1
+
+    def test_gives_up_after_max_retries(self):
+        """Test: nach max_retries wird der Konflikt gemeldet und nichts gebucht"""
+        service = WarehouseService(
+            ConflictingRepository(conflicts=10), max_retries=2, retry_backoff=0
+        )
+        service.create_product("P001", "Test", "Test", 1.0, initial_quantity=5)
+
+        with pytest.raises(VersionConflictError):
+            service.add_to_stock("P001", 1)
+        assert service.get_movements() == []
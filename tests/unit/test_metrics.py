@@ -0,0 +1,81 @@
+"""Unit Tests für die optionale Laufzeitmessung"""
+
+import pytest
+from src.adapters.caching import CachingRepository
+from src.adapters.repository import InMemoryRepository
+from src.services import WarehouseService
+from src.services.metrics import InstrumentedRepository, LatencyHistogram, MetricsRegistry
+
+
+class FakeClock:
+    """Zeitquelle, die bei jedem Aufruf um step Sekunden weiterläuft"""
+
+    def __init__(self, step: float = 0.001):
+        self.now = 0.0
+        self.step = step
+
+    def __call__(self) -> float:
+        self.now += self.step
+        return self.now
+
+
+class TestLatencyHistogram:
+    def test_percentiles(self):
+        histogram = LatencyHistogram()
+        for _ in range(90):
+            histogram.observe(0.001)
+        for _ in range(10):
+            histogram.observe(0.1)
+
+        snapshot = histogram.snapshot()
+        assert snapshot["count"] == 100
+        assert snapshot["sum"] == pytest.approx(1.09)
+        # Buckets wachsen um Faktor √2: Schätzung liegt höchstens eine Bucketbreite daneben
+        assert 0.001 / 2**0.5 <= snapshot["p50"] <= 0.001
+        assert 0.1 / 2**0.5 <= snapshot["p99"] <= 0.1 * 2**0.5
+
+    def test_empty_histogram(self):
+        assert LatencyHistogram().snapshot()["p99"] == 0.0
+
+
+class TestServiceMetrics:
+    def test_disabled_by_default(self):
+        service = WarehouseService(InMemoryRepository())
+        assert service.get_metrics() == {}
+        assert service.add_to_stock.__func__ is WarehouseService.add_to_stock
+        assert not isinstance(service.repository, InstrumentedRepository)
+
+    def test_calls_errors_and_sizes(self):
+        metrics = MetricsRegistry(clock=FakeClock())
+        service = WarehouseService(CachingRepository(InMemoryRepository()), metrics=metrics)
+        service.create_product("P001", "Test", "", 10.0, initial_quantity=5)
+        for _ in range(3):
+            service.add_to_stock("P001", 1)
+        with pytest.raises(ValueError):
+            service.remove_from_stock("P001", 100)
+
+        snapshot = service.get_metrics()
+        calls = snapshot["calls"]
+        assert calls["service"]["add_to_stock"]["count"] == 3
+        assert calls["service"]["add_to_stock"]["p50"] > 0
+        assert calls["service"]["remove_from_stock"]["errors"] == 1
+        assert calls["repository"]["save_movement"]["count"] == 3
+        assert calls["repository"]["load_product"]["count"] == 5
+        assert snapshot["size"] == {"products": 1, "movements": 3}
+        assert snapshot["cache"]["hits"] >= 3
+
+    def test_prometheus_export(self, tmp_path):
+        metrics = MetricsRegistry(clock=FakeClock())
+        service = WarehouseService(InMemoryRepository(), metrics=metrics)
+        service.create_product("P001", "Test", "", 10.0)
+        path = tmp_path / "lager.prom"
+
+        metrics.write_prometheus(str(path))
+
+        text = path.read_text(encoding="utf-8")
+        labels = 'component="service",method="create_product"'
+        assert "# TYPE lager_call_duration_seconds histogram" in text
+        assert f'lager_call_duration_seconds_bucket{{{labels},le="+Inf"}} 1' in text
+        assert f"lager_call_duration_seconds_count{{{labels}}} 1" in text
+        assert "lager_size_products 1" in text
+        assert not (tmp_path / "lager.prom.tmp").exists()
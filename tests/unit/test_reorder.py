@@ -0,0 +1,108 @@
+"""Unit Tests für Meldebestände und Nachbestellvorschläge"""
+
+import math
+from datetime import datetime, timedelta
+
+import pytest
+from src.adapters.repository import InMemoryRepository
+from src.domain.product import Product
+from src.domain.reorder import ReorderEngine
+from src.domain.warehouse import Movement
+from src.services import MovementLine, WarehouseService
+
+NOW = datetime(2025, 6, 1)
+
+
+def product(product_id: str, quantity: int, reorder_point: int = 10, target: int = 50) -> Product:
+    return Product(
+        id=product_id,
+        name=product_id,
+        description="",
+        price=1.0,
+        quantity=quantity,
+        reorder_point=reorder_point,
+        target_quantity=target,
+    )
+
+
+def out(product_id: str, quantity: int, days_ago: float) -> Movement:
+    return Movement(
+        id=f"{product_id}-{days_ago}",
+        product_id=product_id,
+        product_name=product_id,
+        quantity_change=-quantity,
+        movement_type="OUT",
+        timestamp=NOW - timedelta(days=days_ago),
+    )
+
+
+class TestProductReorderLevels:
+    @pytest.mark.parametrize("levels", [(-1, 0), (0, -1), (10, 5)])
+    def test_invalid_levels(self, levels):
+        with pytest.raises(ValueError):
+            Product(id="P1", name="X", description="", price=1.0).set_reorder_levels(*levels)
+        with pytest.raises(ValueError):
+            product("P1", 0, *levels)
+
+
+class TestReorderEngine:
+    def test_orders_by_days_of_cover(self):
+        engine = ReorderEngine(window_days=10, clock=lambda: NOW)
+        engine.rebuild(
+            [product("A", 8), product("B", 2), product("C", 9), product("D", 40)],
+            # A: 20 in 10 Tagen = 2/Tag; B: 1/Tag; C: kein Verbrauch; alter Abgang zählt nicht
+            [out("A", 20, 1), out("B", 10, 2), out("C", 100, 30)],
+        )
+
+        suggestions = engine.top(10)
+
+        assert [s.product_id for s in suggestions] == ["B", "A", "C"]
+        assert suggestions[0].days_of_cover == pytest.approx(2.0)
+        assert suggestions[1].days_of_cover == pytest.approx(4.0)
+        assert math.isinf(suggestions[2].days_of_cover)
+        assert suggestions[0].order_quantity == 48
+        assert [s.product_id for s in engine.top(1)] == ["B"]
+        assert len(engine) == 3
+
+    def test_incremental_updates_discard_stale_entries(self):
+        engine = ReorderEngine(window_days=10, clock=lambda: NOW)
+        engine.rebuild([product("A", 8), product("B", 5)])
+        for quantity in range(7, 0, -1):
+            engine.record(out("A", 1, quantity))
+            engine.update(product("A", quantity))
+        engine.update(product("B", 30))
+
+        assert [s.product_id for s in engine.top(5)] == ["A"]
+        assert engine.top(5)[0].quantity == 1
+        engine.remove("A")
+        assert engine.top(5) == []
+
+
+class TestServiceReorder:
+    def test_suggestions_follow_bookings(self):
+        service = WarehouseService(InMemoryRepository(), reorder=ReorderEngine())
+        service.create_product("P001", "Schrauben", "", 0.1, initial_quantity=100, reorder_point=20)
+        service.create_product("P002", "Muttern", "", 0.1, initial_quantity=15)
+        service.set_reorder_levels("P002", 20, 200)
+        assert [s.product_id for s in service.get_reorder_suggestions()] == ["P002"]
+
+        service.apply_movements([MovementLine("P001", 85, "OUT"), MovementLine("P002", 5, "IN")])
+        suggestions = service.get_reorder_suggestions()
+        assert [s.product_id for s in suggestions] == ["P001", "P002"]
+        assert suggestions[0].daily_demand == pytest.approx(85 / 30)
+
+        service.add_to_stock("P001", 100)
+        service.delete_product("P002")
+        assert service.get_reorder_suggestions() == []
+
+    def test_engine_is_rebuilt_from_repository(self):
+        repository = InMemoryRepository()
+        service = WarehouseService(repository)
+        service.create_product("P001", "Schrauben", "", 0.1, initial_quantity=30, reorder_point=20)
+        service.remove_from_stock("P001", 15)
+        assert service.get_reorder_suggestions() == []
+
+        restarted = WarehouseService(repository, reorder=ReorderEngine())
+        (suggestion,) = restarted.get_reorder_suggestions()
+        assert suggestion.daily_demand == pytest.approx(0.5)
+        assert suggestion.days_of_cover == pytest.approx(30)
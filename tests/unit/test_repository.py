@@ -0,0 +1,625 @@
+"""Tests - Unit Tests für die Repository-Adapter"""
+
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+from src.adapters.caching import CachingRepository
+from src.adapters.columnar import ColumnarMovementStore
+from src.adapters.journal import JournalRepository
+from src.adapters.repository import (
+    _SELECT_MOVEMENTS_BETWEEN,
+    _SELECT_PRODUCT_MOVEMENTS,
+    InMemoryRepository,
+    RepositoryFactory,
+    SqliteRepository,
+)
+from src.domain.ids import SnowflakeIdGenerator
+from src.domain.product import Product
+from src.domain.warehouse import Movement
+from src.ports import VersionConflictError
+from src.services import WarehouseService
+
+
+@pytest.fixture(
+    params=["memory", "memory-columnar", "sqlite", "journal", "tinydb", "cached-sqlite"]
+)
+def repository(request, tmp_path):
+    """Fixture: jedes Repository-Backend einmal"""
+    if request.param == "cached-sqlite":
+        repo = CachingRepository(SqliteRepository(str(tmp_path / "lager.db")), max_size=2)
+        yield repo
+        repo.close()
+    elif request.param == "sqlite":
+        repo = RepositoryFactory.create_repository("sqlite", db_path=str(tmp_path / "lager.db"))
+        yield repo
+        repo.close()
+    elif request.param == "journal":
+        repo = RepositoryFactory.create_repository(
+            "journal", directory=str(tmp_path / "journal"), group_interval=0
+        )
+        yield repo
+        repo.close()
+    elif request.param == "tinydb":
+        pytest.importorskip("tinydb")
+        repo = RepositoryFactory.create_repository(
+            "tinydb", directory=str(tmp_path / "tinydb"), flush_every=3, segment_size=4
+        )
+        yield repo
+        repo.close()
+    elif request.param == "memory-columnar":
+        yield RepositoryFactory.create_repository("memory", movement_store=ColumnarMovementStore())
+    else:
+        yield RepositoryFactory.create_repository("memory")
+
+
+class TestRepositoryContract:
+    """Gemeinsames Verhalten aller RepositoryPort-Implementierungen"""
+
+    def test_save_and_load_product(self, repository):
+        """Test: Produkt speichern und wieder laden"""
+        repository.save_product(
+            Product(id="P001", name="Test", description="Test", price=10.0, quantity=5)
+        )
+        product = repository.load_product("P001")
+        assert product.name == "Test"
+        assert product.quantity == 5
+        assert repository.load_product("FEHLT") is None
+
+    def test_reorder_levels_are_stored(self, repository):
+        """Test: Melde- und Zielbestand werden gespeichert"""
+        product = Product(id="P001", name="Test", description="", price=1.0, reorder_point=5)
+        product.set_reorder_levels(5, 20)
+        repository.save_products([product])
+        stored = repository.load_product("P001")
+        assert (stored.reorder_point, stored.target_quantity) == (5, 20)
+
+    def test_delete_product(self, repository):
+        """Test: Produkt löschen, unbekannte IDs ignorieren"""
+        repository.save_product(Product(id="P001", name="Test", description="Test", price=1.0))
+        repository.delete_product("P001")
+        repository.delete_product("FEHLT")
+        assert repository.count_products() == 0
+
+    def test_iter_and_count_products(self, repository):
+        """Test: Produkte streamen und zählen"""
+        for i in range(5):
+            repository.save_product(
+                Product(id=f"P{i:03d}", name="Test", description="Test", price=1.0)
+            )
+        assert repository.count_products() == 5
+        assert sorted(p.id for p in repository.iter_products()) == [f"P{i:03d}" for i in range(5)]
+        assert len(repository.load_all_products()) == 5
+
+    def test_load_products(self, repository):
+        """Test: Mehrere Produkte gezielt laden"""
+        repository.save_products(
+            Product(id=f"P{i:04d}", name="Test", description="Test", price=1.0) for i in range(1200)
+        )
+        products = repository.load_products(["P0001", "P1100", "FEHLT", "P0001"])
+        assert sorted(products) == ["P0001", "P1100"]
+        assert len(repository.load_products(f"P{i:04d}" for i in range(1200))) == 1200
+
+    def test_secondary_indexes(self, repository):
+        """Test: Suche über SKU, Kategorie und Bestandsschwelle"""
+        for i, (category, quantity) in enumerate([("A", 5), ("B", 1), ("A", 0), ("B", 9)]):
+            repository.save_product(
+                Product(
+                    id=f"P{i}",
+                    name="Test",
+                    description="Test",
+                    price=1.0,
+                    quantity=quantity,
+                    sku=f"400{i}",
+                    category=category,
+                )
+            )
+        assert repository.find_by_sku("4001").id == "P1"
+        assert repository.find_by_sku("") is None
+        assert [p.id for p in repository.list_by_category("A")] == ["P0", "P2"]
+        assert [p.id for p in repository.list_below_threshold(5)] == ["P2", "P1"]
+
+        changed = repository.load_product("P0")
+        changed.category = "B"
+        changed.sku = "9999"
+        changed.update_quantity(-5)
+        repository.save_product(changed)
+        repository.delete_product("P1")
+
+        assert repository.find_by_sku("4000") is None
+        assert repository.find_by_sku("9999").id == "P0"
+        assert [p.id for p in repository.list_by_category("B")] == ["P0", "P3"]
+        assert [p.id for p in repository.list_below_threshold(5)] == ["P0", "P2"]
+
+    def test_reads_return_copies(self, repository):
+        """Test: Geänderte Leseergebnisse verändern den gespeicherten Bestand nicht"""
+        repository.save_product(
+            Product(id="P1", name="A", description="", price=1.0, quantity=2, sku="S1")
+        )
+        reads = [
+            repository.load_product("P1"),
+            repository.find_by_sku("S1"),
+            *repository.list_by_category(""),
+            *repository.list_below_threshold(5),
+            *repository.iter_products(),
+            *repository.load_all_products().values(),
+            *repository.list_products_page().items,
+        ]
+        for product in reads:
+            product.quantity = 999
+        assert repository.load_product("P1").quantity == 2
+        assert [p.id for p in repository.list_below_threshold(5)] == ["P1"]
+
+    def test_compare_and_swap(self, repository):
+        """Test: Speichern mit veralteter Version schlägt fehl, ohne etwas zu ändern"""
+        repository.save_product(Product(id="P001", name="A", description="", price=1.0), 0)
+        first = repository.load_product("P001")
+        second = repository.load_product("P001")
+        assert first.version == 1 and first is not second
+
+        first.update_quantity(5)
+        repository.save_product(first, expected_version=first.version)
+        assert first.version == 2
+
+        second.update_quantity(7)
+        with pytest.raises(VersionConflictError):
+            repository.save_product(second, expected_version=second.version)
+        assert repository.load_product("P001").quantity == 5
+        assert repository.load_product("P001").version == 2
+        with pytest.raises(VersionConflictError):
+            repository.save_product(second, expected_version=0)
+
+    def test_save_products_checks_all_versions_first(self, repository):
+        """Test: ein Konflikt im Batch speichert keines der Produkte"""
+        repository.save_products(
+            [Product(id=f"P{i}", name="A", description="", price=1.0) for i in range(3)]
+        )
+        products = repository.load_products(["P0", "P1", "P2"])
+        for product in products.values():
+            product.update_quantity(1)
+        expected = {pid: p.version for pid, p in products.items()}
+        expected["P2"] = 99
+
+        with pytest.raises(VersionConflictError):
+            repository.save_products(products.values(), expected)
+        assert all(p.quantity == 0 for p in repository.load_products(products).values())
+
+    def test_products_page(self, repository):
+        """Test: Keyset-Pagination nach ID und nach Kategorie"""
+        repository.save_products(
+            Product(id=f"P{i:02d}", name="T", description="", price=1.0, category="AB"[i % 2])
+            for i in range(25)
+        )
+        for order_by in ("id", "category"):
+            seen, cursor = [], None
+            while True:
+                page = repository.list_products_page(after=cursor, limit=10, order_by=order_by)
+                seen.extend(page.items)
+                cursor = page.next_cursor
+                if not page.has_more:
+                    break
+            key = (lambda p: p.id) if order_by == "id" else (lambda p: (p.category, p.id))
+            assert [p.id for p in seen] == [p.id for p in sorted(seen, key=key)]
+            assert len({p.id for p in seen}) == 25
+
+        with pytest.raises(ValueError):
+            repository.list_products_page(order_by="price")
+
+    def test_movements_page(self, repository):
+        """Test: Bewegungen seitenweise in zeitlicher Reihenfolge"""
+        start = datetime(2025, 1, 1)
+        for i in (3, 1, 4, 0, 2):
+            repository.save_movement(
+                Movement(
+                    id=f"mov_{i}",
+                    product_id="P001",
+                    product_name="Test",
+                    quantity_change=1,
+                    movement_type="IN",
+                    timestamp=start + timedelta(minutes=i),
+                )
+            )
+        first = repository.list_movements_page(limit=3)
+        second = repository.list_movements_page(after=first.next_cursor, limit=3)
+        assert [m.id for m in first.items] == ["mov_0", "mov_1", "mov_2"]
+        assert [m.id for m in second.items] == ["mov_3", "mov_4"]
+        assert not second.has_more
+
+    def test_movements_keep_order(self, repository):
+        """Test: Bewegungen in Einfügereihenfolge zurückgeben"""
+        for i in range(3):
+            repository.save_movement(
+                Movement(
+                    id=f"mov_{i}",
+                    product_id="P001",
+                    product_name="Test",
+                    quantity_change=i + 1,
+                    movement_type="IN",
+                )
+            )
+        assert [m.id for m in repository.load_movements()] == ["mov_0", "mov_1", "mov_2"]
+
+    def test_movement_time_ranges(self, repository):
+        """Test: Zeitraum- und Produktabfragen über halboffene Intervalle"""
+        start = datetime(2025, 1, 1)
+        for i in (5, 1, 4, 0, 2, 3):
+            repository.save_movement(
+                Movement(
+                    id=f"mov_{i}",
+                    product_id=f"P00{i % 2}",
+                    product_name="Test",
+                    quantity_change=1,
+                    movement_type="IN",
+                    timestamp=start + timedelta(days=i),
+                )
+            )
+        since, until = start + timedelta(days=1), start + timedelta(days=4)
+
+        between = repository.movements_between(since, until)
+        assert [m.id for m in between] == ["mov_1", "mov_2", "mov_3"]
+        assert len(repository.movements_between()) == 6
+        history = repository.movements_for_product("P001", since=since)
+        assert [m.id for m in history] == ["mov_1", "mov_3", "mov_5"]
+        history = repository.movements_for_product("P000", until=until)
+        assert [m.id for m in history] == ["mov_0", "mov_2"]
+        assert repository.movements_for_product("P999") == []
+
+
+class TestColumnarMovementStore:
+    """Tests für den spaltenorientierten Bewegungsspeicher"""
+
+    def test_round_trip(self):
+        """Test: Bewegungen kommen unverändert als Sicht zurück"""
+        generator = SnowflakeIdGenerator(node_id=3)
+        movements = [
+            Movement(
+                id=generator.new_id(),
+                product_id="P001",
+                product_name="Test",
+                quantity_change=-4,
+                movement_type="OUT",
+                reason=None,
+                timestamp=datetime(2025, 3, 1, 12, 30, 15, 123456),
+                performed_by="anna",
+            ),
+            Movement(
+                id="mov_1700000000.5",
+                product_id="P002",
+                product_name="Test 2",
+                quantity_change=7,
+                movement_type="IN",
+                reason="Lieferung",
+            ),
+        ]
+        store = ColumnarMovementStore(movements)
+        assert len(store) == 2
+        assert [view.to_movement() for view in store] == movements
+        assert store[-1].reason == "Lieferung"
+        assert store[0] == movements[0]
+
+    def test_compact_storage(self):
+        """Test: Spalten belegen feste Bytes pro Zeile"""
+        store = ColumnarMovementStore(
+            Movement(
+                id=f"mov_{i}",
+                product_id="P1",
+                product_name="A",
+                quantity_change=1,
+                movement_type="IN",
+            )
+            for i in range(1000)
+        )
+        assert store.nbytes() <= 1000 * 44
+
+
+class TestJournalRepository:
+    """Tests für das Event-Sourcing-Repository"""
+
+    def _open(self, directory, **options):
+        return JournalRepository(str(directory), group_interval=0, **options)
+
+    def test_recovery_from_snapshot_and_tail(self, tmp_path):
+        """Test: Zustand = Snapshot + abgespielter Journal-Rest"""
+        repository = self._open(tmp_path, snapshot_every=10)
+        service = WarehouseService(repository)
+        service.create_product("P001", "Test", "Test", 10.0, initial_quantity=5)
+        for _ in range(12):
+            service.add_to_stock("P001", 1)
+        repository.close()
+
+        recovered = self._open(tmp_path, snapshot_every=10)
+        _, snapshot_offset = recovered.snapshots.load()
+        assert 0 < snapshot_offset < recovered.journal.size
+        assert recovered.load_product("P001").quantity == 17
+        assert len(recovered.load_movements()) == 12
+        recovered.close()
+
+    def test_history_before_snapshot_is_indexed(self, tmp_path):
+        """Test: Produkthistorie enthält nachgeladene Bewegungen vor dem Snapshot"""
+        repository = self._open(tmp_path, snapshot_every=5)
+        service = WarehouseService(repository)
+        service.create_product("P001", "Test", "Test", 10.0)
+        for _ in range(8):
+            service.add_to_stock("P001", 1)
+        repository.close()
+
+        recovered = self._open(tmp_path, snapshot_every=5)
+        assert len(recovered.movements_for_product("P001")) == 8
+        assert len(recovered.movements_between()) == 8
+        recovered.close()
+
+    def test_torn_tail_is_discarded(self, tmp_path):
+        """Test: Abgebrochener letzter Datensatz wird beim Start verworfen"""
+        repository = self._open(tmp_path)
+        repository.save_product(Product(id="P001", name="A", description="", price=1.0))
+        repository.save_product(Product(id="P002", name="B", description="", price=1.0))
+        repository.close()
+        with open(tmp_path / "journal.bin", "r+b") as journal:
+            journal.truncate(journal.seek(0, 2) - 3)
+
+        recovered = self._open(tmp_path)
+        assert recovered.load_product("P001") is not None
+        assert recovered.load_product("P002") is None
+        recovered.save_product(Product(id="P003", name="C", description="", price=1.0))
+        recovered.close()
+        reopened = self._open(tmp_path)
+        assert reopened.count_products() == 2
+        reopened.close()
+
+
+class TestTinyDBRepository:
+    """Tests für das TinyDB-Repository"""
+
+    @pytest.fixture(autouse=True)
+    def _tinydb(self):
+        pytest.importorskip("tinydb")
+
+    def _open(self, directory, **options):
+        from src.adapters.tinydb_repository import TinyDBRepository
+
+        return TinyDBRepository(str(directory), **options)
+
+    def test_data_survives_restart(self, tmp_path):
+        """Test: Produkte, Versionen und Bewegungen bleiben nach Neustart erhalten"""
+        service = WarehouseService(self._open(tmp_path, segment_size=4))
+        service.create_product("P001", "Test", "Test", 10.0, initial_quantity=5)
+        service.create_product("P002", "Weg", "", 1.0)
+        for _ in range(10):
+            service.add_to_stock("P001", 1)
+        service.delete_product("P002")
+        service.repository.close()
+
+        repository = self._open(tmp_path, segment_size=4)
+        assert repository.load_product("P001").quantity == 15
+        assert repository.load_product("P001").version == 11
+        assert repository.load_product("P002") is None
+        assert len(repository.movements_for_product("P001")) == 10
+        assert len(repository.segment_files()) == 3
+        assert repository.check_invariants() == []
+        repository.close()
+
+    def test_writes_are_deferred_until_flush(self, tmp_path):
+        """Test: Dateien werden erst nach flush_every Schreibzugriffen geschrieben"""
+        from tinydb import TinyDB
+
+        repository = self._open(tmp_path, flush_every=5)
+        for i in range(4):
+            repository.save_product(Product(id=f"P{i}", name="A", description="", price=1.0))
+        products_file = tmp_path / "products.json"
+        assert products_file.stat().st_size == 0
+
+        repository.flush()
+        database = TinyDB(str(products_file))
+        assert len(database.table("products")) == 4
+        database.close()
+        repository.close()
+
+
+class TestSqliteRepository:
+    """Tests für SqliteRepository"""
+
+    def test_wal_mode(self, tmp_path):
+        """Test: Datenbank läuft im WAL-Modus"""
+        repository = SqliteRepository(str(tmp_path / "lager.db"))
+        mode = repository._conn.execute("PRAGMA journal_mode").fetchone()[0]
+        repository.close()
+        assert mode == "wal"
+
+    def test_data_survives_restart(self, tmp_path):
+        """Test: Daten bleiben nach Neustart erhalten"""
+        db_path = str(tmp_path / "lager.db")
+        service = WarehouseService(SqliteRepository(db_path))
+        service.create_product("P001", "Test", "Test", 10.0, initial_quantity=5)
+        service.add_to_stock("P001", 3)
+        service.repository.close()
+
+        repository = SqliteRepository(db_path)
+        assert repository.load_product("P001").quantity == 8
+        assert len(repository.load_movements()) == 1
+        repository.close()
+
+    def test_adds_version_column_to_old_databases(self, tmp_path):
+        """Test: Datenbanken ohne Versionsspalte werden nachgerüstet"""
+        db_path = str(tmp_path / "alt.db")
+        connection = sqlite3.connect(db_path)
+        connection.execute(
+            "CREATE TABLE products (id TEXT PRIMARY KEY, name TEXT NOT NULL, "
+            "description TEXT NOT NULL, price REAL NOT NULL, quantity INTEGER NOT NULL, "
+            "sku TEXT NOT NULL DEFAULT '', category TEXT NOT NULL DEFAULT '', "
+            "created_at TEXT NOT NULL, updated_at TEXT NOT NULL, notes TEXT) WITHOUT ROWID"
+        )
+        connection.execute(
+            "INSERT INTO products VALUES ('P001', 'Alt', '', 1.0, 3, '', '', "
+            "'2025-01-01T00:00:00.000000', '2025-01-01T00:00:00.000000', NULL)"
+        )
+        connection.commit()
+        connection.close()
+
+        repository = SqliteRepository(db_path)
+        assert repository.load_product("P001").version == 1
+        assert repository.load_product("P001").reorder_point == 0
+        repository.close()
+
+    def test_sku_is_unique_across_connections(self, tmp_path):
+        """Test: Zwei Prozesse mit gemeinsamer Datenbank vergeben keine SKU doppelt"""
+        db_path = str(tmp_path / "lager.db")
+        first, second = SqliteRepository(db_path), SqliteRepository(db_path)
+        first.save_product(Product(id="P1", name="A", description="", price=1.0, sku="S1"))
+        with pytest.raises(sqlite3.IntegrityError):
+            second.save_product(Product(id="P2", name="B", description="", price=1.0, sku="S1"))
+        second.save_product(Product(id="P3", name="C", description="", price=1.0))
+        second.save_product(Product(id="P4", name="D", description="", price=1.0))
+        assert second.count_products() == 3
+        first.close()
+        second.close()
+
+    def test_inventory_value_across_connections(self, tmp_path):
+        """Test: Der Lagerwert enthält Änderungen anderer Verbindungen"""
+        db_path = str(tmp_path / "lager.db")
+        first, second = SqliteRepository(db_path), SqliteRepository(db_path)
+        service = WarehouseService(first)
+        service.create_product("P1", "A", "", 2.0, category="X", initial_quantity=5)
+        second.save_product(
+            Product(id="P2", name="B", description="", price=3.0, quantity=2, category="Y")
+        )
+        assert service.get_category_values() == {"X": 10.0, "Y": 6.0}
+        assert service.get_total_inventory_value() == 16.0
+        assert service.check_inventory_value()
+        first.close()
+        second.close()
+
+    def test_makes_old_sku_index_unique(self, tmp_path):
+        """Test: Der frühere, nicht eindeutige SKU-Index wird ersetzt"""
+        db_path = str(tmp_path / "alt.db")
+        SqliteRepository(db_path).close()
+        connection = sqlite3.connect(db_path)
+        connection.execute("DROP INDEX idx_products_sku")
+        connection.execute("CREATE INDEX idx_products_sku ON products (sku) WHERE sku != ''")
+        connection.commit()
+        connection.close()
+
+        repository = SqliteRepository(db_path)
+        indexes = repository._conn.execute("PRAGMA index_list(products)").fetchall()
+        repository.close()
+        assert {row[1]: row[2] for row in indexes}["idx_products_sku"] == 1
+
+    def test_movement_ranges_use_indexes(self, tmp_path):
+        """Test: Zeitraumabfragen laufen über die zusammengesetzten Indizes"""
+        repository = SqliteRepository(str(tmp_path / "lager.db"))
+        explain = repository._conn.execute
+        product_plan = explain(
+            "EXPLAIN QUERY PLAN " + _SELECT_PRODUCT_MOVEMENTS, ("P1", "", "\uffff")
+        ).fetchall()
+        range_plan = explain("EXPLAIN QUERY PLAN " + _SELECT_MOVEMENTS_BETWEEN, ("", "")).fetchall()
+        repository.close()
+        assert "idx_movements_product" in str(product_plan)
+        assert "idx_movements_timestamp" in str(range_plan)
+        assert "TEMP B-TREE" not in str(product_plan + range_plan)
+
+    def test_bulk_upsert(self, tmp_path):
+        """Test: Sammel-Upsert überschreibt bestehende Zeilen"""
+        repository = SqliteRepository(str(tmp_path / "lager.db"))
+        products = [Product(id=f"P{i}", name="Alt", description="", price=1.0) for i in range(100)]
+        repository.save_products(products)
+        for product in products:
+            product.name = "Neu"
+        repository.save_products(products)
+        assert repository.count_products() == 100
+        assert repository.load_product("P42").name == "Neu"
+        repository.close()
+
+    def test_unknown_repository_type(self):
+        """Test: Unbekannter Typ wird abgelehnt"""
+        with pytest.raises(ValueError):
+            RepositoryFactory.create_repository("unbekannt")
+
+    def test_in_memory_default(self):
+        """Test: Standard bleibt das In-Memory Repository"""
+        assert isinstance(RepositoryFactory.create_repository(), InMemoryRepository)
+
+    def test_available_types_can_be_created(self, tmp_path):
+        """Test: Jeder gemeldete Typ lässt sich erzeugen"""
+        options = {
+            "sqlite": {"db_path": str(tmp_path / "lager.db")},
+            "journal": {"directory": str(tmp_path / "journal")},
+            "tinydb": {"directory": str(tmp_path / "tinydb")},
+        }
+        assert "memory" in RepositoryFactory.available_types()
+        for repository_type in RepositoryFactory.available_types():
+            repository = RepositoryFactory.create_repository(
+                repository_type, **options.get(repository_type, {})
+            )
+            assert repository.count_products() == 0
+            repository.close()
+
+
+class TestCachingRepository:
+    """Tests für CachingRepository"""
+
+    def test_hits_misses_and_lru_eviction(self):
+        """Test: Wiederholte Zugriffe treffen den Cache, das älteste Produkt wird verdrängt"""
+        inner = InMemoryRepository()
+        for i in range(3):
+            inner.save_product(Product(id=f"P{i}", name="Test", description="", price=1.0))
+        repository = CachingRepository(inner, max_size=2)
+
+        repository.load_product("P0")
+        repository.load_product("P1")
+        repository.load_product("P0")
+        repository.load_product("P2")  # verdrängt P1
+        repository.load_product("P1")
+        assert repository.stats() == {
+            "hits": 1,
+            "misses": 4,
+            "evictions": 2,
+            "expirations": 0,
+            "size": 2,
+        }
+
+    def test_ttl_expiry(self):
+        """Test: Einträge laufen nach der TTL ab"""
+        now = [0.0]
+        inner = InMemoryRepository()
+        inner.save_product(Product(id="P1", name="Test", description="", price=1.0))
+        repository = CachingRepository(inner, ttl=10, clock=lambda: now[0])
+        repository.load_product("P1")
+        now[0] = 5
+        repository.load_product("P1")
+        now[0] = 20
+        repository.load_product("P1")
+        assert (repository.hits, repository.misses, repository.expirations) == (1, 2, 1)
+
+    def test_write_through_and_copies(self):
+        """Test: Gespeicherte Produkte kommen aus dem Cache, Änderungen am Ergebnis nicht"""
+        inner = InMemoryRepository()
+        repository = CachingRepository(inner)
+        product = Product(id="P1", name="Test", description="", price=1.0, sku="4001")
+        repository.save_product(product)
+        loaded = repository.find_by_sku("4001")
+        loaded.quantity = 99
+        assert repository.load_product("P1").quantity == 0
+        assert repository.misses == 0
+
+    def test_delete_invalidates(self):
+        """Test: Gelöschte Produkte werden nicht mehr aus dem Cache geliefert"""
+        repository = CachingRepository(InMemoryRepository())
+        repository.save_product(Product(id="P1", name="Test", description="", price=1.0, sku="X"))
+        repository.delete_product("P1")
+        assert repository.load_product("P1") is None
+        assert repository.find_by_sku("X") is None
+
+    def test_stale_entry_is_dropped_on_conflict(self, tmp_path):
+        """Test: Ändert ein anderer Prozess das Produkt, liest die Wiederholung frische Daten"""
+        db_path = str(tmp_path / "lager.db")
+        service = WarehouseService(CachingRepository(SqliteRepository(db_path)))
+        service.create_product("P001", "Test", "", 10.0, initial_quantity=5)
+
+        other = SqliteRepository(db_path)
+        product = other.load_product("P001")
+        product.update_quantity(10)
+        other.save_product(product, expected_version=product.version)
+        other.close()
+
+        service.add_to_stock("P001", 1)
+        assert service.get_product("P001").quantity == 16
+        service.repository.close()
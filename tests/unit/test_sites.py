@@ -0,0 +1,149 @@
+"""Unit Tests für mehrere Standorte"""
+
+from functools import partial
+
+import pytest
+from src.adapters.repository import InMemoryRepository, RepositoryFactory, SqliteRepository
+from src.adapters.transfer_log import JournalTransferLog
+from src.services import WarehouseService
+from src.services.sites import MultiWarehouseService, SiteProcess
+
+
+@pytest.fixture
+def sites():
+    sites = MultiWarehouseService(
+        {
+            "Nord": WarehouseService(InMemoryRepository()),
+            "Süd": WarehouseService(InMemoryRepository()),
+        }
+    )
+    sites.site("Nord").create_product("P001", "Laptop", "", 1000.0, "Elektronik", 10, sku="4001")
+    return sites
+
+
+class TestTransfer:
+    def test_paired_movements(self, sites):
+        outgoing, incoming = sites.transfer("P001", 4, "Nord", "Süd", reason="Engpass")
+
+        assert (outgoing.movement_type, outgoing.quantity_change) == ("OUT", -4)
+        assert (incoming.movement_type, incoming.quantity_change) == ("IN", 4)
+        assert outgoing.reason == incoming.reason
+        assert outgoing.reason.endswith("Nord -> Süd: Engpass")
+        assert sites.get_stock_by_sku("4001") == {"Nord": 6, "Süd": 4}
+        assert sites.get_total_stock("4001") == 10
+        assert sites.get_total_inventory_value() == pytest.approx(10_000)
+        assert sites.get_category_values() == {"Elektronik": pytest.approx(10_000)}
+        for name in ("Nord", "Süd"):
+            assert sites.site(name).check_invariants() == []
+
+    def test_rejected_transfer_books_nothing(self, sites):
+        with pytest.raises(ValueError, match="Unzureichender Bestand"):
+            sites.transfer("P001", 11, "Nord", "Süd")
+        with pytest.raises(ValueError, match="existiert nicht"):
+            sites.transfer("P001", 1, "Nord", "West")
+
+        assert sites.site("Süd").get_product("P001") is None
+        assert sites.site("Nord").get_movements() == []
+
+    def test_failed_incoming_is_booked_by_recovery(self, sites, monkeypatch):
+        sites.transfer("P001", 1, "Nord", "Süd")
+
+        def fail(*args, **kwargs):
+            raise OSError("Datenträger voll")
+
+        monkeypatch.setattr(sites.site("Süd"), "add_to_stock", fail)
+        with pytest.raises(OSError):
+            sites.transfer("P001", 3, "Nord", "Süd")
+        assert sites.get_total_stock("4001") == 7
+        (pending,) = sites.transfer_log.pending()
+
+        monkeypatch.undo()
+        assert sites.recover_transfers() == [pending.id]
+        assert sites.recover_transfers() == []
+
+        assert sites.get_stock_by_sku("4001") == {"Nord": 6, "Süd": 4}
+        assert sites.get_total_inventory_value() == pytest.approx(10_000)
+        incoming = sites.site("Süd").get_movements()[-1]
+        assert (incoming.quantity_change, incoming.reason) == (3, pending.note)
+
+    def test_recovery_books_nothing_twice(self, sites, monkeypatch):
+        def fail(transfer_id):
+            raise OSError("Protokoll nicht beschreibbar")
+
+        monkeypatch.setattr(sites.transfer_log, "finish", fail)
+        with pytest.raises(OSError):
+            sites.transfer("P001", 3, "Nord", "Süd")
+        monkeypatch.undo()
+
+        assert len(sites.recover_transfers()) == 1
+        assert sites.get_stock_by_sku("4001") == {"Nord": 7, "Süd": 3}
+        assert len(sites.site("Süd").get_movements()) == 1
+
+    def test_transfer_without_outgoing_is_discarded(self, sites, monkeypatch):
+        def fail(*args, **kwargs):
+            raise OSError("Verbindung verloren")
+
+        monkeypatch.setattr(sites.site("Nord"), "remove_from_stock", fail)
+        with pytest.raises(OSError):
+            sites.transfer("P001", 3, "Nord", "Süd")
+        monkeypatch.undo()
+
+        assert len(sites.recover_transfers()) == 1
+        assert sites.get_stock_by_sku("4001") == {"Nord": 10, "Süd": 0}
+        assert sites.site("Süd").get_movements() == []
+
+
+def test_crash_between_bookings_is_recovered_after_restart(tmp_path):
+    def open_sites():
+        return MultiWarehouseService(
+            {
+                name: WarehouseService(SqliteRepository(str(tmp_path / f"{name}.db")))
+                for name in ("Nord", "Süd")
+            },
+            transfer_log=JournalTransferLog(str(tmp_path / "umlagerungen.log")),
+        )
+
+    sites = open_sites()
+    sites.site("Nord").create_product("P001", "Laptop", "", 1000.0, "Elektronik", 10, sku="4001")
+
+    class Crash(BaseException):
+        """Prozessende zwischen Abgang und Zugang"""
+
+    def crash(*args, **kwargs):
+        raise Crash()
+
+    sites.site("Süd").add_to_stock = crash
+    with pytest.raises(Crash):
+        sites.transfer("P001", 4, "Nord", "Süd")
+    sites.close()
+
+    sites = open_sites()
+    assert sites.get_total_stock("4001") == 6
+    assert len(sites.recover_transfers()) == 1
+    assert sites.get_stock_by_sku("4001") == {"Nord": 6, "Süd": 4}
+    assert sites.get_total_inventory_value() == pytest.approx(10_000)
+    sites.close()
+
+    sites = open_sites()
+    assert sites.transfer_log.pending() == []
+    assert sites.recover_transfers() == []
+    sites.close()
+
+
+def test_site_process_needs_own_node_id():
+    with pytest.raises(ValueError, match="node_id 0"):
+        SiteProcess(partial(RepositoryFactory.create_repository, "memory"), node_id=0)
+
+
+def test_site_in_worker_process(sites):
+    worker = SiteProcess(partial(RepositoryFactory.create_repository, "memory"), node_id=1)
+    sites.add_site("West", worker)
+    try:
+        sites.transfer("P001", 2, "Nord", "West")
+        assert worker.get_product("P001").quantity == 2
+        with pytest.raises(ValueError, match="Unzureichender Bestand"):
+            worker.remove_from_stock("P001", 5)
+        assert sites.get_stock_by_sku("4001") == {"Nord": 8, "West": 2}
+        assert sites.get_inventory_values()["West"] == pytest.approx(2000)
+    finally:
+        sites.close()
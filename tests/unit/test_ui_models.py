@@ -0,0 +1,78 @@
+"""Unit Tests für die virtualisierten Tabellenmodelle der UI"""
+
+import pytest
+
+pytest.importorskip("PyQt6.QtCore")
+
+from src.adapters.repository import InMemoryRepository  # noqa: E402
+from src.services import WarehouseService  # noqa: E402
+from src.ui.models import MovementTableModel, ProductTableModel, create_proxy  # noqa: E402
+
+
+@pytest.fixture
+def service():
+    service = WarehouseService(InMemoryRepository())
+    for i in range(25):
+        service.create_product(f"P{i:03d}", f"Produkt {i}", "", 2.0, initial_quantity=i)
+    return service
+
+
+class TestProductTableModel:
+    def test_rows_are_fetched_page_by_page(self, service):
+        model = ProductTableModel(service, page_size=10)
+        assert model.rowCount() == 0
+        model.fetchMore()
+        assert model.rowCount() == 10
+        while model.canFetchMore():
+            model.fetchMore()
+        assert model.rowCount() == 25
+        assert model.data(model.index(24, 0)) == "P024"
+
+    def test_stock_change_emits_data_changed_for_one_row(self, service):
+        model = ProductTableModel(service, page_size=10)
+        model.fetchMore()
+        changes = []
+        model.dataChanged.connect(lambda first, last: changes.append((first.row(), last.row())))
+
+        service.add_to_stock("P003", 7)
+        model.stock_changed(["P003"])
+
+        assert changes == [(3, 3)]
+        assert model.data(model.index(3, 3)) == "10"
+
+    def test_product_changed_inserts_only_in_loaded_range(self, service):
+        model = ProductTableModel(service, page_size=10)
+        model.fetchMore()
+
+        service.create_product("P0035", "Neu", "", 1.0)
+        service.create_product("P500", "Später", "", 1.0)
+        model.product_changed("P0035")
+        model.product_changed("P500")
+
+        assert model.rowCount() == 11
+        assert model.row_of("P0035") == 4
+        assert model.row_of("P500") is None
+
+    def test_proxy_sorts_by_raw_values_and_filters(self, service):
+        model = ProductTableModel(service)
+        model.fetchMore()
+        proxy = create_proxy(model)
+
+        proxy.sort(3)
+        assert proxy.data(proxy.index(0, 3)) == "0"
+        assert proxy.data(proxy.index(24, 3)) == "24"
+
+        proxy.setFilterFixedString("produkt 1")
+        assert proxy.rowCount() == 11
+
+
+class TestMovementTableModel:
+    def test_new_movements_appended_when_fully_loaded(self, service):
+        service.add_to_stock("P001", 1)
+        model = MovementTableModel(service)
+        model.fetchMore()
+        assert model.rowCount() == 1
+
+        model.movements_added([service.remove_from_stock("P001", 1)])
+        assert model.rowCount() == 2
+        assert model.data(model.index(1, 3)) == "-1"
@@ -0,0 +1,99 @@
+"""Unit Tests für die Hintergrundausführung der UI"""
+
+import threading
+import time
+
+import pytest
+
+QtCore = pytest.importorskip("PyQt6.QtCore")
+
+from src.adapters.repository import InMemoryRepository  # noqa: E402
+from src.services import WarehouseService  # noqa: E402
+from src.ui.models import ProductTableModel  # noqa: E402
+from src.ui.workers import TaskRunner  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+
+def wait_until(app, condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("Zeitüberschreitung")
+        app.processEvents()
+        time.sleep(0.001)
+
+
+class TestTaskRunner:
+    def test_result_is_delivered_on_main_thread(self, app):
+        runner = TaskRunner()
+        results = []
+        runner.submit(
+            lambda: threading.current_thread(),
+            on_result=lambda worker: results.append((worker, threading.current_thread())),
+        )
+        wait_until(app, lambda: results)
+        worker, receiver = results[0]
+        assert worker is not threading.main_thread()
+        assert receiver is threading.main_thread()
+
+    def test_errors_are_delivered(self, app):
+        runner = TaskRunner()
+        errors = []
+        runner.submit(int, "keine Zahl", on_error=errors.append)
+        wait_until(app, lambda: errors)
+        assert isinstance(errors[0], ValueError)
+
+    def test_same_key_coalesces_to_latest_request(self, app):
+        runner = TaskRunner()
+        gate = threading.Event()
+        runner.submit(gate.wait)  # blockiert den einzigen Worker
+        calls, results = [], []
+        for i in range(5):
+            runner.submit(
+                calls.append, i, key="refresh", on_result=lambda _, i=i: results.append(i)
+            )
+        gate.set()
+        wait_until(app, lambda: runner.pending == 0)
+        assert calls == [4]
+        assert results == [4]
+
+    def test_cancelled_lines_are_not_delivered(self, app):
+        runner = TaskRunner()
+        started, results = threading.Event(), []
+
+        def lines():
+            started.set()
+            for _ in range(1000):
+                time.sleep(0.001)
+                yield "x"
+
+        runner.submit_lines(lines, key="report", on_result=results.append)
+        started.wait(5)
+        runner.cancel("report")
+        assert runner.wait(5000)
+        wait_until(app, lambda: runner.pending == 0)
+        assert results == []
+
+
+class TestBackgroundPaging:
+    def test_pages_load_in_background_and_reload_discards_stale_pages(self, app):
+        service = WarehouseService(InMemoryRepository())
+        for i in range(15):
+            service.create_product(f"P{i:03d}", f"Produkt {i}", "", 1.0)
+        model = ProductTableModel(service, page_size=10, runner=TaskRunner())
+
+        model.fetchMore()
+        assert model.loading and not model.canFetchMore()
+        model.reload()
+        model.fetchMore()
+        wait_until(app, lambda: not model.loading)
+        assert model.rowCount() == 10
+
+        model.fetchMore()
+        wait_until(app, lambda: not model.loading)
+        assert model.rowCount() == 15
+        assert not model.canFetchMore()